@@ -13,6 +13,7 @@ import zipfile
 import tarfile
 
 from LocalizationMappingTable import FillLocalizationMappingTable
+import TraceEvents
 
 
 def ParseArguments ():
@@ -28,6 +29,7 @@ def ParseArguments ():
     parser.add_argument ('-r', '--forDistribution', dest = 'release', required = False, action='store_true', help = 'Mark the add-on "for distribution". Will be marked "private" otherwise.')
     parser.add_argument ('-a', '--additionalCMakeParams', dest = 'additionalCMakeParams', nargs = '+', required = False, help = 'Add-On specific CMake parameter list of key=value pairs. Ex: var1=value1 var2="value 2"')
     parser.add_argument ('-q', '--quiet', dest = 'quiet', required = False, action='store_true', help = 'Less verbose cmake output.')
+    parser.add_argument ('-t', '--trace', dest = 'trace', type = str, required = False, help = 'Write a Chrome trace file (viewable in Perfetto or chrome://tracing) with the build steps and the tool calls, including the resource compilation.')
     args = parser.parse_args ()
 
     if args.devKitPath is not None:
@@ -52,10 +54,11 @@ def GetPlatformName ():
 
 
 def CallCommand (params, quiet = False):
-    if quiet:
-        result = subprocess.call (params, stdout=subprocess.DEVNULL, stderr=subprocess.STDOUT)
-    else:
-        result = subprocess.call (params)
+    with TraceEvents.TraceCommand (params):
+        if quiet:
+            result = subprocess.call (params, stdout=subprocess.DEVNULL, stderr=subprocess.STDOUT)
+        else:
+            result = subprocess.call (params)
     return result
 
 
@@ -185,23 +188,25 @@ def DownloadAndUnzip (url, dest):
         return
 
     print (f'Downloading {fileName}')
-    urllib.request.urlretrieve (url, filePath)
+    with TraceEvents.TraceSpan ('Download', 'phase', {'url': url}):
+        urllib.request.urlretrieve (url, filePath)
 
     print (f'Extracting {fileName}')
 
-    if platform.system () == 'Windows':
-        if zipfile.is_zipfile (filePath):
-            with zipfile.ZipFile (filePath, 'r') as zip:
-                zip.extractall (path=dest)
-    elif platform.system () == 'Darwin':
-        if tarfile.is_tarfile (filePath):
-            with tarfile.open (filePath, 'r:gz') as tar:
-                tar.extractall (path=dest)
-        else:
-            CallCommand ([
-            'unzip', '-qq', filePath,
-            '-d', dest
-        ])
+    with TraceEvents.TraceSpan ('Extract', 'phase', {'file': str (filePath)}):
+        if platform.system () == 'Windows':
+            if zipfile.is_zipfile (filePath):
+                with zipfile.ZipFile (filePath, 'r') as zip:
+                    zip.extractall (path=dest)
+        elif platform.system () == 'Darwin':
+            if tarfile.is_tarfile (filePath):
+                with tarfile.open (filePath, 'r:gz') as tar:
+                    tar.extractall (path=dest)
+            else:
+                CallCommand ([
+                'unzip', '-qq', filePath,
+                '-d', dest
+            ])
 
 
 def GetInstalledVisualStudioGenerator ():
@@ -255,7 +260,8 @@ def GetProjectGenerationParams (args, workspaceRootFolder, buildPath, platformNa
         projGenParams.append (f'-DAC_WIN_CHARSETID={winCharsetId}')
     elif platformName == 'MAC':
         # Check if xcodebuild is available (requires full Xcode, not just Command Line Tools)
-        hasXcodebuild = subprocess.call ('xcodebuild -version', shell=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL) == 0
+        with TraceEvents.TraceCommand ('xcodebuild -version'):
+            hasXcodebuild = subprocess.call ('xcodebuild -version', shell=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL) == 0
         if hasXcodebuild:
             projGenParams.append ('-GXcode')
         else:
@@ -275,6 +281,8 @@ def GetProjectGenerationParams (args, workspaceRootFolder, buildPath, platformNa
     projGenParams.append (f'-DAC_API_DEVKIT_DIR={str (devkitDir)}')
     projGenParams.append (f'-DLP_XML_CONVERTER_FOLDER={str (lpXMLConverterFolder)}')
     projGenParams.append (f'-DAC_ADDON_LANGUAGE={languageCode}')
+    # resource build caches are shared between the language builds of the same Archicad version
+    projGenParams.append (f'-DAC_ADDON_RESOURCE_CACHE_DIR={str (buildPath.parent / "ResourceCache")}')
 
     if release:
         projGenParams.append ('-DAC_ADDON_FOR_DISTRIBUTION=ON')
@@ -294,10 +302,12 @@ def GetProjectGenerationParams (args, workspaceRootFolder, buildPath, platformNa
 
 def BuildAddOn (args, addOnName, platformName, additionalParams, workspaceRootFolder, buildFolder, devKitFolder, lpXMLConverterFolder, version, configuration, languageCode, release, quiet):
     buildPath = buildFolder / addOnName / version / languageCode
+    traceArgs = {'version': version, 'language': languageCode, 'configuration': configuration}
 
     # Add params to configure cmake
-    projGenParams = GetProjectGenerationParams (args, workspaceRootFolder, buildPath, platformName, devKitFolder, lpXMLConverterFolder, version, languageCode, release, additionalParams)
-    projGenResult = CallCommand (projGenParams, quiet)
+    with TraceEvents.TraceSpan ('Configure', 'phase', traceArgs):
+        projGenParams = GetProjectGenerationParams (args, workspaceRootFolder, buildPath, platformName, devKitFolder, lpXMLConverterFolder, version, languageCode, release, additionalParams)
+        projGenResult = CallCommand (projGenParams, quiet)
 
     if projGenResult != 0:
         raise Exception ('Failed to generate project!')
@@ -309,7 +319,8 @@ def BuildAddOn (args, addOnName, platformName, additionalParams, workspaceRootFo
         '--config', configuration
     ]
 
-    buildResult = CallCommand (buildParams, quiet)
+    with TraceEvents.TraceSpan ('Build', 'phase', traceArgs):
+        buildResult = CallCommand (buildParams, quiet)
 
     if buildResult != 0:
         raise Exception ('Failed to build project!')
@@ -412,28 +423,54 @@ def PackageAddOns (args, devKitData, addOnName, buildConfigList, acVersionList,
 
         for languageCode in languageList:
             for config in buildConfigList:
-                CopyResultToPackage (packageRootFolder, buildFolder, version, addOnName, platformName, config, languageCode, dependencies)
-                if (platformName == 'WIN'):
-                    CallCommand ([
-                            '7z', 'a',
-                            str (packageRootFolder.parent / version / f'{addOnName}-{versionAndBuildNum}_{platformName}_{languageCode}_{config}.zip'),
-                            str (packageRootFolder / version / languageCode / config / '*')
-                        ], args.quiet)
-                else:
-                    # ditto preserves extended Finder attributes
-                    CallCommand ([
-                            'ditto', '-ck', '--sequesterRsrc',
-                            str (packageRootFolder / version / languageCode / config / '*'),
-                            str (packageRootFolder.parent / version / f'{addOnName}-{versionAndBuildNum}_{platformName}_{languageCode}_{config}.zip')
-                        ], args.quiet)
+                with TraceEvents.TraceSpan ('Package', 'phase', {'version': version, 'language': languageCode, 'configuration': config}):
+                    CopyResultToPackage (packageRootFolder, buildFolder, version, addOnName, platformName, config, languageCode, dependencies)
+                    if (platformName == 'WIN'):
+                        CallCommand ([
+                                '7z', 'a',
+                                str (packageRootFolder.parent / version / f'{addOnName}-{versionAndBuildNum}_{platformName}_{languageCode}_{config}.zip'),
+                                str (packageRootFolder / version / languageCode / config / '*')
+                            ], args.quiet)
+                    else:
+                        # ditto preserves extended Finder attributes
+                        CallCommand ([
+                                'ditto', '-ck', '--sequesterRsrc',
+                                str (packageRootFolder / version / languageCode / config / '*'),
+                                str (packageRootFolder.parent / version / f'{addOnName}-{versionAndBuildNum}_{platformName}_{languageCode}_{config}.zip')
+                            ], args.quiet)
+
+def WriteBuildTrace (tracePath, traceFolder):
+    # the resource compilations started by cmake write their traces into the trace folder
+    traceEvents = TraceEvents.StopTracing ()
+    if traceFolder is not None:
+        traceEvents += TraceEvents.LoadTraceFolderEvents (traceFolder)
+        shutil.rmtree (traceFolder, ignore_errors=True)
+    TraceEvents.WriteTrace (tracePath, traceEvents)
+    print (f'Trace written to {tracePath}')
+
 
 def Main ():
+    tracePath = None
+    traceFolder = None
     try:
         args = ParseArguments ()
 
-        [devKitData, addOnName, buildConfigList, acVersionList, languageList, additionalParams, dependencies] = PrepareParameters (args)
+        if args.trace:
+            tracePath = pathlib.Path (args.trace).absolute ()
+            TraceEvents.StartTracing ('BuildAddOn')
+
+        with TraceEvents.TraceSpan ('Prepare parameters', 'phase'):
+            [devKitData, addOnName, buildConfigList, acVersionList, languageList, additionalParams, dependencies] = PrepareParameters (args)
 
-        [workspaceRootFolder, buildFolder, packageRootFolder, devKitFolderList, lpXMLConverterFolderList] = PrepareDirectories (args, devKitData, addOnName, acVersionList)
+        with TraceEvents.TraceSpan ('Prepare directories', 'phase'):
+            [workspaceRootFolder, buildFolder, packageRootFolder, devKitFolderList, lpXMLConverterFolderList] = PrepareDirectories (args, devKitData, addOnName, acVersionList)
+
+        if tracePath is not None:
+            traceFolder = buildFolder / 'Trace' / str (os.getpid ())
+            if traceFolder.exists ():
+                shutil.rmtree (traceFolder)
+            traceFolder.mkdir (parents=True)
+            os.environ[TraceEvents.TRACE_FOLDER_ENVIRONMENT_VARIABLE] = str (traceFolder)
 
         os.chdir (workspaceRootFolder)
 
@@ -450,6 +487,10 @@ def Main ():
         print (traceback.format_exc())
         sys.exit (1)
 
+    finally:
+        if tracePath is not None:
+            WriteBuildTrace (tracePath, traceFolder)
+
 if __name__ == "__main__":
     Main ()
 
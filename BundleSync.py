@@ -0,0 +1,147 @@
+import os
+import sys
+import json
+import codecs
+import ctypes
+import shutil
+import platform
+from pathlib import Path
+import ResourceCache
+
+
+BUNDLE_SYNC_VERSION = 1
+CHUNK_SIZE = 1024 * 1024
+
+# ioctl request of the Linux copy-on-write file clone
+FICLONE = 0x40049409
+
+
+def CloneFile (sourceFilePath: Path, targetFilePath: Path) -> bool:
+    system = platform.system ()
+    if system == 'Darwin':
+        libc = ctypes.CDLL (None, use_errno=True)
+        return libc.clonefile (os.fsencode (sourceFilePath), os.fsencode (targetFilePath), 0) == 0
+    if system == 'Linux':
+        import fcntl
+        with open (sourceFilePath, 'rb') as sourceFile, open (targetFilePath, 'wb') as targetFile:
+            try:
+                fcntl.ioctl (targetFile.fileno (), FICLONE, sourceFile.fileno ())
+                return True
+            except OSError:
+                pass
+        os.remove (targetFilePath)
+    return False
+
+
+def LinkOrCopyFile (sourceFilePath: Path, targetFilePath: Path) -> None:
+    """Clone the file where the file system supports it, otherwise hard link it, and copy it as the last resort."""
+    targetFilePath.parent.mkdir (parents=True, exist_ok=True)
+    tempFilePath = ResourceCache.GetTempFilePath (targetFilePath)
+    # the source files are replaced and not modified in place by the resource build, so sharing their data is safe
+    if not CloneFile (sourceFilePath, tempFilePath):
+        try:
+            os.link (sourceFilePath, tempFilePath)
+        except OSError:
+            shutil.copyfile (sourceFilePath, tempFilePath)
+    os.replace (tempFilePath, targetFilePath)
+
+
+def LoadSyncManifest (manifestPath: Path) -> dict:
+    if not manifestPath.exists ():
+        return {}
+    try:
+        with open (manifestPath, 'r', encoding='utf-8') as f:
+            manifest = json.load (f)
+    except (OSError, ValueError):
+        return {}
+    if manifest.get ('version') != BUNDLE_SYNC_VERSION:
+        return {}
+    return manifest.get ('files', {})
+
+
+def IsTargetIntact (entry: dict | None, sourceFilePath: Path, targetFilePath: Path) -> bool:
+    if entry is None or entry['source'] != str (sourceFilePath) or not targetFilePath.exists ():
+        return False
+    # the target must not be modified since the previous sync
+    return ResourceCache.GetFileStamp (targetFilePath) == entry['targetStamp']
+
+
+def SyncFiles (files: dict[Path, Path], manifestPath: Path) -> tuple[list[Path], list[Path]]:
+    """
+    Make the target files (keys) the same as the source files (values) and remove the targets of the previous
+    sync that are not needed any more. The manifest of the previous sync is used to skip the unchanged files.
+    Returns the updated and the removed target files.
+    """
+    previousEntries = LoadSyncManifest (manifestPath)
+    entries = {}
+    updatedFilePaths = []
+    for targetFilePath, sourceFilePath in files.items ():
+        targetFilePath = Path (targetFilePath).absolute ()
+        sourceFilePath = Path (sourceFilePath).absolute ()
+        entry = previousEntries.get (str (targetFilePath))
+        sourceStamp = ResourceCache.GetFileStamp (sourceFilePath)
+        sourceHash = None
+        if IsTargetIntact (entry, sourceFilePath, targetFilePath):
+            # the resource build rewrites unchanged outputs, for example when they are restored from the cache
+            sourceHash = entry['hash'] if sourceStamp == entry['sourceStamp'] else ResourceCache.GetFileHash (sourceFilePath)
+        if sourceHash is None or sourceHash != entry['hash']:
+            sourceHash = sourceHash or ResourceCache.GetFileHash (sourceFilePath)
+            LinkOrCopyFile (sourceFilePath, targetFilePath)
+            updatedFilePaths.append (targetFilePath)
+        entries[str (targetFilePath)] = {
+            'source': str (sourceFilePath),
+            'sourceStamp': sourceStamp,
+            'hash': sourceHash,
+            'targetStamp': ResourceCache.GetFileStamp (targetFilePath),
+        }
+
+    removedFilePaths = []
+    for targetFilePath in sorted (set (previousEntries.keys ()) - set (entries.keys ())):
+        if os.path.isfile (targetFilePath):
+            os.remove (targetFilePath)
+            removedFilePaths.append (Path (targetFilePath))
+
+    ResourceCache.WriteFileAtomic (manifestPath, json.dumps ({ 'version': BUNDLE_SYNC_VERSION, 'files': entries }, indent=1, sort_keys=True))
+    return (updatedFilePaths, removedFilePaths)
+
+
+def CopyUTF16Content (sourceFile, targetFile) -> None:
+    # the content is written in the native byte order without BOM, it is only converted if the source has the other byte order
+    bom = sourceFile.read (2)
+    if bom in [codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE] and bom != codecs.BOM_UTF16:
+        decoder = codecs.getincrementaldecoder ('utf-16-be' if bom == codecs.BOM_UTF16_BE else 'utf-16-le') ()
+        targetEncoding = 'utf-16-le' if sys.byteorder == 'little' else 'utf-16-be'
+        for chunk in iter (lambda: sourceFile.read (CHUNK_SIZE), b''):
+            targetFile.write (decoder.decode (chunk).encode (targetEncoding))
+        targetFile.write (decoder.decode (b'', final=True).encode (targetEncoding))
+        return
+    if bom != codecs.BOM_UTF16:
+        targetFile.write (bom)
+    shutil.copyfileobj (sourceFile, targetFile, CHUNK_SIZE)
+
+
+def IsSameContent (filePath: Path, otherFilePath: Path) -> bool:
+    if os.path.getsize (filePath) != os.path.getsize (otherFilePath):
+        return False
+    return ResourceCache.GetFileHash (filePath) == ResourceCache.GetFileHash (otherFilePath)
+
+
+def WriteUTF16Concatenation (sourceFilePaths: list[Path], targetFilePath: Path) -> bool:
+    """
+    Concatenate the UTF-16 files into one UTF-16 file with a single BOM. The target is replaced only if
+    its content changes, so its timestamp stays the same otherwise. Returns whether the target was replaced.
+    """
+    targetFilePath.parent.mkdir (parents=True, exist_ok=True)
+    tempFilePath = ResourceCache.GetTempFilePath (targetFilePath)
+    with open (tempFilePath, 'wb') as targetFile:
+        if len (sourceFilePaths) > 0:
+            targetFile.write (codecs.BOM_UTF16)
+        for sourceFilePath in sourceFilePaths:
+            with open (sourceFilePath, 'rb') as sourceFile:
+                CopyUTF16Content (sourceFile, targetFile)
+
+    if targetFilePath.exists () and IsSameContent (tempFilePath, targetFilePath):
+        os.remove (tempFilePath)
+        return False
+    os.replace (tempFilePath, targetFilePath)
+    return True
@@ -219,6 +219,131 @@ function (generate_add_on_version_info addOnLanguage outSemver)
     endif ()
 endfunction ()
 
+# Adds a custom command running one step of CompileResources, the inputs of the step are read from its dependency file.
+function (AddResourceStepCommand)
+    cmake_parse_arguments (PARSE_ARGV 0 step "" "STAMP;COMMENT" "DEPENDS;ARGUMENTS")
+    set (stepDepFileOption "")
+    if (CMAKE_VERSION VERSION_GREATER_EQUAL 3.21)
+        set (stepDepFileOption DEPFILE "${step_STAMP}.d")
+    endif ()
+    add_custom_command (
+        OUTPUT "${step_STAMP}"
+        DEPENDS ${step_DEPENDS}
+        ${stepDepFileOption}
+        COMMENT "${step_COMMENT}"
+        COMMAND ${CMAKE_COMMAND} -E make_directory "${ResourceObjectsDir}/Steps"
+        COMMAND ${compileResourcesCommand} ${step_ARGUMENTS}
+            --depFile "${step_STAMP}.d"
+            --depFileTarget "${step_STAMP}"
+        COMMAND ${CMAKE_COMMAND} -E touch "${step_STAMP}"
+    )
+endfunction ()
+
+# Per-file resource compile mode: one custom command for every resource file, so the build tool can run them in parallel.
+function (GenerateResourceStepCommands)
+    set (stepStampDir "${ResourceObjectsDir}/Steps")
+    set (stepDependencies "")
+    if (CMAKE_VERSION VERSION_LESS 3.21)
+        set (stepDependencies ${AddOnImageFiles} ${AddOnXLIFFFiles})
+    endif ()
+
+    file (GLOB_RECURSE AddOnLibraryPartFiles CONFIGURE_DEPENDS
+        ${addOnResourcesFolder}/R${addOnDefaultLanguage}/ACLib/Src/*
+    )
+    set (libraryStampFile "${stepStampDir}/Library.stamp")
+    AddResourceStepCommand (
+        STAMP "${libraryStampFile}"
+        COMMENT "Compiling library parts..."
+        DEPENDS ${AddOnLibraryPartFiles}
+        ARGUMENTS --step library
+    )
+    set (allStampFiles "${libraryStampFile}")
+
+    file (GLOB localizedGRCFiles CONFIGURE_DEPENDS ${addOnResourcesFolder}/R${addOnLanguage}/*.grc)
+    file (GLOB fixGRCFiles CONFIGURE_DEPENDS ${addOnResourcesFolder}/RFIX/*.grc)
+    foreach (grcFile ${localizedGRCFiles} ${fixGRCFiles})
+        get_filename_component (grcFileName "${grcFile}" NAME)
+        if (grcFile IN_LIST localizedGRCFiles)
+            set (stampFile "${stepStampDir}/R${addOnLanguage}_${grcFileName}.stamp")
+            set (localizedArgument --localized)
+            set (collidingStampFile "")
+        else ()
+            set (stampFile "${stepStampDir}/RFIX_${grcFileName}.stamp")
+            set (localizedArgument "")
+            # GRC files with the same name share their intermediate files, so they must not be compiled at the same time
+            set (collidingStampFile "")
+            if (EXISTS "${AddOnResourcesFolderAbsolute}/R${addOnLanguage}/${grcFileName}")
+                set (collidingStampFile "${stepStampDir}/R${addOnLanguage}_${grcFileName}.stamp")
+            endif ()
+        endif ()
+        AddResourceStepCommand (
+            STAMP "${stampFile}"
+            COMMENT "Compiling ${grcFileName}..."
+            DEPENDS "${grcFile}" "${libraryStampFile}" ${collidingStampFile} ${stepDependencies}
+            ARGUMENTS --step grc --input "${grcFile}" ${localizedArgument}
+        )
+        list (APPEND allStampFiles "${stampFile}")
+    endforeach ()
+
+    set (mergeXliffStampFile "${stepStampDir}/MergeXliff.stamp")
+    AddResourceStepCommand (
+        STAMP "${mergeXliffStampFile}"
+        COMMENT "Merging XLIFF files..."
+        DEPENDS ${AddOnXLIFFFiles} ${AddOnJSONResourceFiles}
+        ARGUMENTS --step mergeXliff
+    )
+    list (APPEND allStampFiles "${mergeXliffStampFile}")
+
+    # the native resources created from JSON files update a shared table of contents, so they are created one after the other
+    foreach (kind Localized Fix)
+        if (kind STREQUAL "Localized")
+            file (GLOB jsonFiles CONFIGURE_DEPENDS ${addOnResourcesFolder}/R${addOnDefaultLanguage}/*.json)
+            set (localizedArgument --localized)
+            set (previousStampFile "${mergeXliffStampFile}")
+        else ()
+            file (GLOB jsonFiles CONFIGURE_DEPENDS ${addOnResourcesFolder}/RFIX/*.json)
+            set (localizedArgument "")
+            set (previousStampFile "${libraryStampFile}")
+        endif ()
+        foreach (jsonFile ${jsonFiles})
+            get_filename_component (jsonFileName "${jsonFile}" NAME)
+            set (stampFile "${stepStampDir}/${kind}_${jsonFileName}.stamp")
+            AddResourceStepCommand (
+                STAMP "${stampFile}"
+                COMMENT "Compiling ${jsonFileName}..."
+                DEPENDS "${jsonFile}" "${libraryStampFile}" "${previousStampFile}" ${stepDependencies}
+                ARGUMENTS --step json --input "${jsonFile}" ${localizedArgument}
+            )
+            set (previousStampFile "${stampFile}")
+        endforeach ()
+
+        set (tocStampFile "${stepStampDir}/${kind}TableOfContents.stamp")
+        AddResourceStepCommand (
+            STAMP "${tocStampFile}"
+            COMMENT "Generating ${kind} JSON table of contents..."
+            DEPENDS "${previousStampFile}"
+            ARGUMENTS --step toc ${localizedArgument}
+        )
+        list (APPEND allStampFiles "${tocStampFile}")
+    endforeach ()
+
+    set (nativeDepFileOption "")
+    if (CMAKE_VERSION VERSION_GREATER_EQUAL 3.21)
+        set (nativeDepFileOption DEPFILE "${ResourceDepFile}")
+    endif ()
+    add_custom_command (
+        OUTPUT ${ResourceStampFile}
+        DEPENDS ${allStampFiles} ${AddOnResourceFiles}
+        ${nativeDepFileOption}
+        COMMENT "Linking resources..."
+        COMMAND ${compileResourcesCommand} --step native
+            --depFile "${ResourceDepFile}"
+            --depFileTarget "${ResourceStampFile}"
+        ${pkgInfoCommand}
+        COMMAND ${CMAKE_COMMAND} -E touch ${ResourceStampFile}
+    )
+endfunction ()
+
 function (GenerateAddOnProject target acVersion devKitDir addOnSourcesFolder addOnResourcesFolder addOnLanguage addOnDefaultLanguage addOnPCH)
     verify_api_devkit_folder ("${devKitDir}")
     if (NOT addOnLanguage IN_LIST addOnLanguages)
@@ -266,6 +391,14 @@ function (GenerateAddOnProject target acVersion devKitDir addOnSourcesFolder add
         set (permissiveLocalizationArgument "--permissiveLocalization")
     endif ()
 
+    set (resourceCacheDirArgument "")
+    if (AC_ADDON_RESOURCE_CACHE_DIR)
+        set (resourceCacheDirArgument "--cacheDir" "${AC_ADDON_RESOURCE_CACHE_DIR}")
+    endif ()
+    if (AC_ADDON_RESCONV_CACHE_DIR)
+        list (APPEND resourceCacheDirArgument "--resConvCacheDir" "${AC_ADDON_RESCONV_CACHE_DIR}")
+    endif ()
+
     get_filename_component (AddOnSourcesFolderAbsolute "${CMAKE_CURRENT_LIST_DIR}/${addOnSourcesFolder}" ABSOLUTE)
     get_filename_component (AddOnResourcesFolderAbsolute "${CMAKE_CURRENT_LIST_DIR}/${addOnResourcesFolder}" ABSOLUTE)
     if(AC_USE_LOCAL_DEVKIT)
@@ -274,46 +407,58 @@ function (GenerateAddOnProject target acVersion devKitDir addOnSourcesFolder add
         set(DEVKIT_BUILDNUM_VALUE "default")
     endif()
     if (WIN32)
-        add_custom_command (
-            OUTPUT ${ResourceStampFile}
-            DEPENDS ${AddOnResourceFiles} ${AddOnImageFiles} ${AddOnJSONResourceFiles} ${AddOnXLIFFFiles}
-            COMMENT "Compiling resources..."
-            COMMAND ${CMAKE_COMMAND} -E make_directory "${ResourceObjectsDir}"
-            COMMAND ${Python3_EXECUTABLE} "${CMAKE_CURRENT_FUNCTION_LIST_DIR}/CompileResources.py"
-                "${addOnName}"
-                "${addOnLanguage}"
-                "${addOnDefaultLanguage}"
-                "${acVersion}"
-                "${DEVKIT_BUILDNUM_VALUE}"
-                "${devKitDir}"
-                "${lpXMLConverterFolder}"
-                "${AddOnSourcesFolderAbsolute}"
-                "${AddOnResourcesFolderAbsolute}"
-                "${ResourceObjectsDir}"
-                "${ResourceObjectsDir}/${addOnName}.res"
-                ${permissiveLocalizationArgument}
-            COMMAND ${CMAKE_COMMAND} -E touch ${ResourceStampFile}
-        )
+        set (resultResourcePath "${ResourceObjectsDir}/${addOnName}.res")
+        set (pkgInfoCommand "")
+    else ()
+        set (resultResourcePath "${CMAKE_BINARY_DIR}/$<CONFIG>/${addOnName}.bundle/Contents/Resources")
+        set (pkgInfoCommand COMMAND ${CMAKE_COMMAND} -E copy "${devKitDir}/Inc/PkgInfo" "${CMAKE_BINARY_DIR}/$<CONFIG>/${addOnName}.bundle/Contents/PkgInfo")
+    endif ()
+    # the resource compile server keeps the resource compiler loaded between the invocations
+    if (AC_ADDON_RESOURCE_COMPILE_SERVER)
+        set (compileResourcesScript "${CMAKE_CURRENT_FUNCTION_LIST_DIR}/ResourceCompileServer.py" compile)
+    else ()
+        set (compileResourcesScript "${CMAKE_CURRENT_FUNCTION_LIST_DIR}/CompileResources.py")
+    endif ()
+    set (compileResourcesCommand
+        ${Python3_EXECUTABLE} ${compileResourcesScript}
+        "${addOnName}"
+        "${addOnLanguage}"
+        "${addOnDefaultLanguage}"
+        "${acVersion}"
+        "${DEVKIT_BUILDNUM_VALUE}"
+        "${devKitDir}"
+        "${lpXMLConverterFolder}"
+        "${AddOnSourcesFolderAbsolute}"
+        "${AddOnResourcesFolderAbsolute}"
+        "${ResourceObjectsDir}"
+        "${resultResourcePath}"
+        ${permissiveLocalizationArgument}
+        ${resourceCacheDirArgument}
+    )
+
+    # CompileResources writes every file it reads into a dependency file, the coarse globs are only needed without it
+    set (ResourceDepFile "${ResourceObjectsDir}/AddOnResources.d")
+    if (CMAKE_VERSION VERSION_GREATER_EQUAL 3.21)
+        set (resourceDependencies ${AddOnResourceFiles} ${AddOnJSONResourceFiles})
+        set (resourceDepFileOption DEPFILE "${ResourceDepFile}")
+    else ()
+        set (resourceDependencies ${AddOnResourceFiles} ${AddOnImageFiles} ${AddOnJSONResourceFiles} ${AddOnXLIFFFiles})
+        set (resourceDepFileOption "")
+    endif ()
+
+    if (AC_ADDON_PER_FILE_RESOURCES)
+        GenerateResourceStepCommands ()
     else ()
         add_custom_command (
             OUTPUT ${ResourceStampFile}
-            DEPENDS ${AddOnResourceFiles} ${AddOnImageFiles} ${AddOnJSONResourceFiles} ${AddOnXLIFFFiles}
+            DEPENDS ${resourceDependencies}
+            ${resourceDepFileOption}
             COMMENT "Compiling resources..."
             COMMAND ${CMAKE_COMMAND} -E make_directory "${ResourceObjectsDir}"
-            COMMAND ${Python3_EXECUTABLE} "${CMAKE_CURRENT_FUNCTION_LIST_DIR}/CompileResources.py"
-                "${addOnName}"
-                "${addOnLanguage}"
-                "${addOnDefaultLanguage}"
-                "${acVersion}"
-                "${DEVKIT_BUILDNUM_VALUE}"
-                "${devKitDir}"
-                "${lpXMLConverterFolder}"
-                "${AddOnSourcesFolderAbsolute}"
-                "${AddOnResourcesFolderAbsolute}"
-                "${ResourceObjectsDir}"
-                "${CMAKE_BINARY_DIR}/$<CONFIG>/${addOnName}.bundle/Contents/Resources"
-                ${permissiveLocalizationArgument}
-            COMMAND ${CMAKE_COMMAND} -E copy "${devKitDir}/Inc/PkgInfo" "${CMAKE_BINARY_DIR}/$<CONFIG>/${addOnName}.bundle/Contents/PkgInfo"
+            COMMAND ${compileResourcesCommand}
+                --depFile "${ResourceDepFile}"
+                --depFileTarget "${ResourceStampFile}"
+            ${pkgInfoCommand}
             COMMAND ${CMAKE_COMMAND} -E touch ${ResourceStampFile}
         )
     endif ()
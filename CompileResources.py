@@ -1,22 +1,122 @@
 import os
 import sys
 import platform
-import subprocess
 import shutil
-import codecs
 import argparse
 import re
 import json
-import pathlib
+import hashlib
+import functools
+import threading
 from pathlib import Path
+from typing import Callable
 from LocalizationMappingTable import FillLocalizationMappingTable
+import ResourceCache
+import ScriptRunner
+import ParallelJobs
+import PreprocessorCache
+import ResourceManifest
+import BundleSync
+import ResourceTools
+import TraceEvents
 
 from JsonToGrcConverter import JsonToGrcConverter
 from JsonToGrcConverter import JsonTranslator
+from JsonToGrcConverter import ConverterStats
+
+
+RESCONV_CACHE_VERSION = 1
+DEVKIT_INFO_VERSION = 1
+NATIVE_RESOURCE_FINGERPRINT_VERSION = 1
+LIBRARY_CACHE_VERSION = 1
+SHARED_FIX_RESOURCES_VERSION = 1
+RESOURCE_STEPS = ['all', 'library', 'grc', 'mergeXliff', 'json', 'toc', 'native']
+
+# parsed DevKit link tables by path, reused while the file is unchanged (e.g. in the resource compile server)
+devKitDataTables = {}
+
+
+def LoadDevKitData (devKitDataPath: Path) -> dict:
+    devKitDataStat = os.stat (devKitDataPath)
+    tableKey = (str (devKitDataPath), devKitDataStat.st_mtime_ns, devKitDataStat.st_size)
+    if tableKey not in devKitDataTables:
+        with open (devKitDataPath, 'r') as devKitDataFile:
+            devKitDataTables[tableKey] = json.load (devKitDataFile)
+    return devKitDataTables[tableKey]
+
+
+class DevKitInfo (object):
+    def __init__ (self, mainVersion: int, buildNumber: int, hasJsonResourceProcessor: bool):
+        self.mainVersion = mainVersion
+        self.buildNumber = buildNumber
+        self.hasJsonResourceProcessor = hasJsonResourceProcessor
+        # ResConv can generate Dark Mode icons with the SVG color change script
+        self.supportsSvgColorChange = (mainVersion == 29 and buildNumber >= 3000) or (mainVersion == 30 and buildNumber >= 82) or (mainVersion > 30)
+
+    def ToDict (self) -> dict:
+        return { 'mainVersion': self.mainVersion, 'buildNumber': self.buildNumber, 'hasJsonResourceProcessor': self.hasJsonResourceProcessor }
+
+
+# DevKit identities shared by every compiler of the process
+devKitInfos = {}
+
+
+def GetJSONResourceProcessorPath (devKitPath: Path, jsonResourceProcessorPath: Path | None) -> Path:
+    return jsonResourceProcessorPath if jsonResourceProcessorPath is not None else devKitPath / 'Tools' / 'JSONResourceProcessor'
+
+
+def GetDevKitInfoKey (devKitPath: Path, acVersion: str, buildNum: str, platformKey: str, jsonResourceProcessorPath: Path | None = None) -> str:
+    keyItems = [DEVKIT_INFO_VERSION, devKitPath.absolute (), acVersion, buildNum, platformKey]
+    if buildNum == "default":
+        devKitDataStat = os.stat (Path (__file__).absolute ().parent / 'APIDevKitLinks.json')
+        keyItems.extend ([devKitDataStat.st_mtime_ns, devKitDataStat.st_size])
+    # the folder changes when a tool is added to or removed from the DevKit
+    toolsPath = devKitPath / 'Tools'
+    keyItems.append (os.stat (toolsPath).st_mtime_ns if toolsPath.exists () else None)
+    if jsonResourceProcessorPath is not None:
+        keyItems.extend ([jsonResourceProcessorPath.absolute (), jsonResourceProcessorPath.exists ()])
+    return ResourceCache.GetFingerprint (keyItems)
+
+
+def ResolveDevKitInfo (devKitPath: Path, acVersion: str, buildNum: str, platformKey: str, jsonResourceProcessorPath: Path | None = None) -> DevKitInfo:
+    hasJsonResourceProcessor = GetJSONResourceProcessorPath (devKitPath, jsonResourceProcessorPath).exists ()
+    if buildNum != "default":
+        return DevKitInfo (int (acVersion), int (buildNum), hasJsonResourceProcessor)
+
+    devKitData = LoadDevKitData (Path (__file__).absolute ().parent / 'APIDevKitLinks.json')
+    devkit_verison_regex = re.search(rf'API\.Development\.Kit\.{platformKey}\.(\d+)\.(\d+)',
+                                     devKitData[platformKey][acVersion],
+                                     re.IGNORECASE)
+    assert devkit_verison_regex, f'Unknown Development Kit version: {acVersion}'
+    return DevKitInfo (int (devkit_verison_regex.group (1)), int (devkit_verison_regex.group (2)), hasJsonResourceProcessor)
+
+
+def GetDevKitInfo (devKitPath: Path, acVersion: str, buildNum: str, platformKey: str, cacheDir: Path | None, jsonResourceProcessorPath: Path | None = None) -> DevKitInfo:
+    """Return the identity of the DevKit, it is resolved once and persisted in the cache folder for later processes."""
+    devKitInfoKey = GetDevKitInfoKey (devKitPath, acVersion, buildNum, platformKey, jsonResourceProcessorPath)
+    if devKitInfoKey in devKitInfos:
+        return devKitInfos[devKitInfoKey]
+
+    devKitInfo = None
+    devKitInfoPath = cacheDir / f'{devKitInfoKey}.json' if cacheDir is not None else None
+    if devKitInfoPath is not None and devKitInfoPath.exists ():
+        try:
+            with open (devKitInfoPath, 'r', encoding='utf-8') as f:
+                devKitInfo = DevKitInfo (**json.load (f))
+        except (OSError, ValueError, TypeError):
+            devKitInfo = None
+    if devKitInfo is None:
+        devKitInfo = ResolveDevKitInfo (devKitPath, acVersion, buildNum, platformKey, jsonResourceProcessorPath)
+        if devKitInfoPath is not None:
+            ResourceCache.WriteFileAtomic (devKitInfoPath, json.dumps (devKitInfo.ToDict ()))
+
+    devKitInfos[devKitInfoKey] = devKitInfo
+    return devKitInfo
+
 
 class Compiler (object):
     def __init__ (self, devKitPath: Path, acVersion: str, buildNum: str, addonName: str, languageCode: str, defaultLanguageCode: str,
-                  sourcesPath: Path, resourcesPath: Path, resourceObjectsPath: Path):
+                  sourcesPath: Path, resourcesPath: Path, resourceObjectsPath: Path, resourceTools: ResourceTools.ResourceTools | None = None):
         self.devKitPath = devKitPath
         self.acVersion = acVersion
         self.buildNum = buildNum
@@ -26,40 +126,57 @@ class Compiler (object):
         self.sourcesPath = sourcesPath
         self.resourcesPath = resourcesPath
         self.resourceObjectsPath = resourceObjectsPath
+        self.resourceTools = resourceTools if resourceTools is not None else ResourceTools.ResourceTools ()
+        self.devKitInfo = None
+        self.resourceManifest = ResourceManifest.ResourceManifest (None)
 
     def GetPlatformDevKitLinkKey (self) -> str:
         return ""
 
-    def GetDevKitVersionAndBuildNumber (self) -> tuple[int, int]:
-        if self.buildNum != "default":
-            return (int (self.acVersion), int (self.buildNum))
-        devKitDataPath = pathlib.Path (__file__).absolute ().parent / 'APIDevKitLinks.json'
-        with open (devKitDataPath, 'r') as devKitDataFile:
-            devKitData = json.load (devKitDataFile)
+    def GetDevKitInfoCacheDir (self) -> Path | None:
+        return None
+
+    def GetDevKitInfo (self) -> 'DevKitInfo':
+        if self.devKitInfo is None:
+            self.devKitInfo = GetDevKitInfo (self.devKitPath, self.acVersion, self.buildNum, self.GetPlatformDevKitLinkKey (), self.GetDevKitInfoCacheDir (),
+                self.GetJSONResourceProcessorPath ())
+        return self.devKitInfo
 
-        devkit_verison_regex = re.search(rf'API\.Development\.Kit\.{self.GetPlatformDevKitLinkKey()}\.(\d+)\.(\d+)',
-                                         devKitData[self.GetPlatformDevKitLinkKey()][self.acVersion],
-                                         re.IGNORECASE)
-        if devkit_verison_regex:
-            main_version = devkit_verison_regex.group(1)
-            build_number = devkit_verison_regex.group(2)
+    def GetJSONResourceProcessorPath (self) -> Path:
+        return self.resourceTools.GetToolPath ('jsonResourceProcessor', GetJSONResourceProcessorPath (self.devKitPath, None))
 
-        return (int (main_version), int (build_number))
+    def GetDevKitVersionAndBuildNumber (self) -> tuple[int, int]:
+        devKitInfo = self.GetDevKitInfo ()
+        return (devKitInfo.mainVersion, devKitInfo.buildNumber)
 
     # this means that the .grc containing Library resources has to be separate from other .grc files
     def IsLibraryGRC (self, grcFilePath: Path) -> bool:
-        with open(grcFilePath, 'r', encoding='utf-8', errors='ignore') as f:
-            file_content = f.read()
-        if 'FILE' in file_content and '.gsm' in file_content:
-            return True
-        return False
+        return self.resourceManifest.IsLibraryGRC (grcFilePath)
 
 
 class ResourceCompiler (Compiler):
-    def __init__ (self, devKitPath: Path, acVersion: str, buildNum: str, addonName: str, languageCode: str, defaultLanguageCode: str, sourcesPath: Path, resourcesPath: Path, resourceObjectsPath: Path, permissiveLocalization: bool, hasLibpartCompiler: bool):
-        super (ResourceCompiler, self).__init__ (devKitPath, acVersion, buildNum, addonName, languageCode, defaultLanguageCode, sourcesPath, resourcesPath, resourceObjectsPath)
+    def __init__ (self, devKitPath: Path, acVersion: str, buildNum: str, addonName: str, languageCode: str, defaultLanguageCode: str, sourcesPath: Path, resourcesPath: Path, resourceObjectsPath: Path, permissiveLocalization: bool, hasLibpartCompiler: bool, cacheDir: Path, scriptRunner: ScriptRunner.ScriptRunner, jobRunner: ParallelJobs.JobRunner, resConvCacheDir: Path, resourceTools: ResourceTools.ResourceTools | None = None):
+        super (ResourceCompiler, self).__init__ (devKitPath, acVersion, buildNum, addonName, languageCode, defaultLanguageCode, sourcesPath, resourcesPath, resourceObjectsPath, resourceTools)
         self.permissiveLocalization = permissiveLocalization
         self.hasLibpartCompiler = hasLibpartCompiler
+        self.cacheDir = cacheDir
+        self.scriptRunner = scriptRunner
+        self.jobRunner = jobRunner
+        self.xliffChain = None
+        self.translations = None
+        self.unitFingerprints = None
+        self.mergedXliffPath = None
+        self.checkerFingerprint = None
+        self.precompiledFileTasks = {}
+        self.nativeResourceTasks = {}
+        self.resConvCacheDir = resConvCacheDir
+        self.fileHashCache = {}
+        self.fileHashCacheLock = threading.Lock ()
+        self.resourceManifest = ResourceManifest.ResourceManifest (resourceObjectsPath / 'ResourceManifest.json')
+        self.sharedFixResourcesLock = None
+        self.sharedFixResourcesUpToDate = False
+        self.converterStats = None
+        self.converterStatsLock = threading.Lock ()
         self.resConvPath = None
         self.nativeResourceFileExtension = None
 
@@ -83,122 +200,247 @@ class ResourceCompiler (Compiler):
         else:
             return self.resourcesPath / 'ResourceLibrary' / languageCode / 'XLF' / f'{self.GetNormalizedAddonName (self.addonName)}.xlf'
 
-    def GetParentXliffPath (self) -> Path | None:
-        parentTxtPath = self.resourcesPath / 'ResourceLibrary' / self.languageCode / 'XLF' / '_parent.txt'
-        if parentTxtPath.exists ():
-            parentLanguageCode = codecs.open (parentTxtPath, 'r', 'utf-8').read ().strip ()
-            return self.GetXliffPathForLanguage (parentLanguageCode)
-        return None
-
-    def CompileGRCFromJSON (self, jsonFilePath: Path, localized: bool) -> None:
+    def GetParentLanguageCode (self, languageCode: str) -> str | None:
+        parentTxtPath = self.resourcesPath / 'ResourceLibrary' / languageCode / 'XLF' / '_parent.txt'
+        if not parentTxtPath.exists ():
+            return None
+        with open (parentTxtPath, 'r', encoding='utf-8') as f:
+            return f.read ().strip ()
+
+    # the first item is the XLIFF of the current language, every following item is the parent of the previous one
+    def GetXliffChain (self) -> list[Path]:
+        if self.xliffChain is None:
+            chainLanguageCodes = []
+            languageCode = self.languageCode
+            while languageCode is not None:
+                assert languageCode not in chainLanguageCodes, 'Cyclic XLIFF parent chain: ' + ' -> '.join (chainLanguageCodes + [languageCode])
+                chainLanguageCodes.append (languageCode)
+                languageCode = self.GetParentLanguageCode (languageCode)
+            self.xliffChain = [self.GetXliffPathForLanguage (languageCode) for languageCode in chainLanguageCodes]
+        return self.xliffChain
+
+    def GetTranslations (self) -> dict[str, str]:
+        if self.translations is None:
+            self.translations = JsonTranslator.GetChainedTranslations (self.GetXliffChain (), self.cacheDir / 'Translations')
+        return self.translations
+
+    def GetUnitFingerprints (self) -> dict[str, str]:
+        if self.unitFingerprints is None:
+            self.unitFingerprints = JsonTranslator.GetChainedUnitFingerprints (self.GetXliffChain (), self.cacheDir / 'Translations')
+        return self.unitFingerprints
+
+    # the merged XLIFF is the same for every JSON file, so it is created only once per resource build
+    def GetMergedXliffPath (self, jsonResourceProcessorPath: Path) -> Path:
+        if self.mergedXliffPath is None:
+            self.mergedXliffPath = self.MergeXliffChain (jsonResourceProcessorPath)
+        return self.mergedXliffPath
+
+    def MergeXliffChain (self, jsonResourceProcessorPath: Path) -> Path:
+        xliffChain = self.GetXliffChain ()
+        if len (xliffChain) == 1:
+            return xliffChain[0]
+
+        normalizedAddonName = self.GetNormalizedAddonName (self.addonName)
+        resultXliffPath = self.resourceObjectsPath / f'{normalizedAddonName}.merged.xlf'
+        fingerprintFilePath = self.resourceObjectsPath / f'{normalizedAddonName}.merged.xlf.fingerprint'
+        mergeScriptPath = jsonResourceProcessorPath / 'MergeParentChildXliff.py'
+        fingerprint = ResourceCache.GetFingerprint ([ResourceCache.GetFileHash (mergeScriptPath)] +
+                                                    [ResourceCache.GetFileHash (xliffPath) for xliffPath in xliffChain])
+        if resultXliffPath.exists () and ResourceCache.IsFingerprintUpToDate (fingerprintFilePath, fingerprint):
+            return resultXliffPath
+
+        mergedXliffPath = xliffChain[-1]
+        for level in range (len (xliffChain) - 2, -1, -1):
+            if level == 0:
+                mergedXliffOutputPath = resultXliffPath
+            else:
+                mergedXliffOutputPath = self.resourceObjectsPath / f'{normalizedAddonName}.merged.{level}.xlf'
+            mergeParentChildXliffResult = self.scriptRunner.Run (mergeScriptPath, [
+                '--childXliff', xliffChain[level],
+                '--parentXliff', mergedXliffPath,
+                '-o', mergedXliffOutputPath
+            ])
+            assert mergeParentChildXliffResult == 0, f'Merge parent child XLIFF command failed: {xliffChain[level]}'
+            mergedXliffPath = mergedXliffOutputPath
+
+        ResourceCache.WriteFingerprint (fingerprintFilePath, fingerprint)
+        return resultXliffPath
+
+    def ConvertJSONToGRC (self, jsonFilePath: Path, localized: bool) -> Path:
         with open (jsonFilePath, 'r', encoding='utf-8') as f:
             jsonData = json.load (f)
 
         if localized:
-            translations = JsonTranslator.GetMergedTranslations (self.GetXliffPathForLanguage (self.languageCode), self.GetParentXliffPath ())
-            JsonTranslator.TranslateJson (jsonData, translations)
+            JsonTranslator.TranslateJson (jsonData, self.GetTranslations ())
 
         devkitVersion, _ = self.GetDevKitVersionAndBuildNumber ()
-        grcContent = JsonToGrcConverter.ConvertJsonDataToGrcString (jsonData, devkitVersion)
+        convertedResources = []
+        fileConverterStats = ConverterStats.ConverterStats () if self.converterStats is not None else None
+        grcContent = JsonToGrcConverter.ConvertJsonDataToGrcString (jsonData, devkitVersion, resourceManifest=convertedResources, converterStats=fileConverterStats)
         outputGrcFile = self.resourceObjectsPath / f'{jsonFilePath.name}.grc'
         with open (outputGrcFile, 'w', encoding='utf-8') as f:
             f.write (grcContent)
+        self.WriteConvertedResourceManifest (outputGrcFile, convertedResources)
+        if fileConverterStats is not None:
+            self.AddConverterStats (outputGrcFile, fileConverterStats)
+        return outputGrcFile
+
+    # the counters of every converted file are written next to it and summed up for the whole build
+    def AddConverterStats (self, grcFilePath: Path, fileConverterStats: ConverterStats.ConverterStats) -> None:
+        fileConverterStats.WriteJson (grcFilePath.with_name (f'{grcFilePath.name}.stats.json'))
+        with self.converterStatsLock:
+            self.converterStats.Merge (fileConverterStats)
+
+    def GetConvertedResourceManifestPath (self, grcFilePath: Path) -> Path:
+        return grcFilePath.with_name (f'{grcFilePath.name}.manifest')
+
+    def WriteConvertedResourceManifest (self, grcFilePath: Path, convertedResources: list[dict]) -> None:
+        ResourceCache.WriteFileAtomic (self.GetConvertedResourceManifestPath (grcFilePath), json.dumps ({
+            'grcStamp': ResourceCache.GetFileStamp (grcFilePath),
+            'resources': convertedResources,
+        }))
+
+    # the resources emitted by the JSON converter, None for hand-written GRC files
+    def LoadConvertedResourceManifest (self, grcFilePath: Path) -> list[dict] | None:
+        manifestPath = self.GetConvertedResourceManifestPath (grcFilePath)
+        if not grcFilePath.exists () or not manifestPath.exists ():
+            return None
+        try:
+            with open (manifestPath, 'r', encoding='utf-8') as f:
+                manifest = json.load (f)
+        except (OSError, ValueError):
+            return None
+        if manifest.get ('grcStamp') != ResourceCache.GetFileStamp (grcFilePath):
+            return None
+        return manifest['resources']
 
+    def CompileGRCFromJSON (self, jsonFilePath: Path, localized: bool) -> None:
+        outputGrcFile = self.ConvertJSONToGRC (jsonFilePath, localized)
         assert self.CompileGRCResourceFile (outputGrcFile, localized), f'GRC compilation command failed: {outputGrcFile}'
 
-    def CompileJSONResourceFile (self, jsonFilePath: Path, localized: bool) -> None:
-        jsonResourceProcessorPath = self.devKitPath / 'Tools' / 'JSONResourceProcessor'
+    def GetCheckerFingerprint (self) -> str:
+        if self.checkerFingerprint is None:
+            self.checkerFingerprint = ResourceCache.GetFingerprint ([
+                ResourceCache.GetFolderHash (self.GetJSONResourceProcessorPath (), '*.py'),
+                ResourceCache.GetFolderHash (self.GetJSONSchemaFolderPath ()),
+            ])
+        return self.checkerFingerprint
+
+    # Schema validation and post-checks only depend on the default language JSON and the checkers,
+    # so their results are shared between all language builds through the cache folder.
+    def RunCachedJSONCheck (self, scriptPath: Path, arguments: list, jsonFilePath: Path, outputFilePath: Path) -> int:
+        # path arguments differ between the language builds, only the flags are part of the key
+        checkKey = ResourceCache.GetFingerprint ([
+            scriptPath.name,
+            self.GetCheckerFingerprint (),
+            ResourceCache.GetFileHash (jsonFilePath),
+        ] + [argument for argument in arguments if isinstance (argument, str)])
+        cachedOutputPath = self.cacheDir / 'Checks' / f'{checkKey}.out'
+        cachedSuccessPath = self.cacheDir / 'Checks' / f'{checkKey}.ok'
+        if cachedSuccessPath.exists ():
+            if cachedOutputPath.exists ():
+                ResourceCache.CopyFileAtomic (cachedOutputPath, outputFilePath)
+            return 0
+
+        result = self.scriptRunner.Run (scriptPath, arguments)
+        if result == 0:
+            if outputFilePath.exists ():
+                ResourceCache.CopyFileAtomic (outputFilePath, cachedOutputPath)
+            ResourceCache.WriteFileAtomic (cachedSuccessPath, '')
+        return result
 
-        if not jsonResourceProcessorPath.exists ():
-            self.CompileGRCFromJSON (jsonFilePath, localized)
-            return
+    # the scripts load the native libraries of the processor
+    def GetJSONResourceProcessorEnvironment (self, jsonResourceProcessorPath: Path) -> dict[str, str]:
+        return {}
+
+    def GetJSONSchemaFolderPath (self) -> Path:
+        return self.devKitPath / 'Tools' / 'SchemaFiles'
 
-        schemaValidationResult = subprocess.call ([
-            sys.executable,
-            jsonResourceProcessorPath / 'SchemaValidator.py',
+    def ValidateJSONResourceFile (self, jsonFilePath: Path) -> None:
+        jsonResourceProcessorPath = self.GetJSONResourceProcessorPath ()
+        schemaValidationResult = self.RunCachedJSONCheck (jsonResourceProcessorPath / 'SchemaValidator.py', [
             '-i', jsonFilePath,
             '-o', self.resourceObjectsPath / f'{jsonFilePath.name}.valid',
-            '--schemaFolder', self.devKitPath / 'Tools' / 'SchemaFiles',
-        ])
+            '--schemaFolder', self.GetJSONSchemaFolderPath (),
+        ], jsonFilePath, self.resourceObjectsPath / f'{jsonFilePath.name}.valid')
         assert schemaValidationResult == 0, f'JSON Schema validation command failed: {jsonFilePath}'
 
-        translatedJsonPath = jsonFilePath
+    def GetTranslatedJSONPath (self, jsonFilePath: Path, localized: bool) -> Path:
+        if not localized:
+            return jsonFilePath
+        return self.resourceObjectsPath / f'{jsonFilePath.name}.translated'
 
-        if localized:
-            xliffFileToTranslateWith = None
-            childXliffPath = self.GetXliffPathForLanguage (self.languageCode)
-            parentXliffPath = self.GetParentXliffPath ()
-            if parentXliffPath:
-                mergedXliffOutputPath = self.resourceObjectsPath / f'{self.GetNormalizedAddonName (self.addonName)}.merged.xlf'
-                mergeParentChildXliffResult = subprocess.call ([
-                    sys.executable,
-                    jsonResourceProcessorPath / 'MergeParentChildXliff.py',
-                    '--childXliff', childXliffPath,
-                    '--parentXliff', parentXliffPath,
-                    '-o', mergedXliffOutputPath
-                ])
-                assert mergeParentChildXliffResult == 0, f'Merge parent child XLIFF command failed: {jsonFilePath}'
-                xliffFileToTranslateWith = mergedXliffOutputPath
-            else:
-                xliffFileToTranslateWith = childXliffPath
-
-            translatedJsonPath = self.resourceObjectsPath / f'{jsonFilePath.name}.translated'
-            xliffTranslationCommand = [
-                sys.executable,
-                jsonResourceProcessorPath / 'XliffJsonTranslator.py',
-                '-i', jsonFilePath,
-                '-m', self.GetNormalizedAddonName (self.addonName),
-                '-d', xliffFileToTranslateWith,
-                '-o', translatedJsonPath,
-            ]
-            if self.permissiveLocalization:
-                xliffTranslationCommand.append ('--permissive')
-            xliffTranslationResult = subprocess.call (xliffTranslationCommand)
-            assert xliffTranslationResult == 0, f'XLIFF translation command failed: {jsonFilePath}'
-
-        envForJson = os.environ.copy ()
-        if platform.system () == 'Windows':
-            dllFolder = jsonResourceProcessorPath / 'dlls'
-            envForJson['PATH'] = str (dllFolder) + os.pathsep + envForJson['PATH']
-        elif platform.system () == 'Darwin':
-            envForJson['DYLD_FALLBACK_LIBRARY_PATH'] = jsonResourceProcessorPath / 'dylibs'
-        else:
-            assert False, 'Unsupported platform: ' + platform.system ()
+    def TranslateJSONResourceFile (self, jsonFilePath: Path) -> None:
+        jsonResourceProcessorPath = self.GetJSONResourceProcessorPath ()
+        xliffFileToTranslateWith = self.GetMergedXliffPath (jsonResourceProcessorPath)
+
+        xliffTranslationArguments = [
+            '-i', jsonFilePath,
+            '-m', self.GetNormalizedAddonName (self.addonName),
+            '-d', xliffFileToTranslateWith,
+            '-o', self.GetTranslatedJSONPath (jsonFilePath, localized=True),
+        ]
+        if self.permissiveLocalization:
+            xliffTranslationArguments.append ('--permissive')
+        xliffTranslationResult = self.scriptRunner.Run (jsonResourceProcessorPath / 'XliffJsonTranslator.py', xliffTranslationArguments)
+        assert xliffTranslationResult == 0, f'XLIFF translation command failed: {jsonFilePath}'
+
+    def CreateNativeResourceFromJSON (self, jsonFilePath: Path, localized: bool) -> None:
+        jsonResourceProcessorPath = self.GetJSONResourceProcessorPath ()
+        translatedJsonPath = self.GetTranslatedJSONPath (jsonFilePath, localized)
+
+        envForJson = self.GetJSONResourceProcessorEnvironment (jsonResourceProcessorPath)
 
         if localized:
             jsonPartsDir = self.resourceObjectsPath / 'RLOC' / 'JsonParts'
         else:
             jsonPartsDir = self.resourceObjectsPath / 'RFIX' / 'JsonParts'
 
-        if not jsonPartsDir.exists ():
-            jsonPartsDir.mkdir (parents=True, exist_ok=True)
-
-        nativeResCreationCommand = [
-            sys.executable,
-            jsonResourceProcessorPath / 'GSCreateNativeResourceFromJSON.py',
-            '-i', translatedJsonPath,
-            '-o', jsonPartsDir.parent / (jsonFilePath.name + self.nativeResourceFileExtension),
-            '-d', self.GetPlatformDefine (),
-        ]
-        if not localized:
-            imageResourcesFolder = self.resourcesPath / 'RFIX' / 'Images'
-            nativeResCreationCommand.extend ([ '-p', imageResourcesFolder ])
+        nativeResourceFilePath = jsonPartsDir.parent / (jsonFilePath.name + self.nativeResourceFileExtension)
 
-        nativeResCreationResult = subprocess.call (nativeResCreationCommand, env=envForJson)
+        # the processor also writes the fragments of the JSON parts into the folder of the output
+        def CreateNativeResource (stagedNativeResourceFilePath: Path) -> bool:
+            (stagedNativeResourceFilePath.parent / jsonPartsDir.name).mkdir (parents=True, exist_ok=True)
+            nativeResCreationArguments = [
+                '-i', translatedJsonPath,
+                '-o', stagedNativeResourceFilePath,
+                '-d', self.GetPlatformDefine (),
+            ]
+            if not localized:
+                imageResourcesFolder = self.resourcesPath / 'RFIX' / 'Images'
+                nativeResCreationArguments.extend ([ '-p', imageResourcesFolder ])
+            return self.scriptRunner.Run (jsonResourceProcessorPath / 'GSCreateNativeResourceFromJSON.py', nativeResCreationArguments, envForJson) == 0
 
-        assert nativeResCreationResult == 0, f'Native resource creation command failed: {translatedJsonPath}'
+        nativeResCreationResult = self.RunStagedFragmentStep (nativeResourceFilePath, CreateNativeResource)
+        assert nativeResCreationResult, f'Native resource creation command failed: {translatedJsonPath}'
 
-        postCheckersCommand = [
-            sys.executable,
-            jsonResourceProcessorPath / 'RunPostCheckers.py',
+    def PostCheckJSONResourceFile (self, jsonFilePath: Path, localized: bool) -> None:
+        jsonResourceProcessorPath = self.GetJSONResourceProcessorPath ()
+        postCheckersArguments = [
             '-i', jsonFilePath,
             '-o', self.resourceObjectsPath / f'{jsonFilePath.name}.postcheck',
         ]
         if localized:
-            postCheckersCommand.append ('--localized')
-        postCheckersResult = subprocess.call (postCheckersCommand)
+            postCheckersArguments.append ('--localized')
+        postCheckersResult = self.RunCachedJSONCheck (jsonResourceProcessorPath / 'RunPostCheckers.py', postCheckersArguments,
+                                                      jsonFilePath, self.resourceObjectsPath / f'{jsonFilePath.name}.postcheck')
         assert postCheckersResult == 0, f'Post-checkers command failed: {jsonFilePath}'
 
+    def CompileJSONResourceFile (self, jsonFilePath: Path, localized: bool) -> None:
+        if not self.GetDevKitInfo ().hasJsonResourceProcessor:
+            self.CompileGRCFromJSON (jsonFilePath, localized)
+            return
+
+        self.ValidateJSONResourceFile (jsonFilePath)
+        if localized:
+            self.TranslateJSONResourceFile (jsonFilePath)
+        self.CreateNativeResourceFromJSON (jsonFilePath, localized)
+        self.PostCheckJSONResourceFile (jsonFilePath, localized)
+
+    def GetJSONTableOfContentsNativeResourceFilePath (self, localized: bool) -> Path:
+        tocJsonFile = 'JSNL_TOC.json' if localized else 'JSNF_TOC.json'
+        return self.resourceObjectsPath / 'JSON_TOC' / f'{tocJsonFile}.rc2'
+
     def GenerateJSONTableOfContents (self, localized: bool) -> None:
         tocJsonFile = 'JSNL_TOC.json' if localized else 'JSNF_TOC.json'
         resType = 'TOCL' if localized else 'TOCF'
@@ -207,54 +449,499 @@ class ResourceCompiler (Compiler):
         if not tableOfContentsJson.exists ():
             return
 
-        tableOfContentsJsonRc2 = self.resourceObjectsPath / 'JSON_TOC' / f'{tocJsonFile}.rc2'
-        jsonResourceProcessorPath = self.devKitPath / 'Tools' / 'JSONResourceProcessor'
+        tableOfContentsJsonRc2 = self.GetJSONTableOfContentsNativeResourceFilePath (localized)
+        jsonResourceProcessorPath = self.GetJSONResourceProcessorPath ()
         dataResourceGenerator = jsonResourceProcessorPath / 'GenerateDataResourceFromFile.py'
-        result = subprocess.call ([
-            sys.executable,
-            dataResourceGenerator,
+        result = self.RunStagedFragmentStep (tableOfContentsJsonRc2, lambda stagedTableOfContentsJsonRc2: self.scriptRunner.Run (dataResourceGenerator, [
             '-i', tableOfContentsJson,
-            '-o', tableOfContentsJsonRc2,
+            '-o', stagedTableOfContentsJsonRc2,
             '--resType', resType,
-        ])
-        assert result == 0, f'Failed to generate data resource: {tableOfContentsJson}'
+        ]) == 0)
+        assert result, f'Failed to generate data resource: {tableOfContentsJson}'
+
+    # the preprocessor is either cl compatible (Visual Studio) or gcc compatible (clang, gcc)
+    def PrecompileGRCResourceFile (self, grcFilePath: Path) -> Path:
+        precompiledGrcFilePath = self.GetPrecompiledGRCResourceFilePath (grcFilePath)
+        preprocessorPath = self.resourceTools.GetToolPath ('preprocessor', self.GetDefaultPreprocessorPath ())
+        includeFolders = [self.devKitPath / 'Inc', self.devKitPath / 'Modules' / 'DGLib', self.sourcesPath, self.resourceObjectsPath]
+        if ResourceTools.IsMsvcPreprocessor (preprocessorPath):
+            result = PreprocessorCache.RunCachedPreprocessor ([
+                preprocessorPath,
+                '/nologo',
+                '/X',
+                '/EP',
+                '/P',
+            ] + [item for includeFolder in includeFolders for item in ['/I', includeFolder]] + [
+                '/D' + self.GetPlatformDefine (),
+                '/source-charset:utf-8',
+                '/execution-charset:utf-8',
+                '/Fi{}'.format (precompiledGrcFilePath),
+                grcFilePath,
+            ], PreprocessorCache.DEPENDENCY_STYLE_SHOW_INCLUDES, grcFilePath, precompiledGrcFilePath)
+        else:
+            result = PreprocessorCache.RunCachedPreprocessor ([
+                preprocessorPath,
+                '-x', 'c++',
+                '-E',
+                '-P',
+                '-D' + self.GetPlatformDefine (),
+            ] + [item for includeFolder in includeFolders for item in ['-I', includeFolder]] + [
+                '-o', precompiledGrcFilePath,
+                grcFilePath,
+            ], PreprocessorCache.DEPENDENCY_STYLE_DEPFILE, grcFilePath, precompiledGrcFilePath)
+        assert result == 0, f'Failed to precompile resource {grcFilePath}'
+        return precompiledGrcFilePath
+
+    def CompileGRCResourceFile (self, grcFilePath: Path, localized: bool) -> bool:
+        precompiledGrcFilePath = self.PrecompileGRCResourceFile (grcFilePath)
+        return self.CompilePrecompiledGRCResourceFile (precompiledGrcFilePath, localized)
+
+    def AddGRCResourceFileTasks (self, taskGraph: ParallelJobs.TaskGraph, grcFilePath: Path, localized: bool, dependencies: list[ParallelJobs.Task]) -> ParallelJobs.Task:
+        precompiledGrcFilePath = self.GetPrecompiledGRCResourceFilePath (grcFilePath)
+        # GRC files with the same name share the precompiled file, so they must not be compiled at the same time
+        previousTask = self.precompiledFileTasks.get (precompiledGrcFilePath)
+        if previousTask is not None:
+            dependencies = dependencies + [previousTask]
+
+        def CompilePrecompiledGRCResourceFileTask () -> None:
+            assert self.CompilePrecompiledGRCResourceFile (precompiledGrcFilePath, localized), f'Failed to compile resource: {grcFilePath}'
+
+        precompileTask = taskGraph.AddTask (f'Precompile {grcFilePath.name}', functools.partial (self.PrecompileGRCResourceFile, grcFilePath), dependencies)
+        resConvTask = taskGraph.AddTask (f'ResConv {grcFilePath.name}', CompilePrecompiledGRCResourceFileTask, [precompileTask])
+        self.precompiledFileTasks[precompiledGrcFilePath] = resConvTask
+        return resConvTask
+
+    def AddJSONResourceFileTasks (self, taskGraph: ParallelJobs.TaskGraph, jsonFilePath: Path, localized: bool, dependencies: list[ParallelJobs.Task]) -> ParallelJobs.Task:
+        if not self.GetDevKitInfo ().hasJsonResourceProcessor:
+            convertTask = taskGraph.AddTask (f'Convert {jsonFilePath.name}', functools.partial (self.ConvertJSONToGRC, jsonFilePath, localized), dependencies)
+            return self.AddGRCResourceFileTasks (taskGraph, self.resourceObjectsPath / f'{jsonFilePath.name}.grc', localized, [convertTask])
+
+        validateTask = taskGraph.AddTask (f'Validate {jsonFilePath.name}', functools.partial (self.ValidateJSONResourceFile, jsonFilePath), dependencies)
+        nativeResourceDependencies = [validateTask]
+        if localized:
+            nativeResourceDependencies = [taskGraph.AddTask (f'Translate {jsonFilePath.name}', functools.partial (self.TranslateJSONResourceFile, jsonFilePath), [validateTask] + dependencies)]
+        # the native resource creation updates the shared JSON table of contents, so these tasks run one after the other
+        previousNativeResourceTask = self.nativeResourceTasks.get (localized)
+        if previousNativeResourceTask is not None:
+            nativeResourceDependencies = nativeResourceDependencies + [previousNativeResourceTask]
+        nativeResourceTask = taskGraph.AddTask (f'Create native resource {jsonFilePath.name}', functools.partial (self.CreateNativeResourceFromJSON, jsonFilePath, localized), nativeResourceDependencies)
+        self.nativeResourceTasks[localized] = nativeResourceTask
+        return taskGraph.AddTask (f'Post-check {jsonFilePath.name}', functools.partial (self.PostCheckJSONResourceFile, jsonFilePath, localized), [nativeResourceTask])
+
+    # only the resources containing library parts need the output of the library compilation, the JSON files have the same markers
+    def GetLibraryDependencies (self, resourceFilePath: Path, libraryTasks: list[ParallelJobs.Task] | None) -> list[ParallelJobs.Task]:
+        if libraryTasks and self.IsLibraryGRC (resourceFilePath):
+            return libraryTasks
+        return []
+
+    def AddLocalizedResourceTasks (self, taskGraph: ParallelJobs.TaskGraph, dependencies: list[ParallelJobs.Task], libraryTasks: list[ParallelJobs.Task] | None = None) -> list[ParallelJobs.Task]:
+        tasks = []
 
-    def CompileLocalizedResources (self) -> None:
         locResourcesFolder = self.resourcesPath / f'R{self.languageCode}'
-        grcFiles = locResourcesFolder.glob ('*.grc')
+        grcFiles = sorted (locResourcesFolder.glob ('*.grc'))
         for grcFilePath in grcFiles:
-            if (not self.IsLibraryGRC (grcFilePath)) or self.hasLibpartCompiler:
-                assert self.CompileGRCResourceFile (grcFilePath, localized=True), f'Failed to compile resource: {grcFilePath}'
-            else:
-                print(f"\033[93mWARNING:\033[0m skipping library {grcFilePath} compilation because no libpart compiler available")
+            if self.ShouldCompileGRCResourceFile (grcFilePath, True):
+                tasks.append (self.AddGRCResourceFileTasks (taskGraph, grcFilePath, True, dependencies + self.GetLibraryDependencies (grcFilePath, libraryTasks)))
 
         locResourcesFolderDefault = self.resourcesPath / f'R{self.defaultLanguageCode}'
-        jsonFiles = locResourcesFolderDefault.glob ('*.json')
+        jsonFiles = sorted (locResourcesFolderDefault.glob ('*.json'))
+        jsonTasks = []
+        if len (jsonFiles) > 0:
+            localizationIndex, outdatedJsonFiles = self.GetOutdatedLocalizedJSONResourceFiles (jsonFiles)
+            jsonDependencies = dependencies
+            if len (outdatedJsonFiles) > 0 and self.GetDevKitInfo ().hasJsonResourceProcessor:
+                mergeTask = taskGraph.AddTask ('Merge XLIFF', functools.partial (self.GetMergedXliffPath, self.GetJSONResourceProcessorPath ()), dependencies)
+                jsonDependencies = dependencies + [mergeTask]
+            for jsonFilePath in outdatedJsonFiles:
+                jsonTasks.append (self.AddJSONResourceFileTasks (taskGraph, jsonFilePath, True, jsonDependencies + self.GetLibraryDependencies (jsonFilePath, libraryTasks)))
+            tasks.append (taskGraph.AddTask ('Update localization index', functools.partial (self.WriteLocalizationIndex, localizationIndex), jsonTasks))
+
+        tasks.append (taskGraph.AddTask ('Generate localized JSON table of contents', functools.partial (self.GenerateJSONTableOfContents, True), jsonTasks + dependencies))
+        return tasks
+
+    def CompileLocalizedResources (self) -> None:
+        taskGraph = ParallelJobs.TaskGraph ()
+        self.AddLocalizedResourceTasks (taskGraph, [])
+        taskGraph.Run (self.jobRunner)
+
+    def GetLocalizationIndexPath (self) -> Path:
+        return self.resourceObjectsPath / 'LocalizationIndex.json'
+
+    def GetLocalizationToolFingerprint (self) -> str:
+        converterSourceFiles = sorted ((Path (__file__).absolute ().parent / 'JsonToGrcConverter').glob ('*.py'))
+        return ResourceCache.GetFingerprint ([
+            self.devKitPath.absolute (),
+            self.GetDevKitVersionAndBuildNumber (),
+            self.GetDevKitInfo ().hasJsonResourceProcessor,
+            self.permissiveLocalization,
+            ResourceCache.GetFileHash (Path (__file__).absolute ()),
+        ] + [ResourceCache.GetFileHash (sourceFile) for sourceFile in converterSourceFiles])
+
+    def GetJSONNativeResourceFilePath (self, jsonFilePath: Path, localized: bool) -> Path:
+        if self.GetDevKitInfo ().hasJsonResourceProcessor:
+            return self.resourceObjectsPath / ('RLOC' if localized else 'RFIX') / (jsonFilePath.name + self.nativeResourceFileExtension)
+        return self.resourceObjectsPath / (f'{jsonFilePath.name}.grc' + self.nativeResourceFileExtension)
+
+    def LoadLocalizationIndex (self, toolFingerprint: str) -> dict:
+        emptyIndex = { 'fingerprint': toolFingerprint, 'files': {}, 'units': {} }
+        indexPath = self.GetLocalizationIndexPath ()
+        if not indexPath.exists ():
+            return emptyIndex
+        try:
+            with open (indexPath, 'r', encoding='utf-8') as f:
+                index = json.load (f)
+        except (OSError, ValueError):
+            return emptyIndex
+        if index.get ('fingerprint') != toolFingerprint:
+            return emptyIndex
+        return index
+
+    def WriteLocalizationIndex (self, index: dict) -> None:
+        ResourceCache.WriteFileAtomic (self.GetLocalizationIndexPath (), json.dumps (index, ensure_ascii=False, indent=1))
+
+    # The localization index maps every XLIFF unit id to the JSON files, resources and controls using it.
+    # JSON files are only translated and compiled again if the file itself or the raw XLIFF data of one of its units changed.
+    # Returns the new index, which should be written once the outdated files are compiled, and the outdated files.
+    def GetOutdatedLocalizedJSONResourceFiles (self, jsonFiles: list[Path]) -> tuple[dict, list[Path]]:
+        toolFingerprint = self.GetLocalizationToolFingerprint ()
+        previousIndex = self.LoadLocalizationIndex (toolFingerprint)
+        unitFingerprints = self.GetUnitFingerprints ()
+
+        index = { 'fingerprint': toolFingerprint, 'files': {}, 'units': {} }
+        outdatedJsonFiles = []
         for jsonFilePath in jsonFiles:
-            self.CompileJSONResourceFile (jsonFilePath, localized=True)
+            with open (jsonFilePath, 'rb') as f:
+                jsonContent = f.read ()
+            dictIdLocations = JsonTranslator.GetDictIdLocations (json.loads (jsonContent.decode ('utf-8')), jsonFilePath.name)
+            fileFingerprint = ResourceCache.GetFingerprint ([
+                hashlib.sha256 (jsonContent).hexdigest (),
+                self.permissiveLocalization,
+            ] + [(unitId, unitFingerprints.get (unitId)) for unitId in sorted (dictIdLocations.keys ())])
 
-        self.GenerateJSONTableOfContents (localized=True)
+            isUpToDate = previousIndex['files'].get (jsonFilePath.name) == fileFingerprint and \
+                self.GetJSONNativeResourceFilePath (jsonFilePath, localized=True).exists ()
+            if not isUpToDate:
+                outdatedJsonFiles.append (jsonFilePath)
+
+            index['files'][jsonFilePath.name] = fileFingerprint
+            for unitId, locations in dictIdLocations.items ():
+                index['units'].setdefault (unitId, []).extend (locations)
+
+        return (index, outdatedJsonFiles)
+
+    def AddFixResourceTasks (self, taskGraph: ParallelJobs.TaskGraph, dependencies: list[ParallelJobs.Task], libraryTasks: list[ParallelJobs.Task] | None = None) -> list[ParallelJobs.Task]:
+        tasks = []
 
-    def CompileFixResources (self) -> None:
         fixResourcesFolder = self.resourcesPath / 'RFIX'
-        grcFiles = fixResourcesFolder.glob ('*.grc')
+        grcFiles = sorted (fixResourcesFolder.glob ('*.grc'))
         for grcFilePath in grcFiles:
-            assert self.CompileGRCResourceFile (grcFilePath, localized=False), f'Failed to compile resource: {grcFilePath}'
+            tasks.append (self.AddGRCResourceFileTasks (taskGraph, grcFilePath, False, dependencies + self.GetLibraryDependencies (grcFilePath, libraryTasks)))
 
-        jsonFiles = fixResourcesFolder.glob ('*.json')
+        jsonFiles = sorted (fixResourcesFolder.glob ('*.json'))
+        jsonTasks = []
         for jsonFilePath in jsonFiles:
-            self.CompileJSONResourceFile (jsonFilePath, localized=False)
+            jsonTasks.append (self.AddJSONResourceFileTasks (taskGraph, jsonFilePath, False, dependencies + self.GetLibraryDependencies (jsonFilePath, libraryTasks)))
 
-        self.GenerateJSONTableOfContents (localized=False)
+        tasks.append (taskGraph.AddTask ('Generate fix JSON table of contents', functools.partial (self.GenerateJSONTableOfContents, False), jsonTasks + dependencies))
+        return tasks + jsonTasks
 
-    def RunResConv (self, platformSign: str, codepage: str, inputFilePath: Path) -> bool:
-        if self.IsLibraryGRC (inputFilePath):
-            imageResourcesFolder = self.resourceObjectsPath
+    def CompileFixResources (self) -> None:
+        taskGraph = ParallelJobs.TaskGraph ()
+        self.AddFixResourceTasks (taskGraph, [])
+        taskGraph.Run (self.jobRunner)
+
+    def GetFixResourceSourceFiles (self) -> list[Path]:
+        fixResourcesFolder = self.resourcesPath / 'RFIX'
+        return sorted (fixResourcesFolder.glob ('*.grc')) + sorted (fixResourcesFolder.glob ('*.json'))
+
+    def GetFixResourceInputFiles (self) -> list[Path]:
+        inputFiles = []
+        for sourceFilePath in self.GetFixResourceSourceFiles ():
+            if sourceFilePath.suffix == '.grc':
+                inputFiles.extend (self.GetGRCInputFiles (sourceFilePath))
+            else:
+                inputFiles.extend (self.GetJSONInputFiles (sourceFilePath, localized=False))
+        return self.FilterInputFiles (inputFiles)
+
+    # the fix resources do not depend on the language, so they are compiled once for the language builds sharing the cache folder
+    def GetSharedFixResourcesPath (self) -> Path:
+        toolsFolder = Path (__file__).absolute ().parent
+        toolSourceFiles = sorted (list (toolsFolder.glob ('*.py')) + list ((toolsFolder / 'JsonToGrcConverter').glob ('*.py')))
+        devKitInfo = self.GetDevKitInfo ()
+        sharedKey = ResourceCache.GetFingerprint ([
+            SHARED_FIX_RESOURCES_VERSION,
+            self.acVersion,
+            self.GetPlatformDevKitLinkKey (),
+            devKitInfo.mainVersion,
+            devKitInfo.buildNumber,
+            self.devKitPath.absolute (),
+            self.sourcesPath.absolute (),
+            self.resourcesPath.absolute (),
+            self.GetCachedFileHash (self.resConvPath),
+        ] + [self.GetCachedFileHash (toolSourceFile) for toolSourceFile in toolSourceFiles])
+        return self.cacheDir / 'FixResources' / sharedKey[:16]
+
+    def CanShareFixResources (self) -> bool:
+        # library images are generated next to the library compiled by the language build
+        return not any (self.IsLibraryGRC (sourceFilePath) for sourceFilePath in self.GetFixResourceSourceFiles ())
+
+    def LoadSharedFixResourceState (self, sharedPath: Path) -> dict | None:
+        statePath = sharedPath / 'FixResources.json'
+        if not statePath.exists ():
+            return None
+        try:
+            with open (statePath, 'r', encoding='utf-8') as f:
+                sharedState = json.load (f)
+        except (OSError, ValueError):
+            return None
+        if sharedState.get ('version') != SHARED_FIX_RESOURCES_VERSION:
+            return None
+        return sharedState
+
+    def IsSharedFixResourceStateUpToDate (self, sharedState: dict | None) -> bool:
+        if sharedState is None or sharedState['sources'] != [sourceFilePath.name for sourceFilePath in self.GetFixResourceSourceFiles ()]:
+            return False
+        for inputFile, (stamp, fileHash) in sharedState['inputs'].items ():
+            if not os.path.isfile (inputFile):
+                return False
+            if ResourceCache.GetFileStamp (inputFile) != stamp and self.GetCachedFileHash (Path (inputFile)) != fileHash:
+                return False
+        return True
+
+    # the state of the compilation that later steps need besides the generated files
+    def GetCompiledFixResourceState (self) -> dict:
+        return {}
+
+    def SetCompiledFixResourceState (self, compiledState: dict) -> None:
+        pass
+
+    def StoreSharedFixResources (self, fixResourceCompiler: 'ResourceCompiler', sharedPath: Path) -> None:
+        inputs = {}
+        for inputFile in fixResourceCompiler.GetFixResourceInputFiles ():
+            if inputFile.is_file ():
+                # the stamp is taken before the hash, so a file modified in the meantime is hashed again by the next build
+                stamp = ResourceCache.GetFileStamp (inputFile)
+                inputs[str (inputFile)] = [stamp, fixResourceCompiler.GetCachedFileHash (inputFile)]
+        ResourceCache.WriteFileAtomic (sharedPath / 'FixResources.json', json.dumps ({
+            'version': SHARED_FIX_RESOURCES_VERSION,
+            'sources': [sourceFilePath.name for sourceFilePath in self.GetFixResourceSourceFiles ()],
+            'inputs': inputs,
+            'compiledState': fixResourceCompiler.GetCompiledFixResourceState (),
+        }, indent=1, sort_keys=True))
+        self.RestoreSharedFixResources (sharedPath)
+
+    def RestoreSharedFixResources (self, sharedPath: Path) -> None:
+        try:
+            sharedState = self.LoadSharedFixResourceState (sharedPath)
+            assert sharedState is not None, f'Missing shared fix resources: {sharedPath}'
+            restoreKey = ResourceCache.GetFingerprint ([sharedPath.absolute (), json.dumps (sharedState, sort_keys=True)])
+            restoreStatePath = self.resourceObjectsPath / 'FixResources.state'
+            restoreState = None
+            if restoreStatePath.exists ():
+                with open (restoreStatePath, 'r', encoding='utf-8') as f:
+                    restoreState = json.load (f)
+            if restoreState is None or restoreState['key'] != restoreKey or not all ((self.resourceObjectsPath / outputFile).exists () for outputFile in restoreState['outputs']):
+                outputFiles = ResourceCache.RestoreCacheEntry (sharedPath / 'Objects', self.resourceObjectsPath)
+                ResourceCache.WriteFileAtomic (restoreStatePath, json.dumps ({
+                    'key': restoreKey,
+                    'outputs': [outputFile.relative_to (self.resourceObjectsPath).as_posix () for outputFile in outputFiles],
+                }))
+            self.SetCompiledFixResourceState (sharedState['compiledState'])
+        finally:
+            self.ReleaseSharedFixResources ()
+
+    def LockSharedFixResources (self, sharedPath: Path) -> None:
+        self.sharedFixResourcesLock = ResourceCache.FileLock (sharedPath / 'FixResources.lock')
+        self.sharedFixResourcesLock.Acquire ()
+        self.sharedFixResourcesUpToDate = self.IsSharedFixResourceStateUpToDate (self.LoadSharedFixResourceState (sharedPath))
+        if not self.sharedFixResourcesUpToDate:
+            (sharedPath / 'Objects').mkdir (parents=True, exist_ok=True)
+            # an interrupted compilation leaves outdated outputs behind, they are not shared until the state is written again
+            (sharedPath / 'FixResources.json').unlink (missing_ok=True)
+
+    def RunSharedFixResourceTask (self, action: Callable[[], object]) -> object:
+        if self.sharedFixResourcesUpToDate:
+            return None
+        return action ()
+
+    def ShareFixResources (self, fixResourceCompiler: 'ResourceCompiler', sharedPath: Path) -> None:
+        if self.sharedFixResourcesUpToDate:
+            self.RestoreSharedFixResources (sharedPath)
         else:
-            imageResourcesFolder = self.resourcesPath / 'RFIX' / 'Images'
-        inputFileBaseName = inputFilePath.stem
-        nativeResourceFilePath = self.resourceObjectsPath / (inputFileBaseName + self.nativeResourceFileExtension)
-        colorChangeScriptPath = self.resConvPath.parent / 'SVGColorChange.py'
+            self.StoreSharedFixResources (fixResourceCompiler, sharedPath)
+
+    def AddSharedFixResourceTasks (self, taskGraph: ParallelJobs.TaskGraph, libraryTasks: list[ParallelJobs.Task] | None = None) -> list[ParallelJobs.Task]:
+        """
+        Add the tasks of the fix resources compiled into a folder shared by the language builds. The first build
+        compiles them while holding the lock of the folder, the later builds copy the outputs from there. The lock
+        is taken by the first of these tasks, so the other tasks of the build do not wait for other language builds.
+        """
+        if not self.CanShareFixResources ():
+            return self.AddFixResourceTasks (taskGraph, [], libraryTasks)
+
+        sharedPath = self.GetSharedFixResourcesPath ()
+        fixResourceCompiler = type (self) (self.devKitPath, self.acVersion, self.buildNum, self.addonName, self.languageCode, self.defaultLanguageCode,
+            self.sourcesPath, self.resourcesPath, sharedPath / 'Objects', self.permissiveLocalization, self.hasLibpartCompiler, self.cacheDir,
+            self.scriptRunner, self.jobRunner, self.resConvCacheDir, self.resourceTools)
+        fixResourceCompiler.devKitInfo = self.GetDevKitInfo ()
+        fixResourceCompiler.resourceManifest = self.resourceManifest
+        fixResourceCompiler.converterStats = self.converterStats
+        fixResourceCompiler.converterStatsLock = self.converterStatsLock
+
+        lockTask = taskGraph.AddTask ('Lock shared fix resources', functools.partial (self.LockSharedFixResources, sharedPath))
+        firstFixTaskIndex = len (taskGraph.tasks)
+        fixTasks = fixResourceCompiler.AddFixResourceTasks (taskGraph, [lockTask])
+        # the shared outputs are compiled only if they are outdated
+        for fixTask in taskGraph.tasks[firstFixTaskIndex:]:
+            fixTask.action = functools.partial (self.RunSharedFixResourceTask, fixTask.action)
+        return [taskGraph.AddTask ('Share fix resources', functools.partial (self.ShareFixResources, fixResourceCompiler, sharedPath), [lockTask] + fixTasks)]
+
+    def ReleaseSharedFixResources (self) -> None:
+        if self.sharedFixResourcesLock is not None:
+            self.sharedFixResourcesLock.Release ()
+            self.sharedFixResourcesLock = None
+
+    def GetDevKitInfoCacheDir (self) -> Path | None:
+        return self.cacheDir / 'DevKitInfo'
+
+    def GetNativeResourceInputFiles (self) -> list[Path]:
+        return []
+
+    def GetImageInputFiles (self) -> list[Path]:
+        return sorted (filePath for filePath in (self.resourcesPath / 'RFIX' / 'Images').rglob ('*') if filePath.is_file ())
+
+    def GetGRCInputFiles (self, grcFilePath: Path) -> list[Path]:
+        return [grcFilePath] + PreprocessorCache.GetDependencies (self.GetPrecompiledGRCResourceFilePath (grcFilePath)) + self.GetImageInputFiles ()
+
+    def GetXliffInputFiles (self) -> list[Path]:
+        xliffChain = self.GetXliffChain ()
+        parentTxtPaths = [xliffPath.parent / '_parent.txt' for xliffPath in xliffChain]
+        return [filePath for filePath in xliffChain + parentTxtPaths if filePath.exists ()]
+
+    def GetJSONInputFiles (self, jsonFilePath: Path, localized: bool) -> list[Path]:
+        if localized:
+            return [jsonFilePath] + self.GetXliffInputFiles ()
+        return [jsonFilePath] + self.GetImageInputFiles ()
+
+    def GetGRCSourceFiles (self) -> list[Path]:
+        return sorted ((self.resourcesPath / f'R{self.languageCode}').glob ('*.grc')) + sorted ((self.resourcesPath / 'RFIX').glob ('*.grc'))
+
+    # Every compile step records the native resource fragments it wrote next to its main output. The paths are relative
+    # to the resource objects folder, so the records stay valid when the outputs are copied to another objects folder.
+    def GetFragmentRecordPath (self, stepOutputPath: Path) -> Path:
+        return stepOutputPath.with_name (f'{stepOutputPath.name}.fragments')
+
+    def WriteFragmentRecord (self, stepOutputPath: Path, fragmentFiles: list[Path]) -> None:
+        resourceObjectsPath = self.resourceObjectsPath.absolute ()
+        relativeFragmentFiles = sorted (set (Path (fragmentFile).absolute ().relative_to (resourceObjectsPath).as_posix () for fragmentFile in fragmentFiles))
+        ResourceCache.WriteFileAtomic (self.GetFragmentRecordPath (stepOutputPath), json.dumps (relativeFragmentFiles))
+
+    # the outputs of a step compiled before the steps recorded their fragments are taken from its main output
+    def LoadFragmentRecord (self, stepOutputPath: Path) -> list[Path]:
+        recordPath = self.GetFragmentRecordPath (stepOutputPath)
+        try:
+            with open (recordPath, 'r', encoding='utf-8') as f:
+                return [self.resourceObjectsPath / relativeFragmentFile for relativeFragmentFile in json.load (f)]
+        except (OSError, ValueError):
+            return [stepOutputPath]
+
+    def RemoveRecordedFragments (self, stepOutputPath: Path) -> None:
+        for fragmentFile in set (self.LoadFragmentRecord (stepOutputPath) + [stepOutputPath]):
+            fragmentFile.unlink (missing_ok=True)
+
+    # the fragments of the previous run are removed, so outdated ones do not remain, the lock is held only while the files are placed
+    def ReplaceRecordedFragments (self, stepOutputPath: Path, placeFragments: Callable[[], list[Path]]) -> None:
+        stepOutputPath.parent.mkdir (parents=True, exist_ok=True)
+        with ResourceCache.FileLock (stepOutputPath.parent / 'Fragments.lock'):
+            self.RemoveRecordedFragments (stepOutputPath)
+            placedFiles = placeFragments ()
+            self.WriteFragmentRecord (stepOutputPath, [placedFile for placedFile in placedFiles if placedFile.name.endswith (self.nativeResourceFileExtension)])
+
+    def MoveStagedFragments (self, stagingFolderPath: Path, stepOutputPath: Path) -> None:
+        self.ReplaceRecordedFragments (stepOutputPath, lambda: ResourceCache.RelocateFolder (stagingFolderPath, stepOutputPath.parent))
+
+    def RunStagedFragmentStep (self, stepOutputPath: Path, step: Callable[[Path], bool]) -> bool:
+        """
+        Run a step that writes fragments next to its output and record the fragments it wrote. The step writes into its
+        own staging folder, so the steps writing into the same folder run in parallel and every file of the staging folder
+        belongs to the step. The staged files are moved next to the output afterwards.
+        """
+        stagingFolderPath = ResourceCache.GetStagingFolderPath ((self.cacheDir / 'Staging' / stepOutputPath.name).absolute ())
+        try:
+            if not step (stagingFolderPath / stepOutputPath.name):
+                self.ReplaceRecordedFragments (stepOutputPath, lambda: [])
+                return False
+            self.MoveStagedFragments (stagingFolderPath, stepOutputPath)
+        finally:
+            shutil.rmtree (stagingFolderPath, ignore_errors=True)
+        return True
+
+    # the native resource fragments recorded by the compile steps in a stable order, fragments of removed resources are left out
+    def GetNativeResourceFragmentFiles (self) -> list[Path]:
+        stepOutputFiles = []
+        for grcFilePath in sorted ((self.resourcesPath / f'R{self.languageCode}').glob ('*.grc')):
+            if not self.IsLibraryGRC (grcFilePath) or self.hasLibpartCompiler:
+                stepOutputFiles.append (self.resourceObjectsPath / (grcFilePath.name + self.nativeResourceFileExtension))
+        for grcFilePath in sorted ((self.resourcesPath / 'RFIX').glob ('*.grc')):
+            stepOutputFiles.append (self.resourceObjectsPath / (grcFilePath.name + self.nativeResourceFileExtension))
+        for jsonFilePath in sorted ((self.resourcesPath / f'R{self.defaultLanguageCode}').glob ('*.json')):
+            stepOutputFiles.append (self.GetJSONNativeResourceFilePath (jsonFilePath, True))
+        for jsonFilePath in sorted ((self.resourcesPath / 'RFIX').glob ('*.json')):
+            stepOutputFiles.append (self.GetJSONNativeResourceFilePath (jsonFilePath, False))
+        stepOutputFiles.append (self.GetJSONTableOfContentsNativeResourceFilePath (True))
+        stepOutputFiles.append (self.GetJSONTableOfContentsNativeResourceFilePath (False))
+        fragmentFiles = [fragmentFile for stepOutputFile in stepOutputFiles for fragmentFile in self.LoadFragmentRecord (stepOutputFile)]
+        return sorted (set (fragmentFile for fragmentFile in fragmentFiles if fragmentFile.exists ()), key=lambda fragmentFile: str (fragmentFile))
+
+    # the GRC files are scanned in one pass, later stages and later builds query the manifest
+    def UpdateResourceManifest (self) -> None:
+        self.resourceManifest.Update (self.GetGRCSourceFiles ())
+
+    # every file read by the resource build, used for the dependency file of the build system
+    def GetInputFiles (self) -> list[Path]:
+        inputFiles = []
+        for grcFilePath in sorted ((self.resourcesPath / f'R{self.languageCode}').glob ('*.grc')):
+            inputFiles.extend (self.GetGRCInputFiles (grcFilePath))
+        for jsonFilePath in sorted ((self.resourcesPath / f'R{self.defaultLanguageCode}').glob ('*.json')):
+            inputFiles.extend (self.GetJSONInputFiles (jsonFilePath, localized=True))
+        inputFiles.extend (self.GetFixResourceInputFiles ())
+        inputFiles.extend (self.GetNativeResourceInputFiles ())
+        return self.FilterInputFiles (inputFiles)
+
+    def FilterInputFiles (self, inputFiles: list[Path]) -> list[Path]:
+        # generated files are outputs of the resource build itself
+        resourceObjectsPath = self.resourceObjectsPath.absolute ()
+        uniqueInputFiles = {}
+        for inputFile in inputFiles:
+            inputFile = Path (inputFile).absolute ()
+            if not inputFile.is_relative_to (resourceObjectsPath):
+                uniqueInputFiles[inputFile] = None
+        return list (uniqueInputFiles.keys ())
+
+    def ShouldCompileGRCResourceFile (self, grcFilePath: Path, localized: bool) -> bool:
+        if localized and self.IsLibraryGRC (grcFilePath) and not self.hasLibpartCompiler:
+            print(f"\033[93mWARNING:\033[0m skipping library {grcFilePath} compilation because no libpart compiler available")
+            return False
+        return True
+
+    # the native resource is linked in a separate process in per-file compile mode
+    def LoadCompiledResourceState (self) -> None:
+        pass
+
+    def GetCachedFileHash (self, filePath: Path) -> str:
+        with self.fileHashCacheLock:
+            if filePath not in self.fileHashCache:
+                self.fileHashCache[filePath] = ResourceCache.GetFileHash (filePath)
+            return self.fileHashCache[filePath]
+
+    def GetCachedFolderHash (self, folderPath: Path) -> str:
+        with self.fileHashCacheLock:
+            if folderPath not in self.fileHashCache:
+                self.fileHashCache[folderPath] = ResourceCache.GetFolderHash (folderPath) if folderPath.exists () else ''
+            return self.fileHashCache[folderPath]
+
+    def GetResConvParams (self, platformSign: str, codepage: str, imageResourcesFolder: Path, inputFilePath: Path, nativeResourceFilePath: Path) -> list:
+        colorChangeScriptPath = self.GetColorChangeScriptPath ()
         call_params = [
             self.resConvPath,
             '-m', 'r',                      # resource compile mode
@@ -266,20 +953,72 @@ class ResourceCompiler (Compiler):
             '-o', nativeResourceFilePath    # output path
         ]
 
-        devkit_main_version, devkit_build_number= self.GetDevKitVersionAndBuildNumber ()
-        if (devkit_main_version == 29 and devkit_build_number >= 3000) or (devkit_main_version == 30 and devkit_build_number >= 82) or (devkit_main_version > 30):
+        if self.UsesColorChangeScript ():
             call_params.extend (['-py', sys.executable])        # python executable
             call_params.extend (['-sc', colorChangeScriptPath]) # SVG color change script path for generating Dark Mode icons
-        result = subprocess.call (call_params)
-        if result != 0:
-            return False
+        return call_params
+
+    def GetColorChangeScriptPath (self) -> Path:
+        return self.resConvPath.parent / 'SVGColorChange.py'
+
+    # a replaced ResConv may come without the script
+    def UsesColorChangeScript (self) -> bool:
+        return self.GetDevKitInfo ().supportsSvgColorChange and self.GetColorChangeScriptPath ().exists ()
+
+    def GetResConvCacheKey (self, platformSign: str, codepage: str, imageResourcesFolder: Path, inputFilePath: Path) -> str:
+        keyItems = [
+            RESCONV_CACHE_VERSION,
+            inputFilePath.name,
+            # the preprocessed file is hashed every time, a rewrite within the timestamp resolution keeps its stamp
+            ResourceCache.GetFileHash (inputFilePath),
+            self.GetCachedFileHash (self.resConvPath),
+            self.GetCachedFolderHash (imageResourcesFolder),
+            platformSign,
+            codepage,
+            self.UsesColorChangeScript (),
+        ]
+        if self.UsesColorChangeScript ():
+            keyItems.append (self.GetCachedFileHash (self.GetColorChangeScriptPath ()))
+        return ResourceCache.GetFingerprint (keyItems)
+
+    def ContainsLocalPaths (self, folderPath: Path, localPaths: list[Path]) -> bool:
+        return ResourceCache.FolderContainsText (folderPath, [str (path) for path in localPaths] + [str (path.absolute ()) for path in localPaths])
+
+    # ResConv outputs are stored in a content-addressed cache. The outputs are generated into a staging folder first,
+    # so every file written by ResConv can be stored and restored. Outputs containing local paths are not cached, they are
+    # moved to the resource objects folder.
+    def RunResConv (self, platformSign: str, codepage: str, inputFilePath: Path) -> bool:
+        nativeResourceFilePath = self.resourceObjectsPath / (inputFilePath.stem + self.nativeResourceFileExtension)
+        if self.IsLibraryGRC (inputFilePath):
+            # library images are generated into the resource objects folder, they are not cached
+            return self.RunStagedFragmentStep (nativeResourceFilePath,
+                lambda stagedNativeResourceFilePath: ParallelJobs.RunCommand (self.GetResConvParams (platformSign, codepage, self.resourceObjectsPath, inputFilePath, stagedNativeResourceFilePath)) == 0)
+
+        imageResourcesFolder = self.resourcesPath / 'RFIX' / 'Images'
+        cacheKey = self.GetResConvCacheKey (platformSign, codepage, imageResourcesFolder, inputFilePath)
+        entryPath = ResourceCache.GetCacheEntryPath (self.resConvCacheDir, cacheKey)
+        if not entryPath.is_dir ():
+            stagingFolderPath = ResourceCache.GetStagingFolderPath (entryPath.absolute ())
+            try:
+                result = ParallelJobs.RunCommand (self.GetResConvParams (platformSign, codepage, imageResourcesFolder, inputFilePath, stagingFolderPath / nativeResourceFilePath.name))
+                if result != 0:
+                    return False
+                if self.ContainsLocalPaths (stagingFolderPath, [stagingFolderPath, imageResourcesFolder, inputFilePath.parent]):
+                    self.MoveStagedFragments (stagingFolderPath, nativeResourceFilePath)
+                    return True
+                ResourceCache.StoreCacheEntry (stagingFolderPath, entryPath)
+            finally:
+                shutil.rmtree (stagingFolderPath, ignore_errors=True)
+
+        # every file of the cache entry was written by ResConv, so the restored fragments are recorded as they are
+        self.ReplaceRecordedFragments (nativeResourceFilePath, lambda: ResourceCache.RestoreCacheEntry (entryPath, self.resourceObjectsPath))
         return True
 
 class WinResourceCompiler (ResourceCompiler):
-    def __init__ (self, devKitPath: Path, acVersion: str, buildNum: str, addonName: str, languageCode: str, defaultLanguageCode: str, sourcesPath: Path, resourcesPath: Path, resourceObjectsPath: Path, permissiveLocalization: bool, hasLibpartCompiler: bool):
+    def __init__ (self, devKitPath: Path, acVersion: str, buildNum: str, addonName: str, languageCode: str, defaultLanguageCode: str, sourcesPath: Path, resourcesPath: Path, resourceObjectsPath: Path, permissiveLocalization: bool, hasLibpartCompiler: bool, cacheDir: Path, scriptRunner: ScriptRunner.ScriptRunner, jobRunner: ParallelJobs.JobRunner, resConvCacheDir: Path, resourceTools: ResourceTools.ResourceTools | None = None):
         super (WinResourceCompiler, self).__init__ (devKitPath, acVersion, buildNum, addonName, languageCode, defaultLanguageCode,
-            sourcesPath, resourcesPath, resourceObjectsPath, permissiveLocalization, hasLibpartCompiler)
-        self.resConvPath = devKitPath / 'Tools' / 'Win' / 'ResConv.exe'
+            sourcesPath, resourcesPath, resourceObjectsPath, permissiveLocalization, hasLibpartCompiler, cacheDir, scriptRunner, jobRunner, resConvCacheDir, resourceTools)
+        self.resConvPath = self.resourceTools.GetToolPath ('resConv', devKitPath / 'Tools' / 'Win' / 'ResConv.exe')
         self.nativeResourceFileExtension = '.rc2'
 
     def GetPlatformDevKitLinkKey(self) -> str:
@@ -288,29 +1027,13 @@ class WinResourceCompiler (ResourceCompiler):
     def GetPlatformDefine (self) -> str:
         return 'WINDOWS'
 
-    def PrecompileGRCResourceFile (self, grcFilePath: Path) -> Path:
-        precompiledGrcFilePath = self.GetPrecompiledGRCResourceFilePath (grcFilePath)
-        result = subprocess.call ([
-            'cl',
-            '/nologo',
-            '/X',
-            '/EP',
-            '/P',
-            '/I', self.devKitPath / 'Inc',
-            '/I', self.devKitPath / 'Modules' / 'DGLib',
-            '/I', self.sourcesPath,
-            '/I', self.resourceObjectsPath,
-            '/D' + self.GetPlatformDefine (),
-            '/source-charset:utf-8',
-            '/execution-charset:utf-8',
-            '/Fi{}'.format (precompiledGrcFilePath),
-            grcFilePath,
-        ])
-        assert result == 0, f'Failed to precompile resource {grcFilePath}'
-        return precompiledGrcFilePath
+    def GetDefaultPreprocessorPath (self) -> Path:
+        return Path ('cl')
 
-    def CompileGRCResourceFile (self, grcFilePath: Path, localized: bool) -> bool:
-        precompiledGrcFilePath = self.PrecompileGRCResourceFile (grcFilePath)
+    def GetJSONResourceProcessorEnvironment (self, jsonResourceProcessorPath: Path) -> dict[str, str]:
+        return { 'PATH': str (jsonResourceProcessorPath / 'dlls') + os.pathsep + os.environ['PATH'] }
+
+    def CompilePrecompiledGRCResourceFile (self, precompiledGrcFilePath: Path, localized: bool) -> bool:
         return self.RunResConv ('W', '1252', precompiledGrcFilePath)
 
     def GetNativeResourceFile (self) -> Path:
@@ -323,39 +1046,96 @@ class WinResourceCompiler (ResourceCompiler):
 
         return existingNativeResourceFile
 
+    def GetNativeResourceInputFiles (self) -> list[Path]:
+        return sorted (filePath for filePath in (self.resourcesPath / 'RFIX.win').rglob ('*') if filePath.is_file ())
+
     def CreateNativeResourceFileWithIncludes (self) -> Path:
         with open (self.GetNativeResourceFile (), 'r', encoding='utf-8', errors='strict') as f:
             nativeResFileContent = f.read ()
 
         result = self.resourceObjectsPath / f'{self.addonName}.gen.res.rc2'
-        with open (result, 'w', encoding='utf-8', errors='strict') as f:
-            for rc2File in self.resourceObjectsPath.rglob ('*.rc2'):
-                if rc2File != result:
-                    f.write (f'#include "{rc2File}"\n')
-            f.write (nativeResFileContent)
+        resultContent = ''.join (f'#include "{rc2File}"\n' for rc2File in self.GetNativeResourceFragmentFiles ()) + nativeResFileContent
+        # the file is rewritten only if it changes, so an unchanged resource set keeps its timestamp
+        if result.exists ():
+            with open (result, 'r', encoding='utf-8', errors='strict') as f:
+                if f.read () == resultContent:
+                    return result
+        ResourceCache.WriteFileAtomic (result, resultContent)
         return result
 
+    def GetNativeResourceIncludeFolders (self) -> list[Path]:
+        return [self.devKitPath / 'Inc', self.devKitPath / 'Modules' / 'DGLib', self.sourcesPath, self.resourceObjectsPath]
+
+    # files included by the resource script and the files referenced by its resources (icons, manifests, etc.)
+    def GetNativeResourceReferencedFiles (self, resourceFilePath: Path, searchFolders: list[Path]) -> list[Path]:
+        referencedFiles = {}
+        filesToScan = [resourceFilePath]
+        while filesToScan:
+            filePath = filesToScan.pop ()
+            with open (filePath, 'r', encoding='utf-8', errors='ignore') as f:
+                content = f.read ()
+            for match in re.finditer (r'^\s*#\s*include\s*[<"]([^>"\r\n]+)[>"]|"([^"\r\n]+\.[A-Za-z0-9]{1,8})"', content, re.MULTILINE):
+                isInclude = match.group (1) is not None
+                referencedName = match.group (1) if isInclude else match.group (2)
+                for folder in [filePath.parent] + searchFolders:
+                    referencedFile = Path (folder / referencedName)
+                    if referencedFile.is_file ():
+                        if referencedFile not in referencedFiles:
+                            referencedFiles[referencedFile] = None
+                            if isInclude:
+                                filesToScan.append (referencedFile)
+                        break
+        return list (referencedFiles.keys ())
+
+    def GetRcPath (self) -> Path:
+        return self.resourceTools.GetToolPath ('rc', Path ('rc'))
+
+    def GetNativeResourceFingerprint (self, nativeResourceFile: Path, resultResourcePath: Path) -> str:
+        includeFolders = self.GetNativeResourceIncludeFolders ()
+        searchFolders = includeFolders + [self.resourcesPath / 'RFIX' / 'Images']
+        inputFiles = [nativeResourceFile] + self.GetNativeResourceInputFiles () + self.GetNativeResourceReferencedFiles (nativeResourceFile, searchFolders)
+        # the tool is looked up on the PATH the same way as the compilation does
+        rcPath = shutil.which (self.GetRcPath ())
+        fingerprintItems = [
+            NATIVE_RESOURCE_FINGERPRINT_VERSION,
+            rcPath,
+            ResourceCache.GetFileStamp (rcPath) if rcPath else None,
+            resultResourcePath.absolute (),
+        ] + [folder.absolute () for folder in includeFolders]
+        for inputFile in sorted (set (Path (inputFile).absolute () for inputFile in inputFiles), key=lambda inputFile: str (inputFile)):
+            fingerprintItems.extend ([inputFile, self.GetCachedFileHash (inputFile)])
+        return ResourceCache.GetFingerprint (fingerprintItems)
+
     def CompileNativeResource (self, resultResourcePath: Path) -> None:
         nativeResourceFile = self.CreateNativeResourceFileWithIncludes ()
-        result = subprocess.call ([
-            'rc',
+        # the existing .res is kept if no input of the native resource changed since the last successful compilation
+        fingerprintFilePath = self.resourceObjectsPath / 'NativeResource.fingerprint'
+        fingerprint = self.GetNativeResourceFingerprint (nativeResourceFile, resultResourcePath)
+        if resultResourcePath.exists () and ResourceCache.IsFingerprintUpToDate (fingerprintFilePath, fingerprint):
+            return
+
+        params = [
+            self.GetRcPath (),
             '/i', self.devKitPath / 'Inc',
             '/i', self.devKitPath / 'Modules' / 'DGLib',
             '/i', self.sourcesPath,
             '/i', self.resourceObjectsPath,
             '/fo', resultResourcePath,
             nativeResourceFile
-        ])
+        ]
+        result = ParallelJobs.RunCommand (params)
         assert result == 0, f'Failed to compile native resource {nativeResourceFile}'
+        ResourceCache.WriteFingerprint (fingerprintFilePath, fingerprint)
 
 class MacResourceCompiler (ResourceCompiler):
-    def __init__ (self, devKitPath: Path, acVersion: str, buildNum: str, addonName: str, languageCode: str, defaultLanguageCode: str, sourcesPath: Path, resourcesPath: Path, resourceObjectsPath: Path, permissiveLocalization: bool, hasLibpartCompiler: bool):
+    def __init__ (self, devKitPath: Path, acVersion: str, buildNum: str, addonName: str, languageCode: str, defaultLanguageCode: str, sourcesPath: Path, resourcesPath: Path, resourceObjectsPath: Path, permissiveLocalization: bool, hasLibpartCompiler: bool, cacheDir: Path, scriptRunner: ScriptRunner.ScriptRunner, jobRunner: ParallelJobs.JobRunner, resConvCacheDir: Path, resourceTools: ResourceTools.ResourceTools | None = None):
         super (MacResourceCompiler, self).__init__ (devKitPath, acVersion, buildNum, addonName, languageCode, defaultLanguageCode,
-            sourcesPath, resourcesPath, resourceObjectsPath, permissiveLocalization, hasLibpartCompiler)
-        self.resConvPath = devKitPath / 'Tools' / 'OSX' / 'ResConv'
+            sourcesPath, resourcesPath, resourceObjectsPath, permissiveLocalization, hasLibpartCompiler, cacheDir, scriptRunner, jobRunner, resConvCacheDir, resourceTools)
+        self.resConvPath = self.resourceTools.GetToolPath ('resConv', devKitPath / 'Tools' / 'OSX' / 'ResConv')
         self.nativeResourceFileExtension = '.ro'
-        self.localizationMappingTable = FillLocalizationMappingTable (devKitPath)
+        self.localizationMappingTable = FillLocalizationMappingTable (devKitPath, 'Darwin')
         self.generatedFixFileNames = set ()
+        self.generatedFixFileNamesLock = threading.Lock ()
 
     def GetPlatformDevKitLinkKey(self) -> str:
         return "MAC"
@@ -363,33 +1143,46 @@ class MacResourceCompiler (ResourceCompiler):
     def GetPlatformDefine (self) -> str:
         return 'macintosh'
 
-    def PrecompileGRCResourceFile (self, grcFilePath: Path) -> Path:
-        precompiledGrcFilePath = self.GetPrecompiledGRCResourceFilePath (grcFilePath)
-        result = subprocess.call ([
-            'clang',
-            '-x', 'c++',
-            '-E',
-            '-P',
-            '-D' + self.GetPlatformDefine (),
-            '-I', self.devKitPath / 'Inc',
-            '-I', self.devKitPath / 'Modules' / 'DGLib',
-            '-I', self.sourcesPath,
-            '-I', self.resourceObjectsPath,
-            '-o', precompiledGrcFilePath,
-            grcFilePath,
-        ])
-        assert result == 0, f'Failed to precompile resource {grcFilePath}'
-        return precompiledGrcFilePath
+    def GetDefaultPreprocessorPath (self) -> Path:
+        return Path ('clang')
 
-    def CompileGRCResourceFile (self, grcFilePath: Path, localized: bool) -> bool:
-        precompiledGrcFilePath = self.PrecompileGRCResourceFile (grcFilePath)
+    def GetJSONResourceProcessorEnvironment (self, jsonResourceProcessorPath: Path) -> dict[str, str]:
+        return { 'DYLD_FALLBACK_LIBRARY_PATH': str (jsonResourceProcessorPath / 'dylibs') }
+
+    def GetFixFileNames (self, precompiledGrcFilePath: Path) -> set[str]:
+        # the resources of converted JSON files are known without scanning, unless the preprocessor decides about them
+        convertedResources = self.LoadConvertedResourceManifest (precompiledGrcFilePath.with_suffix (''))
+        if convertedResources is not None and all (resource['condition'] is None and resource['id'].isdigit () for resource in convertedResources):
+            resourceIds = [(resource['type'], resource['id']) for resource in convertedResources]
+        else:
+            resourceIds = self.resourceManifest.GetResourceIds (precompiledGrcFilePath)
+
+        fixFileNames = set ()
+        for resId, resNum in resourceIds:
+            if re.fullmatch (r'[A-Za-z0-9]{4}', resId) and resNum.isdigit ():
+                fixFileNames.add (f'{resId}_{resNum}.rsrd')
+        return fixFileNames
+
+    def LoadCompiledResourceState (self) -> None:
+        fixResourcesFolder = self.resourcesPath / 'RFIX'
+        grcFilePaths = list (fixResourcesFolder.glob ('*.grc')) + [self.resourceObjectsPath / f'{jsonFilePath.name}.grc' for jsonFilePath in fixResourcesFolder.glob ('*.json')]
+        for grcFilePath in grcFilePaths:
+            precompiledGrcFilePath = self.GetPrecompiledGRCResourceFilePath (grcFilePath)
+            if precompiledGrcFilePath.exists ():
+                self.generatedFixFileNames.update (self.GetFixFileNames (precompiledGrcFilePath))
+
+    def GetCompiledFixResourceState (self) -> dict:
+        return { 'fixFileNames': sorted (self.generatedFixFileNames) }
 
+    def SetCompiledFixResourceState (self, compiledState: dict) -> None:
+        with self.generatedFixFileNamesLock:
+            self.generatedFixFileNames.update (compiledState['fixFileNames'])
+
+    def CompilePrecompiledGRCResourceFile (self, precompiledGrcFilePath: Path, localized: bool) -> bool:
         if not localized:
-            with open (precompiledGrcFilePath, 'r', encoding='utf-8') as f:
-                for match in re.finditer (r"'([A-Za-z0-9]{4})'\s+(\d+)", f.read ()):
-                    resId = match.group (1)
-                    resNum = match.group (2)
-                    self.generatedFixFileNames.add (f'{resId}_{resNum}.rsrd')
+            fixFileNames = self.GetFixFileNames (precompiledGrcFilePath)
+            with self.generatedFixFileNamesLock:
+                self.generatedFixFileNames.update (fixFileNames)
 
         resConvResult = self.RunResConv ('M', 'utf16', precompiledGrcFilePath)
 
@@ -401,26 +1194,29 @@ class MacResourceCompiler (ResourceCompiler):
         if not resultLocalizedResourcePath.exists ():
             resultLocalizedResourcePath.mkdir (parents=True)
         resultLocalizableStringsPath = resultLocalizedResourcePath / 'Localizable.strings'
-        resultLocalizableStringsFile = codecs.open (resultLocalizableStringsPath, 'w', 'utf-16')
+        stringsFilePaths = []
+        bundleFiles = {}
         for fileName in self.resourceObjectsPath.rglob ('*'):
             filePath = self.resourceObjectsPath / fileName
             extension = fileName.suffix.lower ()
             if extension == '.tif':
-                shutil.copy (filePath, resultResourcePath)
+                bundleFiles[resultResourcePath / filePath.name] = filePath
             elif extension == '.rsrd':
                 if filePath.name in self.generatedFixFileNames:
-                    shutil.copy (filePath, resultResourcePath)
+                    bundleFiles[resultResourcePath / filePath.name] = filePath
                 else:
-                    shutil.copy (filePath, resultLocalizedResourcePath)
+                    bundleFiles[resultLocalizedResourcePath / filePath.name] = filePath
             elif extension == '.strings':
-                stringsFile = codecs.open (filePath, 'r', 'utf-16')
-                resultLocalizableStringsFile.write (stringsFile.read ())
-                stringsFile.close ()
-        resultLocalizableStringsFile.close ()
+                stringsFilePaths.append (filePath)
+        # the directory order of the file system is not stable, the strings are concatenated in path order
+        BundleSync.WriteUTF16Concatenation (sorted (stringsFilePaths), resultLocalizableStringsPath)
+        # only the changed files are copied into the bundle, the files of removed resources are deleted
+        BundleSync.SyncFiles (bundleFiles, self.resourceObjectsPath / 'BundleSync.json')
 
 class LibraryCompiler (Compiler):
-    def __init__ (self, devKitPath: Path, acVersion: str, buildNum: str, addonName: str, languageCode: str, defaultLanguageCode: str, sourcesPath: Path, resourcesPath: Path, resourceObjectsPath: Path):
-        super (LibraryCompiler, self).__init__ (devKitPath, acVersion, buildNum, addonName, languageCode, defaultLanguageCode, sourcesPath, resourcesPath, resourceObjectsPath)
+    def __init__ (self, devKitPath: Path, acVersion: str, buildNum: str, addonName: str, languageCode: str, defaultLanguageCode: str, sourcesPath: Path, resourcesPath: Path, resourceObjectsPath: Path, cacheDir: Path, resourceTools: ResourceTools.ResourceTools | None = None):
+        super (LibraryCompiler, self).__init__ (devKitPath, acVersion, buildNum, addonName, languageCode, defaultLanguageCode, sourcesPath, resourcesPath, resourceObjectsPath, resourceTools)
+        self.cacheDir = cacheDir
         self.libToolPath = None
         self.libSourcePath = resourcesPath / f'R{self.defaultLanguageCode}' / 'ACLib' / 'Src'
 
@@ -437,26 +1233,80 @@ class LibraryCompiler (Compiler):
     def GetPlatformDefine (self) -> str:
         return ""
 
+    def GetInputFiles (self) -> list[Path]:
+        if not self.libSourcePath.is_dir ():
+            return []
+        return sorted (filePath.absolute () for filePath in self.libSourcePath.rglob ('*') if filePath.is_file ())
+
+    def RunLibraryConverter (self, outputPath: Path) -> int:
+        command = [
+            self.libToolPath,
+            'hsf2l',
+            str(self.libSourcePath),
+            str(outputPath)
+        ]
+
+        return ParallelJobs.RunCommand(command)
+
+    # the sources come from the default language folder, so the compiled library is shared between the language builds
+    def GetLibraryCacheKey (self) -> str:
+        treeHashStatePath = self.cacheDir / 'TreeHashes' / ResourceCache.GetFingerprint ([self.libSourcePath.absolute ()])
+        return ResourceCache.GetFingerprint ([
+            LIBRARY_CACHE_VERSION,
+            self.libSourcePath.absolute (),
+            ResourceCache.GetTreeHash (self.libSourcePath, treeHashStatePath),
+            self.libToolPath.absolute (),
+            ResourceCache.GetFileStamp (self.libToolPath),
+        ])
+
+    def GetLibraryStatePath (self) -> Path:
+        return self.resourceObjectsPath / 'Library.state'
+
+    def IsLibraryUpToDate (self, libraryKey: str) -> bool:
+        libraryStatePath = self.GetLibraryStatePath ()
+        if not libraryStatePath.exists ():
+            return False
+        try:
+            with open (libraryStatePath, 'r', encoding='utf-8') as f:
+                libraryState = json.load (f)
+        except (OSError, ValueError):
+            return False
+        return libraryState.get ('key') == libraryKey and all ((self.resourceObjectsPath / outputFile).exists () for outputFile in libraryState['outputs'])
+
     def CompileLibrary (self) -> None:
-        if self.libSourcePath.is_dir():
-            command = [
-                self.libToolPath,
-                'hsf2l',
-                str(self.libSourcePath),
-                str(self.resourceObjectsPath)
-            ]
+        if not self.libSourcePath.is_dir():
+            return
+
+        libraryKey = self.GetLibraryCacheKey ()
+        if self.IsLibraryUpToDate (libraryKey):
+            return
 
-            result = subprocess.call(command)
-            assert result == 0, 'Failed to create library ' + str(self.libSourcePath)
+        entryPath = ResourceCache.GetCacheEntryPath (self.cacheDir / 'Library', libraryKey)
+        if not entryPath.is_dir ():
+            stagingFolderPath = ResourceCache.GetStagingFolderPath (entryPath)
+            result = self.RunLibraryConverter (stagingFolderPath)
+            # outputs that are not relocatable are not cached
+            if result != 0 or ResourceCache.FolderContainsText (stagingFolderPath, [str (stagingFolderPath), str (stagingFolderPath.absolute ())]):
+                shutil.rmtree (stagingFolderPath, ignore_errors=True)
+                assert result == 0, 'Failed to create library ' + str(self.libSourcePath)
+                assert self.RunLibraryConverter (self.resourceObjectsPath) == 0, 'Failed to create library ' + str(self.libSourcePath)
+                return
+            ResourceCache.StoreCacheEntry (stagingFolderPath, entryPath)
+
+        outputFiles = ResourceCache.RestoreCacheEntry (entryPath, self.resourceObjectsPath)
+        ResourceCache.WriteFileAtomic (self.GetLibraryStatePath (), json.dumps ({
+            'key': libraryKey,
+            'outputs': [outputFile.relative_to (self.resourceObjectsPath).as_posix () for outputFile in outputFiles],
+        }))
 
 class MacLibraryCompiler (LibraryCompiler):
-    def __init__ (self, devKitPath: Path, acVersion: str, buildNum: str, addonName: str, languageCode: str, defaultLanguageCode: str, sourcesPath: Path, resourcesPath: Path, resourceObjectsPath: Path, libToolPath: Path):
-        super (MacLibraryCompiler, self).__init__ (devKitPath, acVersion, buildNum, addonName, languageCode, defaultLanguageCode, sourcesPath, resourcesPath, resourceObjectsPath)
+    def __init__ (self, devKitPath: Path, acVersion: str, buildNum: str, addonName: str, languageCode: str, defaultLanguageCode: str, sourcesPath: Path, resourcesPath: Path, resourceObjectsPath: Path, cacheDir: Path, libToolPath: Path, resourceTools: ResourceTools.ResourceTools | None = None):
+        super (MacLibraryCompiler, self).__init__ (devKitPath, acVersion, buildNum, addonName, languageCode, defaultLanguageCode, sourcesPath, resourcesPath, resourceObjectsPath, cacheDir, resourceTools)
         xmlConverterApp = libToolPath / 'LP_XMLConverter.app'
         if xmlConverterApp.exists ():
-            self.libToolPath = xmlConverterApp / 'Contents' / 'MacOS' / 'LP_XMLConverter'
+            self.libToolPath = self.resourceTools.GetToolPath ('lpXMLConverter', xmlConverterApp / 'Contents' / 'MacOS' / 'LP_XMLConverter')
         else:
-            self.libToolPath = libToolPath / 'LP_XMLConverter'
+            self.libToolPath = self.resourceTools.GetToolPath ('lpXMLConverter', libToolPath / 'LP_XMLConverter')
 
     def GetPlatformDevKitLinkKey(self) -> str:
         return "MAC"
@@ -465,9 +1315,9 @@ class MacLibraryCompiler (LibraryCompiler):
         return 'macintosh'
 
 class WinLibraryCompiler (LibraryCompiler):
-    def __init__ (self, devKitPath: Path, acVersion: str, buildNum: str, addonName: str, languageCode: str, defaultLanguageCode: str, sourcesPath: Path, resourcesPath: Path, resourceObjectsPath: Path, libToolPath: Path):
-        super (WinLibraryCompiler, self).__init__ (devKitPath, acVersion, buildNum, addonName, languageCode, defaultLanguageCode, sourcesPath, resourcesPath, resourceObjectsPath)
-        self.libToolPath = libToolPath / 'LP_XMLConverter.exe'
+    def __init__ (self, devKitPath: Path, acVersion: str, buildNum: str, addonName: str, languageCode: str, defaultLanguageCode: str, sourcesPath: Path, resourcesPath: Path, resourceObjectsPath: Path, cacheDir: Path, libToolPath: Path, resourceTools: ResourceTools.ResourceTools | None = None):
+        super (WinLibraryCompiler, self).__init__ (devKitPath, acVersion, buildNum, addonName, languageCode, defaultLanguageCode, sourcesPath, resourcesPath, resourceObjectsPath, cacheDir, resourceTools)
+        self.libToolPath = self.resourceTools.GetToolPath ('lpXMLConverter', libToolPath / 'LP_XMLConverter.exe')
 
     def GetPlatformDevKitLinkKey(self) -> str:
         return "WIN"
@@ -475,28 +1325,66 @@ class WinLibraryCompiler (LibraryCompiler):
     def GetPlatformDefine (self) -> str:
         return 'WINDOWS'
 
-def CreateLibraryCompiler(devKitPath: Path, acVersion: str, buildNum: str, addonName: str, languageCode: str, defaultLanguageCode: str, sourcesPath: Path, resourcesPath: Path, resourceObjectsPath: Path, libToolPath: Path) -> LibraryCompiler:
-    """Create and return the appropriate library compiler based on the current platform."""
-    system = platform.system()
+def GetTargetPlatform (resourceTools: ResourceTools.ResourceTools | None) -> str | None:
+    # the tools may compile the resources of an other platform, for example on Linux build machines
+    if resourceTools is not None and resourceTools.GetTargetPlatform () is not None:
+        return resourceTools.GetTargetPlatform ()
+    return { 'Windows': 'WIN', 'Darwin': 'MAC' }.get (platform.system ())
 
-    if system == 'Windows':
-        return WinLibraryCompiler(devKitPath, acVersion, buildNum, addonName, languageCode, defaultLanguageCode, sourcesPath, resourcesPath, resourceObjectsPath, libToolPath)
-    elif system == 'Darwin':
-        return MacLibraryCompiler(devKitPath, acVersion, buildNum, addonName, languageCode, defaultLanguageCode, sourcesPath, resourcesPath, resourceObjectsPath, libToolPath)
+def CreateLibraryCompiler(devKitPath: Path, acVersion: str, buildNum: str, addonName: str, languageCode: str, defaultLanguageCode: str, sourcesPath: Path, resourcesPath: Path, resourceObjectsPath: Path, cacheDir: Path, libToolPath: Path, resourceTools: ResourceTools.ResourceTools | None = None) -> LibraryCompiler:
+    """Create and return the appropriate library compiler based on the current platform or the platform of the tools."""
+    targetPlatform = GetTargetPlatform (resourceTools)
+
+    if targetPlatform == 'WIN':
+        return WinLibraryCompiler(devKitPath, acVersion, buildNum, addonName, languageCode, defaultLanguageCode, sourcesPath, resourcesPath, resourceObjectsPath, cacheDir, libToolPath, resourceTools)
+    elif targetPlatform == 'MAC':
+        return MacLibraryCompiler(devKitPath, acVersion, buildNum, addonName, languageCode, defaultLanguageCode, sourcesPath, resourcesPath, resourceObjectsPath, cacheDir, libToolPath, resourceTools)
     else:
         raise RuntimeError('Platform is not supported')
 
-def CreateResourceCompiler(devKitPath: Path, acVersion: str, buildNum: str, addonName: str, languageCode: str, defaultLanguageCode: str, sourcesPath: Path, resourcesPath: Path, resourceObjectsPath: Path, permissiveLocalization: bool, hasLibpartCompiler: bool) -> ResourceCompiler:
-    """Create and return the appropriate resource compiler based on the current platform."""
-    system = platform.system()
+def CreateResourceCompiler(devKitPath: Path, acVersion: str, buildNum: str, addonName: str, languageCode: str, defaultLanguageCode: str, sourcesPath: Path, resourcesPath: Path, resourceObjectsPath: Path, permissiveLocalization: bool, hasLibpartCompiler: bool, cacheDir: Path, scriptRunner: ScriptRunner.ScriptRunner, jobRunner: ParallelJobs.JobRunner, resConvCacheDir: Path, resourceTools: ResourceTools.ResourceTools | None = None) -> ResourceCompiler:
+    """Create and return the appropriate resource compiler based on the current platform or the platform of the tools."""
+    targetPlatform = GetTargetPlatform (resourceTools)
 
-    if system == 'Windows':
-        return WinResourceCompiler(devKitPath, acVersion, buildNum, addonName, languageCode, defaultLanguageCode, sourcesPath, resourcesPath, resourceObjectsPath, permissiveLocalization, hasLibpartCompiler)
-    elif system == 'Darwin':
-        return MacResourceCompiler(devKitPath, acVersion, buildNum, addonName, languageCode, defaultLanguageCode, sourcesPath, resourcesPath, resourceObjectsPath, permissiveLocalization, hasLibpartCompiler)
+    if targetPlatform == 'WIN':
+        return WinResourceCompiler(devKitPath, acVersion, buildNum, addonName, languageCode, defaultLanguageCode, sourcesPath, resourcesPath, resourceObjectsPath, permissiveLocalization, hasLibpartCompiler, cacheDir, scriptRunner, jobRunner, resConvCacheDir, resourceTools)
+    elif targetPlatform == 'MAC':
+        return MacResourceCompiler(devKitPath, acVersion, buildNum, addonName, languageCode, defaultLanguageCode, sourcesPath, resourcesPath, resourceObjectsPath, permissiveLocalization, hasLibpartCompiler, cacheDir, scriptRunner, jobRunner, resConvCacheDir, resourceTools)
     else:
         raise RuntimeError('Platform is not supported')
 
+def RunResourceStep (step: str, inputFilePath: Path | None, localized: bool, objectCompiler: LibraryCompiler, resourceCompiler: ResourceCompiler, resultResourcePath: Path) -> list[Path]:
+    """Run a single step of the resource build and return the files it read."""
+    if step in ['grc', 'json']:
+        assert inputFilePath is not None, f'The {step} step needs an input file'
+
+    if step == 'library':
+        if not objectCompiler.IsValid ():
+            return []
+        objectCompiler.CompileLibrary ()
+        return objectCompiler.GetInputFiles ()
+    elif step == 'grc':
+        if resourceCompiler.ShouldCompileGRCResourceFile (inputFilePath, localized):
+            assert resourceCompiler.CompileGRCResourceFile (inputFilePath, localized), f'Failed to compile resource: {inputFilePath}'
+        return resourceCompiler.FilterInputFiles (resourceCompiler.GetGRCInputFiles (inputFilePath))
+    elif step == 'mergeXliff':
+        jsonResourceProcessorPath = resourceCompiler.GetJSONResourceProcessorPath ()
+        if resourceCompiler.GetDevKitInfo ().hasJsonResourceProcessor:
+            resourceCompiler.GetMergedXliffPath (jsonResourceProcessorPath)
+        return resourceCompiler.FilterInputFiles (resourceCompiler.GetXliffInputFiles ())
+    elif step == 'json':
+        resourceCompiler.CompileJSONResourceFile (inputFilePath, localized)
+        return resourceCompiler.FilterInputFiles (resourceCompiler.GetJSONInputFiles (inputFilePath, localized))
+    elif step == 'toc':
+        resourceCompiler.GenerateJSONTableOfContents (localized)
+        return []
+    elif step == 'native':
+        resourceCompiler.LoadCompiledResourceState ()
+        resourceCompiler.CompileNativeResource (resultResourcePath)
+        return resourceCompiler.FilterInputFiles (resourceCompiler.GetNativeResourceInputFiles ())
+    else:
+        assert False, f'Unknown resource step: {step}'
+
 def Main (argv):
     parser = argparse.ArgumentParser (description = 'Archicad Add-On Resource Compiler.')
     parser.add_argument ('addonName', help = 'Name of the Add-On.')
@@ -511,8 +1399,33 @@ def Main (argv):
     parser.add_argument ('resourceObjectsPath', help = 'Path of the folder to build resource objects.')
     parser.add_argument ('resultResourcePath', help = 'Path of the resulting resource.')
     parser.add_argument ('--permissiveLocalization', action='store_true', help = 'Enable permissive localization mode.', default = False)
-    args = parser.parse_args ()
-
+    parser.add_argument ('--subprocessScripts', action='store_true', help = 'Run the Python tools of the Development Kit in separate processes, they always do with more than one job.', default = False)
+    parser.add_argument ('-j', '--jobs', type = int, help = 'Number of resource files to compile in parallel. Defaults to the make jobserver limit if available, otherwise to the number of CPUs.', default = None)
+    parser.add_argument ('--cacheDir', help = 'Path of the folder to store caches that can be shared between resource builds.', default = None)
+    parser.add_argument ('--resConvCacheDir', help = 'Path of the folder to store compiled resources, it can be shared between checkouts and build machines. Defaults to a subfolder of the cache folder.', default = None)
+    parser.add_argument ('--depFile', help = 'Path of the dependency file to write with every input of the resource build.', default = None)
+    parser.add_argument ('--depFileTarget', help = 'Target of the dependency file. Defaults to the resulting resource.', default = None)
+    parser.add_argument ('--step', choices = RESOURCE_STEPS, help = 'Run only one step of the resource build, the default is to run every step.', default = 'all')
+    parser.add_argument ('--input', help = 'Input file of the grc and json steps.', default = None)
+    parser.add_argument ('--localized', action='store_true', help = 'The input of the grc and json steps is a localized resource.', default = False)
+    parser.add_argument ('--toolProfile', help = 'Path of a JSON file with the paths of the tools to use instead of the tools of the Development Kit (platform, preprocessor, resConv, rc, lpXMLConverter, jsonResourceProcessor).', default = None)
+    parser.add_argument ('--printCriticalPath', action='store_true', help = 'Print the longest chain of dependent steps after the build.', default = False)
+    parser.add_argument ('--converterStats', action='store_true', help = 'Write the counters of the JSON to GRC conversion per resource type and GDLG control type next to every converted GRC file and into ConverterStats.json in the resource objects folder.', default = False)
+    parser.add_argument ('--trace', help = 'Path of a Chrome trace file (viewable in Perfetto or chrome://tracing) to write with the steps and the tool calls of the resource build.', default = None)
+    args = parser.parse_args (argv[1:])
+
+    tracePath = Path (args.trace).absolute () if args.trace else TraceEvents.GetTraceFolderTracePath ('CompileResources')
+    if tracePath is None:
+        return RunResourceBuild (args)
+
+    TraceEvents.StartTracing ('CompileResources')
+    try:
+        with TraceEvents.TraceSpan ('CompileResources', 'phase', { 'addonName': args.addonName, 'languageCode': args.languageCode, 'step': args.step }):
+            return RunResourceBuild (args)
+    finally:
+        TraceEvents.WriteTrace (tracePath, TraceEvents.StopTracing ())
+
+def RunResourceBuild (args: argparse.Namespace) -> int:
     currentDir = Path (__file__).parent
     os.chdir (currentDir)
 
@@ -528,20 +1441,60 @@ def Main (argv):
     resourceObjectsPath = Path (args.resourceObjectsPath)
     resultResourcePath = Path (args.resultResourcePath)
     permissiveLocalization = args.permissiveLocalization
+    cacheDir = Path (args.cacheDir) if args.cacheDir else resourceObjectsPath.parent / 'ResourceCache'
+    resConvCacheDir = Path (args.resConvCacheDir) if args.resConvCacheDir else cacheDir / 'ResConv'
+    jobRunner = ParallelJobs.CreateJobRunner (args.jobs)
+    scriptRunner = ScriptRunner.CreateScriptRunner (not args.subprocessScripts, jobRunner.jobCount)
+    resourceTools = ResourceTools.LoadResourceTools (Path (args.toolProfile).absolute () if args.toolProfile else None)
 
     resourceCompiler = None
-
-    objectCompiler = CreateLibraryCompiler (devKitPath, acVersion, buildNum, addonName, languageCode, defaultLanguageCode, sourcesPath, resourcesPath, resourceObjectsPath, lpXMLConverterFolder)
-    if objectCompiler.IsValid ():           # older devkits may not have the library compiler
-        objectCompiler.CompileLibrary ()
-
-    resourceCompiler = CreateResourceCompiler (devKitPath, acVersion, buildNum, addonName, languageCode, defaultLanguageCode, sourcesPath, resourcesPath, resourceObjectsPath, permissiveLocalization, objectCompiler.IsValid())
-    assert resourceCompiler.IsValid (), 'Invalid resource compiler'
-
-    resourceCompiler.CompileLocalizedResources ()
-    resourceCompiler.CompileFixResources ()
-    resourceCompiler.CompileNativeResource (resultResourcePath)
+    taskGraph = ParallelJobs.TaskGraph ()
+
+    with TraceEvents.TraceSpan ('Create compilers', 'phase'):
+        objectCompiler = CreateLibraryCompiler (devKitPath, acVersion, buildNum, addonName, languageCode, defaultLanguageCode, sourcesPath, resourcesPath, resourceObjectsPath, cacheDir, lpXMLConverterFolder, resourceTools)
+        libraryTasks = []
+        if objectCompiler.IsValid () and args.step == 'all':           # older devkits may not have the library compiler
+            libraryTasks.append (taskGraph.AddTask ('Compile library', objectCompiler.CompileLibrary))
+
+        resourceCompiler = CreateResourceCompiler (devKitPath, acVersion, buildNum, addonName, languageCode, defaultLanguageCode, sourcesPath, resourcesPath, resourceObjectsPath, permissiveLocalization, objectCompiler.IsValid(), cacheDir, scriptRunner, jobRunner, resConvCacheDir, resourceTools)
+        assert resourceCompiler.IsValid (), 'Invalid resource compiler'
+        if args.converterStats:
+            resourceCompiler.converterStats = ConverterStats.ConverterStats ()
+
+    if args.step != 'all':
+        try:
+            with TraceEvents.TraceSpan (f'Run {args.step} step', 'phase', { 'input': args.input }):
+                inputFiles = RunResourceStep (args.step, Path (args.input) if args.input else None, args.localized, objectCompiler, resourceCompiler, resultResourcePath)
+        finally:
+            resourceCompiler.resourceManifest.Save ()
+    else:
+        with TraceEvents.TraceSpan ('Update resource manifest', 'phase'):
+            resourceCompiler.UpdateResourceManifest ()
+        # the library is compiled while the resources without library parts are compiled
+        resourceTasks = resourceCompiler.AddLocalizedResourceTasks (taskGraph, [], libraryTasks)
+        try:
+            resourceTasks += resourceCompiler.AddSharedFixResourceTasks (taskGraph, libraryTasks)
+            taskGraph.AddTask ('Compile native resource', functools.partial (resourceCompiler.CompileNativeResource, resultResourcePath), libraryTasks + resourceTasks)
+            with TraceEvents.TraceSpan ('Run task graph', 'phase'):
+                taskGraph.Run (jobRunner)
+            if resourceCompiler.converterStats is not None:
+                resourceCompiler.converterStats.WriteJson (resourceObjectsPath / 'ConverterStats.json')
+        finally:
+            resourceCompiler.ReleaseSharedFixResources ()
+            resourceCompiler.resourceManifest.Save ()
+            if args.printCriticalPath:
+                taskGraph.PrintCriticalPath ()
+
+        inputFiles = resourceCompiler.GetInputFiles ()
+        if objectCompiler.IsValid ():
+            inputFiles = objectCompiler.GetInputFiles () + inputFiles
+
+    if args.depFile:
+        depFileTarget = Path (args.depFileTarget) if args.depFileTarget else resultResourcePath
+        with TraceEvents.TraceSpan ('Write dependency file', 'phase'):
+            PreprocessorCache.WriteDepFile (Path (args.depFile), depFileTarget, inputFiles)
 
     return 0
 
-sys.exit (Main (sys.argv))
+if __name__ == '__main__':
+    sys.exit (Main (sys.argv))
@@ -68,6 +68,9 @@ class GrcOutputBuilder:
     def AddLine (self, line: str = '') -> None:
         self.result += f'{line}\n'
 
+    def AddText (self, text: str) -> None:
+        self.result += text
+
     def GetResult (self) -> str:
         return self.result
 
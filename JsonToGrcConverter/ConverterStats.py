@@ -0,0 +1,90 @@
+import json
+import threading
+from pathlib import Path
+
+
+CONVERTER_STATS_VERSION = 1
+
+threadState = threading.local ()
+
+
+class ConverterStats:
+    """
+    Counters of the JSON to GRC conversion per resource type and per GDLG control type: the number of
+    converted items, the cumulative conversion time in seconds, the emitted UTF-8 bytes and the rendered conditions.
+    Resources reused from the converted fragment cache are counted in 'cached', their controls are not converted again.
+    """
+
+    def __init__ (self):
+        self.resourceTypes = {}
+        self.gdlgControlTypes = {}
+
+    @staticmethod
+    def AddToCounters (counters: dict[str, dict], name: str, count: int, cached: int, time: float, emittedBytes: int, conditions: int) -> None:
+        itemCounters = counters.setdefault (name, { 'count': 0, 'cached': 0, 'time': 0.0, 'bytes': 0, 'conditions': 0 })
+        itemCounters['count'] += count
+        itemCounters['cached'] += cached
+        itemCounters['time'] += time
+        itemCounters['bytes'] += emittedBytes
+        itemCounters['conditions'] += conditions
+
+    def AddResource (self, resourceType: str, time: float, grcText: str, cached: bool) -> None:
+        ConverterStats.AddToCounters (self.resourceTypes, resourceType, 1, int (cached), time, *GetEmittedSize (grcText))
+
+    def AddGDLGControl (self, controlType: str, time: float, grcText: str) -> None:
+        ConverterStats.AddToCounters (self.gdlgControlTypes, controlType, 1, 0, time, *GetEmittedSize (grcText))
+
+    def Merge (self, other: 'ConverterStats') -> None:
+        for counters, otherCounters in [(self.resourceTypes, other.resourceTypes), (self.gdlgControlTypes, other.gdlgControlTypes)]:
+            for name, itemCounters in otherCounters.items ():
+                ConverterStats.AddToCounters (counters, name, itemCounters['count'], itemCounters['cached'], itemCounters['time'], itemCounters['bytes'], itemCounters['conditions'])
+
+    def ToDict (self) -> dict:
+        return {
+            'version': CONVERTER_STATS_VERSION,
+            'resourceTypes': { name: dict (self.resourceTypes[name]) for name in sorted (self.resourceTypes) },
+            'gdlgControlTypes': { name: dict (self.gdlgControlTypes[name]) for name in sorted (self.gdlgControlTypes) },
+        }
+
+    @staticmethod
+    def FromDict (data: dict) -> 'ConverterStats':
+        assert data.get ('version') == CONVERTER_STATS_VERSION, f'Unsupported converter stats version: {data.get ("version")}'
+        stats = ConverterStats ()
+        stats.resourceTypes = { name: dict (itemCounters) for name, itemCounters in data['resourceTypes'].items () }
+        stats.gdlgControlTypes = { name: dict (itemCounters) for name, itemCounters in data['gdlgControlTypes'].items () }
+        return stats
+
+    def WriteJson (self, filePath: Path) -> None:
+        with open (filePath, 'w', encoding='utf-8') as f:
+            json.dump (self.ToDict (), f, indent=4)
+
+
+def GetEmittedSize (grcText: str) -> tuple[int, int]:
+    # every condition is rendered as an #if line by GetConditionAsIfDef
+    conditions = sum (1 for line in grcText.splitlines () if line.startswith ('#if '))
+    return (len (grcText.encode ('utf-8')), conditions)
+
+
+def GetActiveStats () -> ConverterStats | None:
+    return getattr (threadState, 'stats', None)
+
+
+class CollectStats:
+    """Makes the stats the target of the conversions of the current thread while the context is active."""
+
+    def __init__ (self, stats: ConverterStats | None):
+        self.stats = stats
+        self.savedStats = None
+
+    def __enter__ (self) -> ConverterStats | None:
+        self.savedStats = GetActiveStats ()
+        threadState.stats = self.stats
+        return self.stats
+
+    def __exit__ (self, excType, excValue, traceback) -> None:
+        threadState.stats = self.savedStats
+
+
+def LoadConverterStats (filePath: Path) -> ConverterStats:
+    with open (filePath, 'r', encoding='utf-8') as f:
+        return ConverterStats.FromDict (json.load (f))
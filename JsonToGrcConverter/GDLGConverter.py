@@ -1,4 +1,5 @@
 import copy
+import time
 
 from .Common import (
     CheckForNotImplementedConditionHandling,
@@ -18,6 +19,7 @@ from .Common import (
     MapPropertyToGrc,
     UnsupportedGDLGControlError,
 )
+from .ConverterStats import GetActiveStats
 
 
 def ConvertGrow (s: str) -> str:
@@ -1279,6 +1281,11 @@ def ConvertGDLGControl (outputBuilder: GrcOutputBuilder, control: dict, index: i
     if controlType not in controlConverterMapping:
         raise UnsupportedGDLGControlError (controlType)
 
+    converterStats = GetActiveStats ()
+    if converterStats is not None:
+        startTime = time.perf_counter ()
+        startLength = len (outputBuilder.GetResult ())
+
     condition = controlProps.pop ('#condition', None)
     if condition:
         outputBuilder.AddLine (GetConditionAsIfDef (condition))
@@ -1287,3 +1294,6 @@ def ConvertGDLGControl (outputBuilder: GrcOutputBuilder, control: dict, index: i
 
     if condition:
         outputBuilder.AddLine (GetConditionEnd ())
+
+    if converterStats is not None:
+        converterStats.AddGDLGControl (controlType, time.perf_counter () - startTime, outputBuilder.GetResult ()[startLength:])
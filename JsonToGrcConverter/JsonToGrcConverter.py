@@ -1,4 +1,8 @@
 import json
+import time
+import hashlib
+import threading
+import collections
 from pathlib import Path
 from .Common import (
     GrcOutputBuilder,
@@ -24,10 +28,71 @@ from .GICNConverter import ConvertGICN
 from .MDIDConverter import ConvertMDID
 from .STRSConverter import ConvertSTRS
 from .TEXTConverter import ConvertTEXT
+from .ConverterStats import ConverterStats, CollectStats
 
 
-def ConvertJsonDataToGrcString (jsonData: dict, targetAcVersion: int, ignoredResourceTypes: list[str] = []) -> str:
+DEFAULT_FRAGMENT_CACHE_SIZE = 10000
+
+
+class ConvertedFragmentCache:
+    """
+    Converted GRC text of single resources. The converters only depend on the resource type, the resource and
+    the target version, so a long running process (e.g. the resource compile server) can reuse the results between builds.
+    The least recently used fragments are dropped when the cache is full.
+    """
+
+    def __init__ (self, maxEntries: int):
+        self.maxEntries = maxEntries
+        self.fragments = collections.OrderedDict ()
+        self.lock = threading.Lock ()
+
+    @staticmethod
+    def GetKey (resourceType: str, targetAcVersion: int, resource: dict) -> str:
+        return hashlib.sha256 (json.dumps ([resourceType, targetAcVersion, resource], sort_keys=True).encode ('utf-8')).hexdigest ()
+
+    def Get (self, key: str) -> str | None:
+        with self.lock:
+            fragment = self.fragments.get (key)
+            if fragment is not None:
+                self.fragments.move_to_end (key)
+            return fragment
+
+    def Add (self, key: str, fragment: str) -> None:
+        with self.lock:
+            self.fragments[key] = fragment
+            self.fragments.move_to_end (key)
+            while len (self.fragments) > self.maxEntries:
+                self.fragments.popitem (last=False)
+
+
+# only enabled by long running processes, a single conversion would just pay for filling it
+convertedFragmentCache = None
+
+
+def EnableConvertedFragmentCache (maxEntries: int = DEFAULT_FRAGMENT_CACHE_SIZE) -> None:
+    global convertedFragmentCache
+    convertedFragmentCache = ConvertedFragmentCache (maxEntries)
+
+
+def DisableConvertedFragmentCache () -> None:
+    global convertedFragmentCache
+    convertedFragmentCache = None
+
+# GRC resource types emitted for a JSON resource, when they differ from the JSON resource type
+emittedResourceTypes = {
+    'GDLG': ['GDLG', 'DLGH'],
+    'STRS': ['STR#'],
+}
+
+
+def ConvertJsonDataToGrcString (jsonData: dict, targetAcVersion: int, ignoredResourceTypes: list[str] = [], resourceManifest: list[dict] | None = None, converterStats: ConverterStats | None = None) -> str:
+    """
+    Convert the JSON resources to GRC. If a resourceManifest list is given, a record with the type, the id and
+    the condition of every emitted resource is appended to it. Ids defined by the unconditional macros of the JSON are resolved.
+    If converterStats is given, the conversion counters of the resource and GDLG control types are added to it.
+    """
     outputBuilder = GrcOutputBuilder ()
+    macroValues = {}
 
     outputBuilder.AddLine ('#include "DGDefs.h"')
     if 'MDID' in jsonData:
@@ -42,6 +107,8 @@ def ConvertJsonDataToGrcString (jsonData: dict, targetAcVersion: int, ignoredRes
             outputBuilder.AddLine (f'#define {macro["macro"]:<{MACRO_NAME_WIDTH}} {macro["value"]:>{MACRO_VALUE_WIDTH}}')
             if condition:
                 outputBuilder.AddLine (GetConditionEnd ())
+            else:
+                macroValues[str (macro['macro'])] = str (macro['value'])
         outputBuilder.AddLine ()
 
     for resourceType, resources in jsonData.items ():
@@ -74,10 +141,36 @@ def ConvertJsonDataToGrcString (jsonData: dict, targetAcVersion: int, ignoredRes
             if resourceType not in resourceTypeConverterMapping:
                 raise UnsupportedResourceTypeError (resourceType)
 
-            resourceTypeConverterMapping[resourceType] (outputBuilder, resource, targetAcVersion)
-
-            CheckIfAllKeysWereHandled (resource)
-
+            # the converters remove the handled keys from the resource
+            if resourceManifest is not None:
+                resId = str (resource.get ('#id'))
+                for emittedResourceType in emittedResourceTypes.get (resourceType, [resourceType]):
+                    resourceManifest.append ({
+                        'type': emittedResourceType,
+                        'id': macroValues.get (resId, resId),
+                        'condition': resource.get ('#condition'),
+                    })
+
+            fragmentCache = convertedFragmentCache
+            fragmentKey = ConvertedFragmentCache.GetKey (resourceType, targetAcVersion, resource) if fragmentCache is not None else None
+            fragment = fragmentCache.Get (fragmentKey) if fragmentCache is not None else None
+            cached = fragment is not None
+            startTime = time.perf_counter () if converterStats is not None else 0.0
+            if fragment is None:
+                fragmentBuilder = GrcOutputBuilder ()
+                # the GDLG converter adds the counters of the controls to the collected stats
+                with CollectStats (converterStats):
+                    resourceTypeConverterMapping[resourceType] (fragmentBuilder, resource, targetAcVersion)
+
+                CheckIfAllKeysWereHandled (resource)
+
+                fragment = fragmentBuilder.GetResult ()
+                if fragmentCache is not None:
+                    fragmentCache.Add (fragmentKey, fragment)
+            if converterStats is not None:
+                converterStats.AddResource (resourceType, time.perf_counter () - startTime, fragment, cached)
+
+            outputBuilder.AddText (fragment)
             outputBuilder.AddLine ()
 
     return outputBuilder.GetResult ()
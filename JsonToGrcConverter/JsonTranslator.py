@@ -1,4 +1,7 @@
 import re
+import os
+import json
+import hashlib
 from pathlib import Path
 import xml.etree.ElementTree as ET
 
@@ -9,6 +12,12 @@ XLIFF_NS = 'urn:oasis:names:tc:xliff:document:1.2'
 
 XLIFF_NSMAP = { '': XLIFF_NS, 'gs': 'graphisoft:ac:xliff' }
 
+# Increase when the way translations are extracted from XLIFF files changes to invalidate cached dictionaries.
+TRANSLATION_CACHE_VERSION = 1
+
+# Merged dictionaries by chain key. The keys are content hashes, so the entries never become outdated.
+translationStore = {}
+
 
 def GetTrailingAndLeadingWhitespaces (text: str) -> tuple[str, str]:
 
@@ -42,12 +51,132 @@ def GetTranslations (xlfPath: Path) -> dict[str, str]:
     return result
 
 
+def GetFileHash (filePath: Path) -> str:
+    fileHash = hashlib.sha256 ()
+    with open (filePath, 'rb') as f:
+        for chunk in iter (lambda: f.read (1024 * 1024), b''):
+            fileHash.update (chunk)
+    return fileHash.hexdigest ()
+
+
+def GetTranslationChainKeys (xlfPaths: list[Path]) -> list[str]:
+    # The key of each level depends on the hashes of the level itself and all of its ancestors,
+    # so languages sharing the same parents share the cached dictionaries of those parents.
+    keys = []
+    chainKey = f'v{TRANSLATION_CACHE_VERSION}'
+    for xlfPath in reversed (xlfPaths):
+        chainKey = hashlib.sha256 (f'{chainKey}:{GetFileHash (xlfPath)}'.encode ('utf-8')).hexdigest ()
+        keys.append (chainKey)
+    return keys
+
+
+def LoadCachedTranslations (cacheFolder: Path, key: str) -> dict[str, str] | None:
+    if key in translationStore:
+        return dict (translationStore[key])
+    cachedFilePath = cacheFolder / f'{key}.json'
+    if not cachedFilePath.exists ():
+        return None
+    try:
+        with open (cachedFilePath, 'r', encoding='utf-8') as f:
+            translations = json.load (f)
+    except (OSError, ValueError):
+        return None
+    translationStore[key] = translations
+    return dict (translations)
+
+
+def StoreCachedTranslations (cacheFolder: Path, key: str, translations: dict[str, str]) -> None:
+    cacheFolder.mkdir (parents=True, exist_ok=True)
+    cachedFilePath = cacheFolder / f'{key}.json'
+    tempFilePath = cacheFolder / f'{key}.{os.getpid ()}.tmp'
+    with open (tempFilePath, 'w', encoding='utf-8') as f:
+        json.dump (translations, f, ensure_ascii=False)
+    os.replace (tempFilePath, cachedFilePath)
+    translationStore[key] = dict (translations)
+
+
+def GetChainedTranslations (xlfPaths: list[Path], cacheFolder: Path | None = None) -> dict[str, str]:
+    """
+    Merges the translations of an XLIFF parent chain. The list starts with the most specific XLIFF file,
+    every following file is the parent of the previous one. Translations of children override their parents.
+    If a cache folder is given, the merged dictionary of every level of the chain is stored there.
+    """
+    assert len (xlfPaths) > 0
+
+    if cacheFolder is None:
+        translations = {}
+        for xlfPath in reversed (xlfPaths):
+            translations = translations | GetTranslations (xlfPath)
+        return translations
+
+    keys = GetTranslationChainKeys (xlfPaths)
+
+    translations = {}
+    firstUncachedLevel = 0
+    for level in range (len (keys) - 1, -1, -1):
+        cachedTranslations = LoadCachedTranslations (cacheFolder, keys[level])
+        if cachedTranslations is not None:
+            translations = cachedTranslations
+            firstUncachedLevel = level + 1
+            break
+
+    rootFirstPaths = list (reversed (xlfPaths))
+    for level in range (firstUncachedLevel, len (keys)):
+        translations = translations | GetTranslations (rootFirstPaths[level])
+        StoreCachedTranslations (cacheFolder, keys[level], translations)
+
+    return translations
+
+
+def GetUnitFingerprints (xlfPath: Path) -> dict[str, str]:
+    """
+    Maps every unit id to the hash of its raw source, target and target state. Unlike the translations, the hash
+    changes with every edit the translator may see, e.g. the source of a translated unit or an unusable target.
+    """
+    result = {}
+
+    xlfRoot = ET.parse (xlfPath).getroot ()
+
+    for transUnit in xlfRoot.findall ('.//trans-unit', XLIFF_NSMAP):
+        transUnitId = transUnit.get ('id')
+        assert transUnitId is not None
+        unitData = []
+        for elemName in ['source', 'target']:
+            elem = transUnit.find (elemName, XLIFF_NSMAP)
+            if elem is not None:
+                elem.tail = None
+            unitData.append (ET.tostring (elem, encoding='unicode') if elem is not None else None)
+        result[transUnitId] = hashlib.sha256 (json.dumps ([transUnitId] + unitData).encode ('utf-8')).hexdigest ()
+
+    return result
+
+
+def GetChainedUnitFingerprints (xlfPaths: list[Path], cacheFolder: Path | None = None) -> dict[str, str]:
+    """
+    Maps every unit id of an XLIFF parent chain to the hash of the raw data of the unit on every level of the chain.
+    If a cache folder is given, the result is stored there for the content of the chain.
+    """
+    assert len (xlfPaths) > 0
+
+    if cacheFolder is not None:
+        key = GetTranslationChainKeys (xlfPaths)[-1] + '.units'
+        cachedFingerprints = LoadCachedTranslations (cacheFolder, key)
+        if cachedFingerprints is not None:
+            return cachedFingerprints
+
+    levelFingerprints = [GetUnitFingerprints (xlfPath) for xlfPath in xlfPaths]
+    unitIds = sorted (set (unitId for fingerprints in levelFingerprints for unitId in fingerprints.keys ()))
+    result = { unitId: hashlib.sha256 (json.dumps ([fingerprints.get (unitId) for fingerprints in levelFingerprints]).encode ('utf-8')).hexdigest () for unitId in unitIds }
+
+    if cacheFolder is not None:
+        StoreCachedTranslations (cacheFolder, key, result)
+    return result
+
+
 def GetMergedTranslations (childXlfPath: Path, parentXlfPath: Path | None) -> dict[str, str]:
-    translations = GetTranslations (childXlfPath)
     if parentXlfPath is None:
-        return translations
-    parentTranslations = GetTranslations (parentXlfPath)
-    return parentTranslations | translations
+        return GetChainedTranslations ([childXlfPath])
+    return GetChainedTranslations ([childXlfPath, parentXlfPath])
 
 
 def TranslateJson (data, translations: dict[str, str]) -> None:
@@ -63,3 +192,39 @@ def TranslateJson (data, translations: dict[str, str]) -> None:
     elif isinstance (data, list):
         for item in data:
             TranslateJson (item, translations)
+
+
+def CollectDictIdLocations (data, location: dict[str, str], result: dict[str, list[dict[str, str]]]) -> None:
+    if isinstance (data, dict):
+        if 'dictId' in data:
+            result.setdefault (data['dictId'], []).append (dict (location))
+
+        for key, value in data.items ():
+            if key == 'controls' and isinstance (value, list):
+                for control in value:
+                    if isinstance (control, dict) and len (control) == 1:
+                        controlType, controlData = next (iter (control.items ()))
+                        controlId = controlData.get ('#id', '') if isinstance (controlData, dict) else ''
+                        CollectDictIdLocations (controlData, location | { 'control': f'{controlType} {controlId}'.strip () }, result)
+                    else:
+                        CollectDictIdLocations (control, location, result)
+            else:
+                CollectDictIdLocations (value, location, result)
+
+    elif isinstance (data, list):
+        for item in data:
+            CollectDictIdLocations (item, location, result)
+
+
+def GetDictIdLocations (jsonData: dict, fileName: str) -> dict[str, list[dict[str, str]]]:
+    """
+    Maps every dictId used in the JSON resource data to the resources (and dialog controls) referencing it.
+    """
+    result = {}
+    for resourceType, resources in jsonData.items ():
+        if not isinstance (resources, list):
+            continue
+        for index, resource in enumerate (resources):
+            resourceId = resource.get ('#id', str (index)) if isinstance (resource, dict) else str (index)
+            CollectDictIdLocations (resource, { 'file': fileName, 'resource': f'{resourceType} {resourceId}' }, result)
+    return result
@@ -1,12 +1,27 @@
+import os
 import platform
 import re
 from pathlib import Path
 
 
-def FillLocalizationMappingTable (devKitPath: Path) -> dict[str, str]:
+# parsed tables by header path, reused while the header is unchanged (e.g. in the resource compile server)
+localizationMappingTables = {}
+
+
+def FillLocalizationMappingTable (devKitPath: Path, system: str | None = None) -> dict[str, str]:
+    system = system or platform.system ()
+    gsLocalizationPath = devKitPath / 'Inc' / 'GSLocalization.h'
+    gsLocalizationStat = os.stat (gsLocalizationPath)
+    tableKey = (str (gsLocalizationPath.absolute ()), gsLocalizationStat.st_mtime_ns, gsLocalizationStat.st_size, system)
+    if tableKey not in localizationMappingTables:
+        localizationMappingTables[tableKey] = ParseLocalizationMappingTable (gsLocalizationPath, system)
+    return dict (localizationMappingTables[tableKey])
+
+
+# the table of the target system, it is the host system unless the resources of an other platform are compiled
+def ParseLocalizationMappingTable (gsLocalizationPath: Path, system: str) -> dict[str, str]:
     # Dynamically generate a mapping table from GSLocalization.h
     pattern = None
-    system = platform.system ()
     if system == 'Windows':
         pattern = r'#define\s+VERSION_APPENDIX\s+"([A-Z]+)"[\s\S]*?#define\s+WIN_LANGCHARSET_STR\s+"([^"]+)"'
     elif system == 'Darwin':
@@ -14,7 +29,6 @@ def FillLocalizationMappingTable (devKitPath: Path) -> dict[str, str]:
 
     assert pattern, 'Platform is not supported'
 
-    gsLocalizationPath = devKitPath / 'Inc' / 'GSLocalization.h'
     with open (gsLocalizationPath, 'r', encoding='utf-8') as f:
         gsLocalizationContent = f.read ()
 
@@ -0,0 +1,297 @@
+import os
+import re
+import sys
+import stat
+import time
+import heapq
+import platform
+import subprocess
+import threading
+import concurrent.futures
+from typing import Callable
+import TraceEvents
+
+
+threadState = threading.local ()
+
+# In-process scripts change the environment of the whole process while they run, no subprocess is started meanwhile.
+environmentLock = threading.RLock ()
+
+
+def IsCollectingOutput () -> bool:
+    return getattr (threadState, 'output', None) is not None
+
+
+def RunProcess (params: list, env: dict[str, str] | None, collectOutput: bool) -> tuple[int, bytes | None]:
+    with environmentLock:
+        process = subprocess.Popen (params, env=env, stdout=subprocess.PIPE if collectOutput else None, stderr=subprocess.STDOUT if collectOutput else None)
+    with process:
+        output, _ = process.communicate ()
+    return (process.returncode, output)
+
+
+def RunCommand (params: list, env: dict[str, str] | None = None, category: str = 'tool') -> int:
+    # Inside parallel jobs the output is collected and printed in job order after the jobs finished.
+    output = getattr (threadState, 'output', None)
+    with TraceEvents.TraceCommand (params, category):
+        result, commandOutput = RunProcess (params, env, output is not None)
+    if output is not None:
+        output.append (commandOutput)
+    return result
+
+
+def RunCommandWithOutput (params: list, env: dict[str, str] | None = None) -> tuple[int, bytes]:
+    with TraceEvents.TraceCommand (params):
+        return RunProcess (params, env, True)
+
+
+def WriteOutput (chunk: bytes) -> None:
+    output = getattr (threadState, 'output', None)
+    if output is not None:
+        output.append (chunk)
+        return
+    sys.stdout.flush ()
+    sys.stdout.buffer.write (chunk)
+    sys.stdout.flush ()
+
+
+class JobServerClient (object):
+    """
+    Client of the GNU make jobserver protocol. Every token read from the jobserver allows one more parallel job,
+    the token has to be written back when the job is finished.
+    """
+
+    def __init__ (self, readFd: int, writeFd: int):
+        self.readFd = readFd
+        self.writeFd = writeFd
+
+    def AcquireToken (self) -> bytes:
+        while True:
+            try:
+                token = os.read (self.readFd, 1)
+            except InterruptedError:
+                continue
+            if len (token) == 1:
+                return token
+
+    def ReleaseToken (self, token: bytes) -> None:
+        os.write (self.writeFd, token)
+
+
+def IsValidFileDescriptor (fd: int) -> bool:
+    try:
+        mode = os.fstat (fd).st_mode
+    except OSError:
+        return False
+    return stat.S_ISFIFO (mode)
+
+
+def GetJobServerClient () -> JobServerClient | None:
+    if platform.system () == 'Windows':
+        return None
+
+    jobServerMatch = re.search (r'--jobserver-(?:auth|fds)=(\S+)', os.environ.get ('MAKEFLAGS', ''))
+    if jobServerMatch is None:
+        return None
+
+    jobServerAuth = jobServerMatch.group (1)
+    if jobServerAuth.startswith ('fifo:'):
+        try:
+            fifoFd = os.open (jobServerAuth[len ('fifo:'):], os.O_RDWR)
+        except OSError:
+            return None
+        return JobServerClient (fifoFd, fifoFd)
+
+    fdMatch = re.fullmatch (r'(\d+),(\d+)', jobServerAuth)
+    if fdMatch is None:
+        return None
+    readFd = int (fdMatch.group (1))
+    writeFd = int (fdMatch.group (2))
+    if not IsValidFileDescriptor (readFd) or not IsValidFileDescriptor (writeFd):
+        return None
+    return JobServerClient (readFd, writeFd)
+
+
+def GetDefaultJobCount () -> int:
+    return os.cpu_count () or 1
+
+
+class JobRunner (object):
+    def __init__ (self, jobCount: int, jobServer: JobServerClient | None = None):
+        self.jobCount = max (1, jobCount)
+        self.jobServer = jobServer
+        self.lock = threading.Lock ()
+        self.implicitSlotInUse = False
+
+    def AcquireSlot (self) -> bytes | None:
+        if self.jobServer is None:
+            return None
+        # the process itself owns one implicit jobserver token
+        with self.lock:
+            if not self.implicitSlotInUse:
+                self.implicitSlotInUse = True
+                return None
+        return self.jobServer.AcquireToken ()
+
+    def ReleaseSlot (self, token: bytes | None) -> None:
+        if self.jobServer is None:
+            return
+        if token is None:
+            with self.lock:
+                self.implicitSlotInUse = False
+        else:
+            self.jobServer.ReleaseToken (token)
+
+    def RunJob (self, job: Callable[[], object]) -> tuple[object, list[bytes], BaseException | None]:
+        output = []
+        token = self.AcquireSlot ()
+        threadState.output = output
+        try:
+            return (job (), output, None)
+        except BaseException as e:
+            return (None, output, e)
+        finally:
+            threadState.output = None
+            self.ReleaseSlot (token)
+
+    def Run (self, jobs: list[Callable[[], object]]) -> list:
+        """
+        Runs the jobs on a bounded thread pool. The results and the collected output are reported in the order
+        of the jobs, and the error of the first failing job (in job order) is raised after every job finished.
+        """
+        if self.jobCount == 1 or len (jobs) <= 1:
+            return [job () for job in jobs]
+
+        with concurrent.futures.ThreadPoolExecutor (max_workers=min (self.jobCount, len (jobs))) as executor:
+            jobResults = list (executor.map (self.RunJob, jobs))
+
+        results = []
+        firstError = None
+        sys.stdout.flush ()
+        for result, output, error in jobResults:
+            for chunk in output:
+                sys.stdout.buffer.write (chunk)
+            if error is not None and firstError is None:
+                firstError = error
+            results.append (result)
+        sys.stdout.flush ()
+
+        if firstError is not None:
+            raise firstError
+        return results
+
+
+class Task (object):
+    def __init__ (self, index: int, name: str, action: Callable[[], object], dependencies: list['Task']):
+        self.index = index
+        self.name = name
+        self.action = action
+        self.dependencies = dependencies
+        self.dependents = []
+        self.startTime = None
+        self.endTime = None
+
+    def Execute (self) -> object:
+        self.startTime = time.perf_counter ()
+        try:
+            with TraceEvents.TraceSpan (self.name, 'task'):
+                return self.action ()
+        finally:
+            self.endTime = time.perf_counter ()
+
+    def GetDuration (self) -> float:
+        if self.startTime is None or self.endTime is None:
+            return 0.0
+        return self.endTime - self.startTime
+
+
+class TaskGraph (object):
+    """
+    Dependency graph of build tasks. Tasks are executed as soon as all of their dependencies finished,
+    the number of concurrently running tasks is limited by the job runner.
+    """
+
+    def __init__ (self):
+        self.tasks = []
+
+    def AddTask (self, name: str, action: Callable[[], object], dependencies: list[Task] = []) -> Task:
+        task = Task (len (self.tasks), name, action, list (dependencies))
+        for dependency in task.dependencies:
+            dependency.dependents.append (task)
+        self.tasks.append (task)
+        return task
+
+    def Run (self, jobRunner: JobRunner) -> None:
+        # tasks can only depend on earlier tasks, so the insertion order is a valid sequential order
+        if jobRunner.jobCount == 1:
+            for task in self.tasks:
+                task.Execute ()
+            return
+
+        remainingDependencyCounts = { task.index: len (task.dependencies) for task in self.tasks }
+        readyTasks = [task.index for task in self.tasks if len (task.dependencies) == 0]
+        heapq.heapify (readyTasks)
+        taskOutputs = {}
+        failedTasks = []
+
+        with concurrent.futures.ThreadPoolExecutor (max_workers=jobRunner.jobCount) as executor:
+            runningTasks = {}
+            while readyTasks or runningTasks:
+                while readyTasks and not failedTasks:
+                    task = self.tasks[heapq.heappop (readyTasks)]
+                    runningTasks[executor.submit (jobRunner.RunJob, task.Execute)] = task
+                if not runningTasks:
+                    break
+
+                finishedFutures, _ = concurrent.futures.wait (runningTasks, return_when=concurrent.futures.FIRST_COMPLETED)
+                for future in finishedFutures:
+                    task = runningTasks.pop (future)
+                    _, output, error = future.result ()
+                    taskOutputs[task.index] = output
+                    if error is not None:
+                        failedTasks.append ((task.index, error))
+                        continue
+                    for dependent in task.dependents:
+                        remainingDependencyCounts[dependent.index] -= 1
+                        if remainingDependencyCounts[dependent.index] == 0:
+                            heapq.heappush (readyTasks, dependent.index)
+
+        sys.stdout.flush ()
+        for taskIndex in sorted (taskOutputs.keys ()):
+            for chunk in taskOutputs[taskIndex]:
+                sys.stdout.buffer.write (chunk)
+        sys.stdout.flush ()
+
+        if failedTasks:
+            raise min (failedTasks, key=lambda failedTask: failedTask[0])[1]
+
+    def GetCriticalPath (self) -> list[Task]:
+        finishedTasks = [task for task in self.tasks if task.endTime is not None]
+        if not finishedTasks:
+            return []
+
+        criticalPath = [max (finishedTasks, key=lambda task: task.endTime)]
+        while True:
+            finishedDependencies = [dependency for dependency in criticalPath[-1].dependencies if dependency.endTime is not None]
+            if not finishedDependencies:
+                break
+            criticalPath.append (max (finishedDependencies, key=lambda dependency: dependency.endTime))
+        criticalPath.reverse ()
+        return criticalPath
+
+    def PrintCriticalPath (self) -> None:
+        criticalPath = self.GetCriticalPath ()
+        if not criticalPath:
+            return
+        totalTime = criticalPath[-1].endTime - min (task.startTime for task in self.tasks if task.startTime is not None)
+        print (f'Critical path ({totalTime:.3f} s):')
+        for task in criticalPath:
+            print (f'  {task.GetDuration ():8.3f} s  {task.name}')
+
+
+def CreateJobRunner (jobCount: int | None) -> JobRunner:
+    """Create and return the job runner, an explicit job count overrides the jobserver of the calling make."""
+    if jobCount is not None:
+        return JobRunner (jobCount)
+    jobServer = GetJobServerClient ()
+    return JobRunner (GetDefaultJobCount (), jobServer)
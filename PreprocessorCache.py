@@ -0,0 +1,160 @@
+import os
+import re
+import json
+import shutil
+import locale
+from pathlib import Path
+import ResourceCache
+import ParallelJobs
+
+
+DEPENDENCY_STYLE_DEPFILE = 'depfile'
+DEPENDENCY_STYLE_SHOW_INCLUDES = 'showIncludes'
+
+MANIFEST_VERSION = 1
+SHOW_INCLUDES_PREFIX = 'Note: including file:'
+
+
+def GetManifestPath (outputFilePath: Path) -> Path:
+    return outputFilePath.with_name (outputFilePath.name + '.manifest')
+
+
+def GetDepFilePath (outputFilePath: Path) -> Path:
+    return outputFilePath.with_name (outputFilePath.name + '.d')
+
+
+def GetFileStamp (filePath: Path) -> list[int] | None:
+    try:
+        fileStat = os.stat (filePath)
+    except OSError:
+        return None
+    return [fileStat.st_mtime_ns, fileStat.st_size]
+
+
+def GetCommandKey (params: list) -> str:
+    compilerPath = shutil.which (str (params[0]))
+    return ResourceCache.GetFingerprint ([MANIFEST_VERSION, compilerPath, GetFileStamp (compilerPath) if compilerPath else None] + [str (param) for param in params])
+
+
+def ParseDepFile (depFilePath: Path) -> list[Path]:
+    with open (depFilePath, 'r', encoding='utf-8', errors='surrogateescape') as f:
+        content = f.read ()
+    content = re.sub (r'\\\r?\n', ' ', content)
+    # the target is separated by the first colon that is followed by whitespace, drive letters are not
+    dependencies = re.split (r':(?:\s|$)', content, maxsplit=1)[-1]
+    return [Path (token.replace ('\\ ', ' ').replace ('\\#', '#').replace ('$$', '$')) for token in re.findall (r'(?:\\ |\S)+', dependencies)]
+
+
+def EscapeDepFilePath (filePath: Path) -> str:
+    return Path (filePath).absolute ().as_posix ().replace ('$', '$$').replace ('#', '\\#').replace (' ', '\\ ')
+
+
+def WriteDepFile (depFilePath: Path, targetPath: Path, dependencies: list[Path]) -> None:
+    lines = [EscapeDepFilePath (targetPath) + ':'] + [EscapeDepFilePath (dependency) for dependency in dependencies]
+    ResourceCache.WriteFileAtomic (depFilePath, ' \\\n  '.join (lines) + '\n')
+
+
+def ParseShowIncludesOutput (output: bytes) -> tuple[list[Path], bytes]:
+    dependencies = []
+    remainingLines = []
+    for line in output.splitlines (keepends=True):
+        text = line.decode (locale.getpreferredencoding (False), errors='replace')
+        if text.startswith (SHOW_INCLUDES_PREFIX):
+            dependencies.append (Path (text[len (SHOW_INCLUDES_PREFIX):].strip ()))
+        else:
+            remainingLines.append (line)
+    return (dependencies, b''.join (remainingLines))
+
+
+def GetInputEntry (filePath: Path) -> list:
+    return GetFileStamp (filePath) + [ResourceCache.GetFileHash (filePath)]
+
+
+def LoadManifest (manifestPath: Path) -> dict | None:
+    try:
+        with open (manifestPath, 'r', encoding='utf-8') as f:
+            return json.load (f)
+    except (OSError, ValueError):
+        return None
+
+
+def WriteManifest (manifestPath: Path, commandKey: str, dependencies: list[Path], outputFilePath: Path) -> None:
+    manifest = {
+        'command': commandKey,
+        'inputs': { str (Path (dependency).absolute ()): GetInputEntry (dependency) for dependency in dependencies },
+        'output': GetInputEntry (outputFilePath),
+    }
+    ResourceCache.WriteFileAtomic (manifestPath, json.dumps (manifest, indent=1))
+
+
+def IsInputUpToDate (filePath: str, entry: list) -> bool:
+    stamp = GetFileStamp (filePath)
+    if stamp is None:
+        return False
+    if stamp == entry[:2]:
+        return True
+    if ResourceCache.GetFileHash (filePath) != entry[2]:
+        return False
+    # the content is the same, only the timestamp is refreshed to spare the hashing next time
+    entry[:2] = stamp
+    return True
+
+
+def IsOutputUpToDate (manifestPath: Path, commandKey: str, outputFilePath: Path) -> bool:
+    manifest = LoadManifest (manifestPath)
+    if manifest is None or manifest.get ('command') != commandKey:
+        return False
+
+    savedManifest = json.dumps (manifest, indent=1)
+    if not IsInputUpToDate (outputFilePath, manifest['output']):
+        return False
+    for filePath, entry in manifest['inputs'].items ():
+        if not IsInputUpToDate (filePath, entry):
+            return False
+
+    if json.dumps (manifest, indent=1) != savedManifest:
+        ResourceCache.WriteFileAtomic (manifestPath, json.dumps (manifest, indent=1))
+    return True
+
+
+def GetDependencies (outputFilePath: Path) -> list[Path]:
+    manifest = LoadManifest (GetManifestPath (outputFilePath))
+    if manifest is None:
+        return []
+    return [Path (filePath) for filePath in manifest['inputs'].keys ()]
+
+
+def RunCachedPreprocessor (params: list, dependencyStyle: str, sourceFilePath: Path, outputFilePath: Path) -> int:
+    """
+    Runs the preprocessor command unless the output is up to date. The included headers are recorded
+    in a manifest next to the output together with the hashes of every input.
+    """
+    manifestPath = GetManifestPath (outputFilePath)
+    commandKey = GetCommandKey (params)
+    if IsOutputUpToDate (manifestPath, commandKey, outputFilePath):
+        return 0
+
+    if manifestPath.exists ():
+        manifestPath.unlink ()
+
+    if dependencyStyle == DEPENDENCY_STYLE_DEPFILE:
+        depFilePath = GetDepFilePath (outputFilePath)
+        result = ParallelJobs.RunCommand (params + ['-MD', '-MF', depFilePath])
+        if result != 0:
+            return result
+        dependencies = ParseDepFile (depFilePath)
+    elif dependencyStyle == DEPENDENCY_STYLE_SHOW_INCLUDES:
+        # the include notes are localized by Visual Studio, English output is requested
+        env = os.environ.copy ()
+        env['VSLANG'] = '1033'
+        result, output = ParallelJobs.RunCommandWithOutput (params + ['/showIncludes'], env)
+        dependencies, remainingOutput = ParseShowIncludesOutput (output)
+        ParallelJobs.WriteOutput (remainingOutput)
+        if result != 0:
+            return result
+        dependencies = [sourceFilePath] + dependencies
+    else:
+        assert False, f'Unknown dependency style: {dependencyStyle}'
+
+    WriteManifest (manifestPath, commandKey, dependencies, outputFilePath)
+    return 0
@@ -0,0 +1,209 @@
+import hashlib
+import json
+import os
+import shutil
+import platform
+import threading
+from pathlib import Path
+
+
+def GetFileHash (filePath: Path) -> str:
+    fileHash = hashlib.sha256 ()
+    with open (filePath, 'rb') as f:
+        for chunk in iter (lambda: f.read (1024 * 1024), b''):
+            fileHash.update (chunk)
+    return fileHash.hexdigest ()
+
+
+def GetFileStamp (filePath: Path) -> list[int]:
+    fileStat = os.stat (filePath)
+    return [fileStat.st_mtime_ns, fileStat.st_size]
+
+
+def GetFingerprint (items: list) -> str:
+    fingerprint = hashlib.sha256 ()
+    for item in items:
+        fingerprint.update (str (item).encode ('utf-8'))
+        fingerprint.update (b'\0')
+    return fingerprint.hexdigest ()
+
+
+def GetFolderHash (folderPath: Path, pattern: str = '*') -> str:
+    items = []
+    for filePath in sorted (folderPath.rglob (pattern)):
+        if filePath.is_file ():
+            items.extend ([filePath.relative_to (folderPath).as_posix (), GetFileHash (filePath)])
+    return GetFingerprint (items)
+
+
+def GetTreeHash (folderPath: Path, stateFilePath: Path) -> str:
+    """
+    Merkle hash of the folder tree, the hash of a folder is the hash of the names and the hashes of its items.
+    Only the files with a changed stamp are hashed again, the file hashes of the previous call are kept in the state file.
+    """
+    previousFileHashes = {}
+    if stateFilePath.exists ():
+        try:
+            with open (stateFilePath, 'r', encoding='utf-8') as f:
+                previousFileHashes = json.load (f)
+        except (OSError, ValueError):
+            previousFileHashes = {}
+    fileHashes = {}
+
+    def GetItemHash (itemPath: Path) -> str:
+        if itemPath.is_dir ():
+            childItems = []
+            for childPath in sorted (itemPath.iterdir (), key=lambda childPath: childPath.name):
+                if childPath.is_dir () or childPath.is_file ():
+                    childItems.extend ([childPath.name, GetItemHash (childPath)])
+            return GetFingerprint (['folder'] + childItems)
+        relativePath = itemPath.relative_to (folderPath).as_posix ()
+        stamp = GetFileStamp (itemPath)
+        previousFileHash = previousFileHashes.get (relativePath)
+        if previousFileHash is not None and previousFileHash[0] == stamp:
+            fileHashes[relativePath] = previousFileHash
+        else:
+            fileHashes[relativePath] = [stamp, GetFileHash (itemPath)]
+        return fileHashes[relativePath][1]
+
+    treeHash = GetItemHash (folderPath)
+    if fileHashes != previousFileHashes:
+        WriteFileAtomic (stateFilePath, json.dumps (fileHashes))
+    return treeHash
+
+
+def GetTempFilePath (filePath: Path) -> Path:
+    return filePath.with_name (f'{filePath.name}.{os.getpid ()}.{threading.get_ident ()}.tmp')
+
+
+def CopyFileAtomic (sourceFilePath: Path, targetFilePath: Path) -> None:
+    targetFilePath.parent.mkdir (parents=True, exist_ok=True)
+    tempFilePath = GetTempFilePath (targetFilePath)
+    shutil.copyfile (sourceFilePath, tempFilePath)
+    os.replace (tempFilePath, targetFilePath)
+
+
+def WriteFileAtomic (filePath: Path, content: str) -> None:
+    filePath.parent.mkdir (parents=True, exist_ok=True)
+    tempFilePath = GetTempFilePath (filePath)
+    with open (tempFilePath, 'w', encoding='utf-8') as f:
+        f.write (content)
+    os.replace (tempFilePath, filePath)
+
+
+def IsFingerprintUpToDate (fingerprintFilePath: Path, fingerprint: str) -> bool:
+    if not fingerprintFilePath.exists ():
+        return False
+    with open (fingerprintFilePath, 'r', encoding='utf-8') as f:
+        return f.read ().strip () == fingerprint
+
+
+def WriteFingerprint (fingerprintFilePath: Path, fingerprint: str) -> None:
+    WriteFileAtomic (fingerprintFilePath, fingerprint)
+
+
+class FileLock (object):
+    """
+    Exclusive lock shared between processes through a lock file. The operating system releases the lock
+    when the process exits, so a crashed build does not leave a stale lock behind.
+    """
+
+    def __init__ (self, lockFilePath: Path):
+        self.lockFilePath = lockFilePath
+        self.lockFile = None
+
+    def Acquire (self) -> None:
+        self.lockFilePath.parent.mkdir (parents=True, exist_ok=True)
+        self.lockFile = open (self.lockFilePath, 'a+b')
+        if platform.system () == 'Windows':
+            import msvcrt
+            # the blocking mode of msvcrt gives up after some seconds
+            while True:
+                try:
+                    self.lockFile.seek (0)
+                    msvcrt.locking (self.lockFile.fileno (), msvcrt.LK_LOCK, 1)
+                    return
+                except OSError:
+                    continue
+        else:
+            import fcntl
+            fcntl.flock (self.lockFile.fileno (), fcntl.LOCK_EX)
+
+    def Release (self) -> None:
+        if self.lockFile is None:
+            return
+        if platform.system () == 'Windows':
+            import msvcrt
+            self.lockFile.seek (0)
+            msvcrt.locking (self.lockFile.fileno (), msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+            fcntl.flock (self.lockFile.fileno (), fcntl.LOCK_UN)
+        self.lockFile.close ()
+        self.lockFile = None
+
+    def __enter__ (self) -> 'FileLock':
+        self.Acquire ()
+        return self
+
+    def __exit__ (self, excType, excValue, traceback) -> None:
+        self.Release ()
+
+
+def GetCacheEntryPath (cacheFolder: Path, key: str) -> Path:
+    return cacheFolder / key[:2] / key
+
+
+def GetStagingFolderPath (entryPath: Path) -> Path:
+    stagingFolderPath = GetTempFilePath (entryPath)
+    stagingFolderPath.mkdir (parents=True, exist_ok=True)
+    return stagingFolderPath
+
+
+def StoreCacheEntry (stagingFolderPath: Path, entryPath: Path) -> None:
+    # the entry becomes visible at once, if another build stored the same entry in the meantime its content is kept
+    try:
+        os.rename (stagingFolderPath, entryPath)
+    except OSError:
+        shutil.rmtree (stagingFolderPath, ignore_errors=True)
+
+
+def RestoreCacheEntry (entryPath: Path, targetFolderPath: Path) -> list[Path]:
+    restoredFilePaths = []
+    for filePath in sorted (entryPath.rglob ('*')):
+        if filePath.is_file ():
+            targetFilePath = targetFolderPath / filePath.relative_to (entryPath)
+            CopyFileAtomic (filePath, targetFilePath)
+            restoredFilePaths.append (targetFilePath)
+    return restoredFilePaths
+
+
+# the files may refer to each other by absolute paths, the source folder in them is replaced with the target folder
+def RelocateFolder (sourceFolderPath: Path, targetFolderPath: Path) -> list[Path]:
+    replacements = [(str (sourceFolderPath.absolute ()).encode (encoding), str (targetFolderPath.absolute ()).encode (encoding)) for encoding in ['utf-8', 'utf-16-le']]
+    relocatedFilePaths = []
+    for filePath in sorted (sourceFolderPath.rglob ('*')):
+        if filePath.is_file ():
+            with open (filePath, 'rb') as f:
+                content = f.read ()
+            for sourceText, targetText in replacements:
+                content = content.replace (sourceText, targetText)
+            targetFilePath = targetFolderPath / filePath.relative_to (sourceFolderPath)
+            targetFilePath.parent.mkdir (parents=True, exist_ok=True)
+            tempFilePath = GetTempFilePath (targetFilePath)
+            with open (tempFilePath, 'wb') as f:
+                f.write (content)
+            os.replace (tempFilePath, targetFilePath)
+            relocatedFilePaths.append (targetFilePath)
+    return relocatedFilePaths
+
+
+def FolderContainsText (folderPath: Path, texts: list[str]) -> bool:
+    patterns = [text.encode (encoding) for text in texts for encoding in ['utf-8', 'utf-16-le']]
+    for filePath in folderPath.rglob ('*'):
+        if filePath.is_file ():
+            with open (filePath, 'rb') as f:
+                content = f.read ()
+            if any (pattern in content for pattern in patterns):
+                return True
+    return False
@@ -0,0 +1,410 @@
+import os
+import sys
+import json
+import stat
+import time
+import getpass
+import hashlib
+import platform
+import argparse
+import tempfile
+import threading
+import traceback
+import subprocess
+import multiprocessing.connection
+from pathlib import Path
+
+
+PROTOCOL_VERSION = 1
+DEFAULT_IDLE_TIMEOUT = 900
+SERVER_START_TIMEOUT = 30
+
+
+def GetToolsFolder () -> Path:
+    return Path (__file__).absolute ().parent
+
+
+def GetServerFolder () -> Path:
+    if platform.system () == 'Windows':
+        baseFolder = Path (os.environ.get ('LOCALAPPDATA', tempfile.gettempdir ()))
+    else:
+        # the runtime folder is private to the user, the temp folder is shared with the other users
+        baseFolder = Path (os.environ.get ('XDG_RUNTIME_DIR') or tempfile.gettempdir ())
+    return PrepareServerFolder (baseFolder / f'ArchicadResourceCompiler-{getpass.getuser ()}')
+
+
+def PrepareServerFolder (serverFolder: Path) -> Path:
+    serverFolder.mkdir (mode=0o700, exist_ok=True)
+    if platform.system () == 'Windows':
+        return serverFolder
+    # the folder may have been created by another user to read or replace the key of the server
+    folderStat = os.lstat (serverFolder)
+    if not stat.S_ISDIR (folderStat.st_mode):
+        raise RuntimeError (f'Resource compile server folder is not a directory: {serverFolder}')
+    if folderStat.st_uid != os.getuid ():
+        raise RuntimeError (f'Resource compile server folder is owned by another user: {serverFolder}')
+    if stat.S_IMODE (folderStat.st_mode) != 0o700:
+        raise RuntimeError (f'Resource compile server folder must only be accessible by its owner (mode 0700): {serverFolder}')
+    return serverFolder
+
+
+def GetServerId () -> str:
+    # a server only serves clients of the same interpreter and the same version of the tools
+    serverId = hashlib.sha256 (sys.executable.encode ('utf-8'))
+    toolsFolder = GetToolsFolder ()
+    for sourceFile in sorted (list (toolsFolder.glob ('*.py')) + list ((toolsFolder / 'JsonToGrcConverter').glob ('*.py'))):
+        sourceStat = os.stat (sourceFile)
+        serverId.update (f'{sourceFile}:{sourceStat.st_mtime_ns}:{sourceStat.st_size}\0'.encode ('utf-8'))
+    return serverId.hexdigest ()[:16]
+
+
+def GetServerAddress (serverFolder: Path, serverId: str) -> tuple[str, str]:
+    if platform.system () == 'Windows':
+        return (f'\\\\.\\pipe\\ArchicadResourceCompiler-{getpass.getuser ()}-{serverId}', 'AF_PIPE')
+    return (str (serverFolder / f'{serverId}.sock'), 'AF_UNIX')
+
+
+def GetAuthKey (serverFolder: Path) -> bytes:
+    authKeyPath = serverFolder / 'authkey'
+    try:
+        authKeyFd = os.open (authKeyPath, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    except FileExistsError:
+        pass
+    else:
+        with os.fdopen (authKeyFd, 'wb') as f:
+            f.write (os.urandom (32))
+
+    # the key may still be written by a concurrently starting client
+    for _ in range (100):
+        with open (authKeyPath, 'rb') as f:
+            authKey = f.read ()
+        if len (authKey) == 32:
+            return authKey
+        time.sleep (0.01)
+    raise RuntimeError (f'Invalid resource compile server key: {authKeyPath}')
+
+
+def SendMessage (connection: multiprocessing.connection.Connection, message: dict) -> None:
+    connection.send_bytes (json.dumps (message).encode ('utf-8'))
+
+
+def ReceiveMessage (connection: multiprocessing.connection.Connection) -> dict:
+    return json.loads (connection.recv_bytes ().decode ('utf-8'))
+
+
+def GetExitCode (exitCode: object) -> int:
+    if exitCode is None:
+        return 0
+    if isinstance (exitCode, int):
+        return exitCode
+    print (exitCode, file=sys.stderr)
+    return 1
+
+
+def RunCompileResources (arguments: list[str], cwd: str, env: dict[str, str]) -> int:
+    import CompileResources
+
+    savedArgv = sys.argv
+    savedEnviron = dict (os.environ)
+    savedCwd = os.getcwd ()
+    sys.argv = [CompileResources.__file__] + arguments
+    os.environ.clear ()
+    os.environ.update (env)
+    # the jobserver file descriptors of the calling make belong to the client process
+    os.environ.pop ('MAKEFLAGS', None)
+    os.chdir (cwd)
+    try:
+        return GetExitCode (CompileResources.Main (sys.argv))
+    except SystemExit as e:
+        return GetExitCode (e.code)
+    except Exception:
+        traceback.print_exc ()
+        return 1
+    finally:
+        sys.argv = savedArgv
+        os.environ.clear ()
+        os.environ.update (savedEnviron)
+        os.chdir (savedCwd)
+
+
+def HandleCompileRequest (request: dict) -> dict:
+    # the output of the resource compiler and of the tools it starts is collected at the file descriptor level
+    with tempfile.TemporaryFile () as outputFile:
+        sys.stdout.flush ()
+        sys.stderr.flush ()
+        savedStdoutFd = os.dup (1)
+        savedStderrFd = os.dup (2)
+        os.dup2 (outputFile.fileno (), 1)
+        os.dup2 (outputFile.fileno (), 2)
+        try:
+            exitCode = RunCompileResources (request['arguments'], request['cwd'], request['env'])
+        finally:
+            sys.stdout.flush ()
+            sys.stderr.flush ()
+            os.dup2 (savedStdoutFd, 1)
+            os.dup2 (savedStderrFd, 2)
+            os.close (savedStdoutFd)
+            os.close (savedStderrFd)
+        outputFile.seek (0)
+        output = outputFile.read ()
+
+    return { 'exitCode': exitCode, 'output': output.decode ('utf-8', errors='replace') }
+
+
+def RunWorker (connection: multiprocessing.connection.Connection) -> None:
+    # warm up the imports of the resource compiler before the first request
+    import CompileResources
+    from JsonToGrcConverter import JsonToGrcConverter
+    JsonToGrcConverter.EnableConvertedFragmentCache ()
+
+    # the worker exits when the server closes the connection, also when the server process exits
+    while True:
+        try:
+            request = connection.recv ()
+        except (OSError, EOFError):
+            return
+        connection.send (HandleCompileRequest (request))
+
+
+class CompileWorker (object):
+    """
+    Worker process of the server. A request changes the process wide state (working directory, environment,
+    file descriptors of the output), so every worker runs one request at a time and keeps its loaded state between requests.
+    """
+
+    def __init__ (self):
+        context = multiprocessing.get_context ('spawn')
+        self.connection, workerConnection = context.Pipe ()
+        self.process = context.Process (target=RunWorker, args=(workerConnection,), daemon=True)
+        self.process.start ()
+        workerConnection.close ()
+
+    def Compile (self, request: dict) -> dict:
+        self.connection.send (request)
+        return self.connection.recv ()
+
+    def Close (self) -> None:
+        self.connection.close ()
+
+
+class ResourceCompileServer (object):
+    """
+    Runs CompileResources requests in a long running process, so the interpreter startup, the imports and
+    the tables parsed from the Development Kit are paid only once. Every connection is handled on its own thread,
+    the compilations run in parallel on a pool of worker processes (at most one per CPU by default).
+    """
+
+    def __init__ (self, address: str, family: str, authKey: bytes, idleTimeout: float, maxWorkers: int | None = None):
+        self.address = address
+        self.family = family
+        self.authKey = authKey
+        self.idleTimeout = idleTimeout
+        self.maxWorkers = maxWorkers or os.cpu_count () or 1
+        self.lock = threading.Lock ()
+        self.workerAvailable = threading.Condition (self.lock)
+        self.idleWorkers = []
+        self.workerCount = 0
+        self.activeConnections = 0
+        self.lastActivity = time.monotonic ()
+
+    def IsRunning (self) -> bool:
+        try:
+            connection = multiprocessing.connection.Client (self.address, self.family, authkey=self.authKey)
+        except (OSError, multiprocessing.AuthenticationError):
+            return False
+        with connection:
+            SendMessage (connection, { 'version': PROTOCOL_VERSION, 'command': 'ping' })
+            ReceiveMessage (connection)
+        return True
+
+    def RemoveAddress (self) -> None:
+        if self.family == 'AF_UNIX':
+            try:
+                os.unlink (self.address)
+            except OSError:
+                pass
+
+    def Exit (self) -> None:
+        self.RemoveAddress ()
+        os._exit (0)
+
+    def WatchIdleTime (self) -> None:
+        while True:
+            time.sleep (1.0)
+            with self.lock:
+                if self.activeConnections == 0 and time.monotonic () - self.lastActivity > self.idleTimeout:
+                    self.Exit ()
+
+    def AcquireWorker (self) -> CompileWorker:
+        with self.lock:
+            while len (self.idleWorkers) == 0 and self.workerCount >= self.maxWorkers:
+                self.workerAvailable.wait ()
+            if len (self.idleWorkers) > 0:
+                return self.idleWorkers.pop ()
+            self.workerCount += 1
+        try:
+            return CompileWorker ()
+        except Exception:
+            self.ReleaseWorker (None)
+            raise
+
+    def ReleaseWorker (self, worker: CompileWorker | None) -> None:
+        # a worker that failed is dropped, a new one is started for a later request
+        with self.lock:
+            if worker is not None:
+                self.idleWorkers.append (worker)
+            else:
+                self.workerCount -= 1
+            self.workerAvailable.notify ()
+
+    def Serve (self) -> int:
+        if self.IsRunning ():
+            return 0
+        if self.family == 'AF_UNIX' and os.path.exists (self.address):
+            # left behind by a server that did not exit cleanly
+            os.unlink (self.address)
+
+        try:
+            listener = multiprocessing.connection.Listener (self.address, self.family, authkey=self.authKey)
+        except OSError:
+            # another server was started at the same time
+            return 0
+
+        # the first worker is started before the first request
+        self.ReleaseWorker (self.AcquireWorker ())
+
+        threading.Thread (target=self.WatchIdleTime, daemon=True).start ()
+        while True:
+            try:
+                connection = listener.accept ()
+            except (OSError, EOFError, multiprocessing.AuthenticationError):
+                continue
+            with self.lock:
+                self.activeConnections += 1
+            threading.Thread (target=self.HandleConnection, args=(connection,), daemon=True).start ()
+
+    def HandleConnection (self, connection: multiprocessing.connection.Connection) -> None:
+        request = {}
+        with connection:
+            try:
+                request = ReceiveMessage (connection)
+                response = self.HandleRequest (request)
+                if request.get ('command') == 'shutdown':
+                    # the client may remove the server folder as soon as it gets the response
+                    self.RemoveAddress ()
+                SendMessage (connection, response)
+            except (OSError, EOFError, ValueError):
+                pass
+            finally:
+                with self.lock:
+                    self.activeConnections -= 1
+                    self.lastActivity = time.monotonic ()
+        if request.get ('command') == 'shutdown':
+            self.Exit ()
+
+    def HandleRequest (self, request: dict) -> dict:
+        if request.get ('version') != PROTOCOL_VERSION:
+            return { 'exitCode': 1, 'output': f'Unsupported resource compile server protocol version: {request.get ("version")}\n' }
+        command = request.get ('command')
+        if command in ['ping', 'shutdown']:
+            return { 'exitCode': 0, 'output': '' }
+        if command != 'compile':
+            return { 'exitCode': 1, 'output': f'Unknown resource compile server command: {command}\n' }
+
+        worker = self.AcquireWorker ()
+        try:
+            response = worker.Compile (request)
+        except (OSError, EOFError):
+            worker.Close ()
+            self.ReleaseWorker (None)
+            return { 'exitCode': 1, 'output': 'The resource compile server worker exited unexpectedly.\n' }
+        self.ReleaseWorker (worker)
+        return response
+
+
+def StartServer (serverFolder: Path, idleTimeout: float) -> None:
+    command = [sys.executable, str (Path (__file__).absolute ()), 'serve', '--serverFolder', str (serverFolder), '--idleTimeout', str (idleTimeout)]
+    # the server must not keep the pipes of the build tool open, otherwise the build would wait for it
+    if platform.system () == 'Windows':
+        creationFlags = subprocess.DETACHED_PROCESS | subprocess.CREATE_NEW_PROCESS_GROUP
+        subprocess.Popen (command, cwd=GetToolsFolder (), stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, creationflags=creationFlags)
+    else:
+        subprocess.Popen (command, cwd=GetToolsFolder (), stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, start_new_session=True)
+
+
+def ConnectToServer (serverFolder: Path, startServer: bool, idleTimeout: float) -> multiprocessing.connection.Connection | None:
+    address, family = GetServerAddress (serverFolder, GetServerId ())
+    authKey = GetAuthKey (serverFolder)
+    try:
+        return multiprocessing.connection.Client (address, family, authkey=authKey)
+    except (OSError, multiprocessing.AuthenticationError):
+        if not startServer:
+            return None
+
+    StartServer (serverFolder, idleTimeout)
+    startTime = time.monotonic ()
+    while time.monotonic () - startTime < SERVER_START_TIMEOUT:
+        try:
+            return multiprocessing.connection.Client (address, family, authkey=authKey)
+        except (OSError, multiprocessing.AuthenticationError):
+            time.sleep (0.05)
+    return None
+
+
+def RunClient (arguments: list[str], serverFolder: Path, idleTimeout: float = DEFAULT_IDLE_TIMEOUT) -> int:
+    connection = ConnectToServer (serverFolder, True, idleTimeout)
+    if connection is None:
+        print ('Resource compile server is not available, compiling resources in a separate process.')
+        return subprocess.call ([sys.executable, str (GetToolsFolder () / 'CompileResources.py')] + arguments)
+
+    with connection:
+        SendMessage (connection, {
+            'version': PROTOCOL_VERSION,
+            'command': 'compile',
+            'arguments': arguments,
+            'cwd': os.getcwd (),
+            'env': dict (os.environ),
+        })
+        response = ReceiveMessage (connection)
+
+    sys.stdout.flush ()
+    sys.stdout.buffer.write (response['output'].encode ('utf-8'))
+    sys.stdout.flush ()
+    return response['exitCode']
+
+
+def StopServer (serverFolder: Path) -> int:
+    connection = ConnectToServer (serverFolder, False, DEFAULT_IDLE_TIMEOUT)
+    if connection is None:
+        return 0
+    with connection:
+        SendMessage (connection, { 'version': PROTOCOL_VERSION, 'command': 'shutdown' })
+        try:
+            ReceiveMessage (connection)
+        except (OSError, EOFError):
+            pass
+    return 0
+
+
+def Main (argv: list[str]) -> int:
+    # everything after the compile command is passed to CompileResources unchanged
+    if len (argv) > 1 and argv[1] == 'compile':
+        return RunClient (argv[2:], GetServerFolder ())
+
+    parser = argparse.ArgumentParser (description = 'Archicad Add-On Resource Compile Server.')
+    parser.add_argument ('command', choices = ['serve', 'stop'], help = 'Start the server or stop the running server. Use "compile <CompileResources arguments>" to compile resources through the server.')
+    parser.add_argument ('--serverFolder', help = 'Folder of the server address and key.', default = None)
+    parser.add_argument ('--idleTimeout', type = float, help = 'Seconds without requests after the server exits.', default = DEFAULT_IDLE_TIMEOUT)
+    args = parser.parse_args (argv[1:])
+
+    serverFolder = PrepareServerFolder (Path (args.serverFolder)) if args.serverFolder else GetServerFolder ()
+    if args.command == 'stop':
+        return StopServer (serverFolder)
+
+    sys.path.insert (0, str (GetToolsFolder ()))
+    address, family = GetServerAddress (serverFolder, GetServerId ())
+    return ResourceCompileServer (address, family, GetAuthKey (serverFolder), args.idleTimeout).Serve ()
+
+
+if __name__ == '__main__':
+    sys.exit (Main (sys.argv))
@@ -0,0 +1,96 @@
+"""
+Scans GRC files for the resource build. Every scan reads the whole file on purpose: the content hash needs every
+byte, and the resource declarations and library markers may appear anywhere in the file, like the Mac build
+expects them. A scan stopping early would still have to read the rest of the file for the hash.
+"""
+import os
+import re
+import json
+import hashlib
+import threading
+from pathlib import Path
+import ResourceCache
+
+
+RESOURCE_MANIFEST_VERSION = 2
+GRC_KIND_NORMAL = 'normal'
+GRC_KIND_LIBRARY = 'library'
+
+resourceDeclarationRegex = re.compile (r"'([A-Za-z0-9]{4})'\s+(\d+)")
+
+
+def ScanGRCFile (grcFilePath: Path) -> dict:
+    """
+    Read the GRC file once and return its kind, the resource IDs declared in it and the hash of its content.
+    The library markers and the resource declarations are searched anywhere in the content.
+    """
+    with open (grcFilePath, 'rb') as f:
+        content = f.read ()
+    text = content.decode ('utf-8', errors='ignore')
+    return {
+        'kind': GRC_KIND_LIBRARY if 'FILE' in text and '.gsm' in text else GRC_KIND_NORMAL,
+        'resourceIds': [[match.group (1), match.group (2)] for match in resourceDeclarationRegex.finditer (text)],
+        'hash': hashlib.sha256 (content).hexdigest (),
+    }
+
+
+class ResourceManifest (object):
+    """
+    Kind, declared resource IDs and content hash of GRC files. Every file is scanned only once, the entries
+    are reused as long as the modification time and the size of the file are the same, also by later builds.
+    """
+
+    def __init__ (self, manifestPath: Path | None):
+        self.manifestPath = manifestPath
+        self.entries = {}
+        self.changed = False
+        self.lock = threading.Lock ()
+        self.Load ()
+
+    def Load (self) -> None:
+        if self.manifestPath is None or not self.manifestPath.exists ():
+            return
+        try:
+            with open (self.manifestPath, 'r', encoding='utf-8') as f:
+                manifest = json.load (f)
+        except (OSError, ValueError):
+            return
+        if manifest.get ('version') == RESOURCE_MANIFEST_VERSION:
+            self.entries = manifest.get ('files', {})
+
+    def Save (self) -> None:
+        if self.manifestPath is None or not self.changed:
+            return
+        with self.lock:
+            entries = { filePath: entry for filePath, entry in self.entries.items () if os.path.exists (filePath) }
+            self.changed = False
+        ResourceCache.WriteFileAtomic (self.manifestPath, json.dumps ({ 'version': RESOURCE_MANIFEST_VERSION, 'files': entries }, indent=1, sort_keys=True))
+
+    def GetEntry (self, grcFilePath: Path) -> dict:
+        entryKey = str (Path (grcFilePath).absolute ())
+        # the stamp is taken before the scan, so a file modified during the scan is scanned again next time
+        stamp = ResourceCache.GetFileStamp (grcFilePath)
+        with self.lock:
+            entry = self.entries.get (entryKey)
+        if entry is not None and entry['stamp'] == stamp:
+            return entry
+
+        entry = ScanGRCFile (grcFilePath)
+        entry['stamp'] = stamp
+        with self.lock:
+            self.entries[entryKey] = entry
+            self.changed = True
+        return entry
+
+    def Update (self, grcFilePaths: list[Path]) -> None:
+        for grcFilePath in grcFilePaths:
+            self.GetEntry (grcFilePath)
+
+    def IsLibraryGRC (self, grcFilePath: Path) -> bool:
+        return self.GetEntry (grcFilePath)['kind'] == GRC_KIND_LIBRARY
+
+    def GetResourceIds (self, grcFilePath: Path) -> list[tuple[str, str]]:
+        return [tuple (resourceId) for resourceId in self.GetEntry (grcFilePath)['resourceIds']]
+
+    def GetContentHash (self, grcFilePath: Path) -> str:
+        return self.GetEntry (grcFilePath)['hash']
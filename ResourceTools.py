@@ -0,0 +1,57 @@
+import json
+import shutil
+import platform
+from pathlib import Path
+
+
+TOOL_PROFILE_KEYS = ['platform', 'preprocessor', 'resConv', 'rc', 'lpXMLConverter', 'jsonResourceProcessor']
+TARGET_PLATFORMS = ['WIN', 'MAC']
+
+
+class ResourceTools (object):
+    """
+    External tools of the resource build. The tools that are not set are taken from the Development Kit or
+    from the host, so a tool profile only has to contain the replaced tools, for example stand-in executables.
+    """
+
+    def __init__ (self, tools: dict[str, str] | None = None):
+        self.tools = dict (tools or {})
+
+    def GetTargetPlatform (self) -> str | None:
+        return self.tools.get ('platform')
+
+    def GetToolPath (self, toolName: str, defaultPath: Path) -> Path:
+        toolPath = self.tools.get (toolName)
+        return Path (toolPath) if toolPath is not None else defaultPath
+
+
+def IsMsvcPreprocessor (preprocessorPath: Path) -> bool:
+    return preprocessorPath.stem.lower () in ['cl', 'clang-cl']
+
+
+def GetHostDefaultTools () -> dict[str, str]:
+    if platform.system () != 'Linux':
+        return {}
+    # the resources of the macOS Add-On are compiled on Linux, its native resource step needs no platform tool
+    return {
+        'platform': 'MAC',
+        'preprocessor': 'clang' if shutil.which ('clang') is not None else 'gcc',
+    }
+
+
+def LoadResourceTools (profilePath: Path | None) -> ResourceTools:
+    """Return the tools of the host, overridden by the tools of the profile if there is one."""
+    tools = GetHostDefaultTools ()
+    if profilePath is not None:
+        with open (profilePath, 'r', encoding='utf-8') as f:
+            profile = json.load (f)
+        unknownKeys = sorted (set (profile.keys ()) - set (TOOL_PROFILE_KEYS))
+        assert len (unknownKeys) == 0, f'Unknown tools in the tool profile {profilePath}: {", ".join (unknownKeys)}'
+        for toolName, toolPath in profile.items ():
+            # paths are relative to the profile, plain command names are searched on the PATH
+            if toolName != 'platform' and ('/' in toolPath or '\\' in toolPath):
+                toolPath = str ((profilePath.parent / toolPath).absolute ())
+            tools[toolName] = toolPath
+
+    assert tools.get ('platform') in [None] + TARGET_PLATFORMS, f'Unknown target platform: {tools.get ("platform")}'
+    return ResourceTools (tools)
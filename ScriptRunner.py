@@ -0,0 +1,154 @@
+import os
+import sys
+import abc
+import io
+import builtins
+import platform
+import threading
+import traceback
+from pathlib import Path
+import ParallelJobs
+import TraceEvents
+
+
+class ScriptRunner (abc.ABC):
+    @abc.abstractmethod
+    def Run (self, scriptPath: Path, arguments: list, envOverrides: dict[str, str] | None = None) -> int:
+        pass
+
+
+class SubprocessScriptRunner (ScriptRunner):
+    def Run (self, scriptPath: Path, arguments: list, envOverrides: dict[str, str] | None = None) -> int:
+        env = None
+        if envOverrides:
+            env = os.environ.copy ()
+            env.update ({ key: str (value) for key, value in envOverrides.items () })
+        return ParallelJobs.RunCommand ([sys.executable, scriptPath] + arguments, env, 'script')
+
+
+class ThreadOutput (object):
+    """Text stream collecting the output of the current thread, the other threads write to the original stream."""
+
+    def __init__ (self, stream, output: io.StringIO):
+        self.stream = stream
+        self.output = output
+        self.thread = threading.current_thread ()
+
+    def write (self, text: str) -> int:
+        if threading.current_thread () is self.thread:
+            return self.output.write (text)
+        return self.stream.write (text)
+
+    def flush (self) -> None:
+        self.stream.flush ()
+
+    def __getattr__ (self, name: str):
+        return getattr (self.stream, name)
+
+
+class InProcessScriptRunner (ScriptRunner):
+    """
+    Runs Python scripts inside the current interpreter as if they were started from the command line.
+    Every script is compiled only once, modules imported by the scripts stay loaded between runs.
+    sys.argv, sys.path and the environment are set up for each run and restored afterwards. While the environment
+    is changed, the subprocesses started through ParallelJobs wait, so they do not inherit the changes.
+    Inside parallel jobs the output of the script is collected with the output of the job.
+    The scripts share sys.argv of the interpreter, argparse reads it while the script runs, so the runner
+    does not run scripts concurrently. CreateScriptRunner uses it only when the jobs run one after the other.
+    """
+
+    def __init__ (self):
+        self.fallbackRunner = SubprocessScriptRunner ()
+        self.compiledScripts = {}
+
+    def GetCompiledScript (self, scriptPath: Path):
+        scriptPath = Path (scriptPath).absolute ()
+        if scriptPath not in self.compiledScripts:
+            with open (scriptPath, 'rb') as f:
+                self.compiledScripts[scriptPath] = compile (f.read (), str (scriptPath), 'exec')
+        return self.compiledScripts[scriptPath]
+
+    def NeedsSeparateProcess (self, envOverrides: dict[str, str] | None) -> bool:
+        # the dynamic loader reads these variables only at process startup
+        return envOverrides is not None and any (key.startswith ('DYLD_') or key == 'LD_LIBRARY_PATH' for key in envOverrides)
+
+    def Run (self, scriptPath: Path, arguments: list, envOverrides: dict[str, str] | None = None) -> int:
+        if self.NeedsSeparateProcess (envOverrides):
+            return self.fallbackRunner.Run (scriptPath, arguments, envOverrides)
+
+        try:
+            compiledScript = self.GetCompiledScript (scriptPath)
+        except (OSError, SyntaxError, ValueError):
+            return self.fallbackRunner.Run (scriptPath, arguments, envOverrides)
+
+        with TraceEvents.TraceCommand ([scriptPath] + arguments, 'script'):
+            if not envOverrides:
+                return self.RunCompiledScript (Path (scriptPath).absolute (), compiledScript, arguments, envOverrides)
+            with ParallelJobs.environmentLock:
+                return self.RunCompiledScript (Path (scriptPath).absolute (), compiledScript, arguments, envOverrides)
+
+    def RunCompiledScript (self, scriptPath: Path, compiledScript, arguments: list, envOverrides: dict[str, str] | None) -> int:
+        savedArgv = sys.argv
+        savedPath = list (sys.path)
+        savedEnviron = { key: os.environ.get (key) for key in (envOverrides or {}) }
+        dllDirectories = []
+        savedStdout = sys.stdout
+        savedStderr = sys.stderr
+        capturedOutput = io.StringIO () if ParallelJobs.IsCollectingOutput () else None
+
+        if capturedOutput is not None:
+            sys.stdout = ThreadOutput (savedStdout, capturedOutput)
+            sys.stderr = ThreadOutput (savedStderr, capturedOutput)
+        sys.argv = [str (scriptPath)] + [str (argument) for argument in arguments]
+        sys.path.insert (0, str (scriptPath.parent))
+        if envOverrides:
+            os.environ.update ({ key: str (value) for key, value in envOverrides.items () })
+            if platform.system () == 'Windows' and 'PATH' in envOverrides:
+                for folder in str (envOverrides['PATH']).split (os.pathsep):
+                    if folder and Path (folder).is_dir () and folder not in (savedEnviron['PATH'] or '').split (os.pathsep):
+                        dllDirectories.append (os.add_dll_directory (folder))
+
+        scriptGlobals = {
+            '__name__': '__main__',
+            '__file__': str (scriptPath),
+            '__builtins__': builtins,
+        }
+        try:
+            exec (compiledScript, scriptGlobals)
+            result = 0
+        except SystemExit as e:
+            if e.code is None:
+                result = 0
+            elif isinstance (e.code, int):
+                result = e.code
+            else:
+                print (e.code, file=sys.stderr)
+                result = 1
+        except Exception:
+            traceback.print_exc ()
+            result = 1
+        finally:
+            sys.stdout.flush ()
+            sys.stderr.flush ()
+            sys.stdout = savedStdout
+            sys.stderr = savedStderr
+            for dllDirectory in dllDirectories:
+                dllDirectory.close ()
+            sys.argv = savedArgv
+            sys.path[:] = savedPath
+            for key, value in savedEnviron.items ():
+                if value is None:
+                    os.environ.pop (key, None)
+                else:
+                    os.environ[key] = value
+
+        if capturedOutput is not None:
+            ParallelJobs.WriteOutput (capturedOutput.getvalue ().encode (savedStdout.encoding or 'utf-8', errors='replace'))
+        return result
+
+
+def CreateScriptRunner (inProcess: bool, jobCount: int) -> ScriptRunner:
+    """Create and return the script runner used for the Development Kit Python tools, parallel jobs run the scripts in separate processes."""
+    if inProcess and jobCount == 1:
+        return InProcessScriptRunner ()
+    return SubprocessScriptRunner ()
@@ -0,0 +1,136 @@
+import os
+import json
+import time
+import threading
+from pathlib import Path
+
+
+# the resource compilations started by the build write their traces into this folder
+TRACE_FOLDER_ENVIRONMENT_VARIABLE = 'AC_ADDON_TRACE_FOLDER'
+
+
+class Tracer (object):
+    """
+    Collects Chrome trace events (viewable in Perfetto or chrome://tracing). The timestamps come from the
+    monotonic clock of the system, so the traces of the processes of one build can be merged.
+    """
+
+    def __init__ (self, processName: str):
+        self.processName = processName
+        self.events = []
+        self.threadNames = {}
+        self.lock = threading.Lock ()
+        self.pid = os.getpid ()
+
+    def AddCompleteEvent (self, name: str, category: str, startTime: int, endTime: int, args: dict) -> None:
+        thread = threading.current_thread ()
+        event = {
+            'name': name,
+            'cat': category,
+            'ph': 'X',
+            'ts': startTime / 1000.0,
+            'dur': (endTime - startTime) / 1000.0,
+            'pid': self.pid,
+            'tid': thread.ident,
+            'args': args,
+        }
+        with self.lock:
+            self.events.append (event)
+            self.threadNames[thread.ident] = thread.name
+
+    def GetTraceEvents (self) -> list[dict]:
+        with self.lock:
+            metadataEvents = [{ 'name': 'process_name', 'ph': 'M', 'pid': self.pid, 'args': { 'name': self.processName } }]
+            metadataEvents += [{ 'name': 'thread_name', 'ph': 'M', 'pid': self.pid, 'tid': tid, 'args': { 'name': threadName } } for tid, threadName in self.threadNames.items ()]
+            return metadataEvents + list (self.events)
+
+
+class Span (object):
+    def __init__ (self, tracer: Tracer, name: str, category: str, args: dict):
+        self.tracer = tracer
+        self.name = name
+        self.category = category
+        self.args = args
+        self.startTime = None
+
+    def __enter__ (self) -> 'Span':
+        self.startTime = time.perf_counter_ns ()
+        return self
+
+    def __exit__ (self, excType, excValue, traceback) -> None:
+        if excType is not None:
+            self.args['error'] = excType.__name__
+        self.tracer.AddCompleteEvent (self.name, self.category, self.startTime, time.perf_counter_ns (), self.args)
+
+
+class NoSpan (object):
+    def __enter__ (self) -> 'NoSpan':
+        return self
+
+    def __exit__ (self, excType, excValue, traceback) -> None:
+        pass
+
+
+# the span used while tracing is disabled, so a traced block costs only a global lookup and a call
+noSpan = NoSpan ()
+activeTracer = None
+
+
+def IsTracing () -> bool:
+    return activeTracer is not None
+
+
+def TraceSpan (name: str, category: str, args: dict | None = None) -> Span | NoSpan:
+    tracer = activeTracer
+    if tracer is None:
+        return noSpan
+    return Span (tracer, name, category, dict (args or {}))
+
+
+def TraceCommand (params: list | str, category: str = 'tool') -> Span | NoSpan:
+    # the command line is only formatted while tracing
+    tracer = activeTracer
+    if tracer is None:
+        return noSpan
+    if isinstance (params, str):
+        params = params.split ()
+    return Span (tracer, Path (str (params[0])).name, category, { 'command': ' '.join (str (param) for param in params) })
+
+
+def StartTracing (processName: str) -> Tracer:
+    global activeTracer
+    activeTracer = Tracer (processName)
+    return activeTracer
+
+
+def StopTracing () -> list[dict]:
+    global activeTracer
+    tracer = activeTracer
+    activeTracer = None
+    return tracer.GetTraceEvents () if tracer is not None else []
+
+
+def WriteTrace (tracePath: Path, traceEvents: list[dict]) -> None:
+    tracePath.parent.mkdir (parents=True, exist_ok=True)
+    tempTracePath = tracePath.with_name (f'{tracePath.name}.{os.getpid ()}.tmp')
+    with open (tempTracePath, 'w', encoding='utf-8') as f:
+        json.dump ({ 'traceEvents': traceEvents, 'displayTimeUnit': 'ms' }, f)
+    os.replace (tempTracePath, tracePath)
+
+
+def GetTraceFolderTracePath (processName: str) -> Path | None:
+    traceFolder = os.environ.get (TRACE_FOLDER_ENVIRONMENT_VARIABLE)
+    if not traceFolder:
+        return None
+    return Path (traceFolder) / f'{processName}-{os.getpid ()}-{time.perf_counter_ns ()}.json'
+
+
+def LoadTraceFolderEvents (traceFolder: Path) -> list[dict]:
+    traceEvents = []
+    for tracePath in sorted (traceFolder.glob ('*.json')):
+        try:
+            with open (tracePath, 'r', encoding='utf-8') as f:
+                traceEvents.extend (json.load (f)['traceEvents'])
+        except (OSError, ValueError, KeyError):
+            continue
+    return traceEvents
@@ -0,0 +1,82 @@
+import unittest
+import BundleSync
+from pathlib import Path
+import shutil
+import codecs
+import os
+
+
+TEMP_DIR_NAME = Path (__file__).parent / 'TEMP_TEST_OUTPUT_BUNDLE_SYNC'
+
+
+class TestBundleSync (unittest.TestCase):
+
+    def setUp (self):
+        self.tempDirectory = TEMP_DIR_NAME
+        self.objectsDirectory = self.tempDirectory / 'ResourceObjects'
+        self.objectsDirectory.mkdir (parents=True, exist_ok=True)
+        self.bundleDirectory = self.tempDirectory / 'AddOn.bundle' / 'Contents' / 'Resources'
+        self.manifestPath = self.objectsDirectory / 'BundleSync.json'
+
+    def tearDown (self):
+        shutil.rmtree (self.tempDirectory)
+
+    def WriteObject (self, fileName: str, content: str) -> Path:
+        filePath = self.objectsDirectory / fileName
+        # the resource build replaces its outputs
+        filePath.with_suffix ('.tmp').write_text (content, encoding='utf-8')
+        os.replace (filePath.with_suffix ('.tmp'), filePath)
+        return filePath
+
+    def Sync (self, fileNames: list[str]) -> tuple[list[str], list[str]]:
+        files = { self.bundleDirectory / fileName: self.objectsDirectory / fileName for fileName in fileNames }
+        updatedFilePaths, removedFilePaths = BundleSync.SyncFiles (files, self.manifestPath)
+        return ([filePath.name for filePath in updatedFilePaths], [filePath.name for filePath in removedFilePaths])
+
+    def test_only_changed_files_are_synced (self):
+        self.WriteObject ('GICN_1.rsrd', 'icon')
+        self.WriteObject ('Image.tif', 'image')
+        self.assertEqual (self.Sync (['GICN_1.rsrd', 'Image.tif']), (['GICN_1.rsrd', 'Image.tif'], []))
+        self.assertEqual ((self.bundleDirectory / 'Image.tif').read_text (encoding='utf-8'), 'image')
+
+        self.assertEqual (self.Sync (['GICN_1.rsrd', 'Image.tif']), ([], []))
+
+        # rewritten with the same content, for example restored from the cache
+        self.WriteObject ('GICN_1.rsrd', 'icon')
+        self.WriteObject ('Image.tif', 'new image')
+        self.assertEqual (self.Sync (['GICN_1.rsrd', 'Image.tif']), (['Image.tif'], []))
+        self.assertEqual ((self.bundleDirectory / 'Image.tif').read_text (encoding='utf-8'), 'new image')
+        self.assertEqual ((self.objectsDirectory / 'GICN_1.rsrd').read_text (encoding='utf-8'), 'icon')
+
+    def test_stale_files_are_removed (self):
+        self.WriteObject ('GICN_1.rsrd', 'icon')
+        self.WriteObject ('GICN_2.rsrd', 'icon')
+        self.Sync (['GICN_1.rsrd', 'GICN_2.rsrd'])
+        self.assertEqual (self.Sync (['GICN_1.rsrd']), ([], ['GICN_2.rsrd']))
+        self.assertFalse ((self.bundleDirectory / 'GICN_2.rsrd').exists ())
+        self.assertTrue ((self.objectsDirectory / 'GICN_2.rsrd').exists ())
+
+    def test_modified_target_is_synced_again (self):
+        self.WriteObject ('GICN_1.rsrd', 'icon')
+        self.Sync (['GICN_1.rsrd'])
+        (self.bundleDirectory / 'GICN_1.rsrd').unlink ()
+        (self.bundleDirectory / 'GICN_1.rsrd').write_text ('modified content', encoding='utf-8')
+        self.assertEqual (self.Sync (['GICN_1.rsrd']), (['GICN_1.rsrd'], []))
+        self.assertEqual ((self.bundleDirectory / 'GICN_1.rsrd').read_text (encoding='utf-8'), 'icon')
+
+    def test_utf16_concatenation (self):
+        firstStringsPath = self.objectsDirectory / 'First.strings'
+        firstStringsPath.write_bytes ('"a" = "á";\n'.encode ('utf-16'))
+        secondStringsPath = self.objectsDirectory / 'Second.strings'
+        secondStringsPath.write_bytes (codecs.BOM_UTF16_BE + '"b" = "ő";\n'.encode ('utf-16-be'))
+        targetPath = self.bundleDirectory / 'English.lproj' / 'Localizable.strings'
+
+        self.assertTrue (BundleSync.WriteUTF16Concatenation ([firstStringsPath, secondStringsPath], targetPath))
+        content = targetPath.read_bytes ()
+        self.assertTrue (content.startswith (codecs.BOM_UTF16))
+        self.assertEqual (content.decode ('utf-16'), '"a" = "á";\n"b" = "ő";\n')
+
+        targetStamp = os.stat (targetPath).st_mtime_ns
+        self.assertFalse (BundleSync.WriteUTF16Concatenation ([firstStringsPath, secondStringsPath], targetPath))
+        self.assertEqual (os.stat (targetPath).st_mtime_ns, targetStamp)
+        self.assertEqual (len (list (targetPath.parent.iterdir ())), 1)
@@ -0,0 +1,45 @@
+import unittest
+import CompileResources
+from pathlib import Path
+import shutil
+
+
+TEMP_DIR_NAME = Path (__file__).parent / 'TEMP_TEST_OUTPUT_DEVKIT_INFO'
+
+
+class TestDevKitInfo (unittest.TestCase):
+
+    def setUp (self):
+        self.tempDirectory = TEMP_DIR_NAME
+        self.devKitPath = self.tempDirectory / 'DevKit'
+        (self.devKitPath / 'Tools').mkdir (parents=True, exist_ok=True)
+        self.cacheDirectory = self.tempDirectory / 'Cache'
+        CompileResources.devKitInfos.clear ()
+
+    def tearDown (self):
+        CompileResources.devKitInfos.clear ()
+        shutil.rmtree (self.tempDirectory)
+
+    def GetDevKitInfo (self) -> CompileResources.DevKitInfo:
+        return CompileResources.GetDevKitInfo (self.devKitPath, '29', '3100', 'Win', self.cacheDirectory)
+
+    def test_explicit_build_number (self):
+        devKitInfo = self.GetDevKitInfo ()
+        self.assertEqual ((devKitInfo.mainVersion, devKitInfo.buildNumber), (29, 3100))
+        self.assertTrue (devKitInfo.supportsSvgColorChange)
+        self.assertFalse (devKitInfo.hasJsonResourceProcessor)
+
+    def test_info_is_shared_and_persisted (self):
+        devKitInfo = self.GetDevKitInfo ()
+        self.assertIs (self.GetDevKitInfo (), devKitInfo)
+        self.assertEqual (len (list (self.cacheDirectory.glob ('*.json'))), 1)
+
+        CompileResources.devKitInfos.clear ()
+        persistedDevKitInfo = self.GetDevKitInfo ()
+        self.assertIsNot (persistedDevKitInfo, devKitInfo)
+        self.assertEqual (persistedDevKitInfo.ToDict (), devKitInfo.ToDict ())
+
+    def test_new_tool_invalidates_info (self):
+        self.assertFalse (self.GetDevKitInfo ().hasJsonResourceProcessor)
+        (self.devKitPath / 'Tools' / 'JSONResourceProcessor').mkdir ()
+        self.assertTrue (self.GetDevKitInfo ().hasJsonResourceProcessor)
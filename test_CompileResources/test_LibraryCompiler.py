@@ -0,0 +1,62 @@
+import unittest
+import CompileResources
+from pathlib import Path
+import shutil
+import stat
+
+
+TEMP_DIR_NAME = Path (__file__).parent / 'TEMP_TEST_OUTPUT_LIBRARY_COMPILER'
+
+# Stand-in for LP_XMLConverter, it converts every source file and counts its runs
+STAND_IN_TOOL = '''#!/bin/sh
+echo run >> "$(dirname "$0")/runs.txt"
+for sourceFile in "$2"/*.xml; do
+    cp "$sourceFile" "$3/$(basename "$sourceFile" .xml)"
+done
+'''
+
+
+@unittest.skipIf (shutil.which ('sh') is None, 'POSIX shell is not available')
+class TestLibraryCompiler (unittest.TestCase):
+
+    def setUp (self):
+        self.tempDirectory = TEMP_DIR_NAME
+        self.toolFolder = self.tempDirectory / 'LPXMLConverter'
+        self.toolFolder.mkdir (parents=True, exist_ok=True)
+        toolPath = self.toolFolder / 'LP_XMLConverter.exe'
+        toolPath.write_text (STAND_IN_TOOL, encoding='utf-8')
+        toolPath.chmod (toolPath.stat ().st_mode | stat.S_IEXEC)
+        self.resourcesPath = self.tempDirectory / 'Resources'
+        self.sourcePath = self.resourcesPath / 'RINT' / 'ACLib' / 'Src'
+        self.sourcePath.mkdir (parents=True, exist_ok=True)
+        (self.sourcePath / 'Object.gsm.xml').write_text ('object', encoding='utf-8')
+
+    def tearDown (self):
+        shutil.rmtree (self.tempDirectory)
+
+    def CompileLibrary (self, languageCode: str) -> Path:
+        resourceObjectsPath = self.tempDirectory / f'ResourceObjects{languageCode}'
+        resourceObjectsPath.mkdir (parents=True, exist_ok=True)
+        libraryCompiler = CompileResources.WinLibraryCompiler (self.tempDirectory / 'DevKit', '29', '3100', 'Example', languageCode, 'INT',
+            self.tempDirectory / 'Src', self.resourcesPath, resourceObjectsPath, self.tempDirectory / 'Cache', self.toolFolder)
+        libraryCompiler.CompileLibrary ()
+        return resourceObjectsPath
+
+    def GetRunCount (self) -> int:
+        return len ((self.toolFolder / 'runs.txt').read_text (encoding='utf-8').splitlines ())
+
+    def test_library_is_compiled_once (self):
+        resourceObjectsPath = self.CompileLibrary ('INT')
+        self.assertEqual ((resourceObjectsPath / 'Object.gsm').read_text (encoding='utf-8'), 'object')
+        self.CompileLibrary ('INT')
+        self.assertEqual (self.GetRunCount (), 1)
+
+        # the other language builds share the compiled library
+        resourceObjectsPath = self.CompileLibrary ('GER')
+        self.assertEqual ((resourceObjectsPath / 'Object.gsm').read_text (encoding='utf-8'), 'object')
+        self.assertEqual (self.GetRunCount (), 1)
+
+        (self.sourcePath / 'Object.gsm.xml').write_text ('changed object', encoding='utf-8')
+        resourceObjectsPath = self.CompileLibrary ('INT')
+        self.assertEqual ((resourceObjectsPath / 'Object.gsm').read_text (encoding='utf-8'), 'changed object')
+        self.assertEqual (self.GetRunCount (), 2)
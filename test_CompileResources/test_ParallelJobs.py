@@ -0,0 +1,89 @@
+import unittest
+import ParallelJobs
+import io
+import os
+import sys
+import time
+
+
+def PrintingJob (text: str, delay: float):
+    def Job ():
+        time.sleep (delay)
+        result = ParallelJobs.RunCommand ([sys.executable, '-c', f'print ("{text}")'])
+        assert result == 0
+        return text
+    return Job
+
+
+def FailingJob (message: str, delay: float):
+    def Job ():
+        time.sleep (delay)
+        raise AssertionError (message)
+    return Job
+
+
+class TestParallelJobs (unittest.TestCase):
+
+    def setUp (self):
+        self.savedStdout = sys.stdout
+        self.stdoutBuffer = io.BytesIO ()
+        sys.stdout = io.TextIOWrapper (self.stdoutBuffer, encoding='utf-8')
+
+    def tearDown (self):
+        sys.stdout = self.savedStdout
+
+    def GetPrintedLines (self) -> list[str]:
+        sys.stdout.flush ()
+        return self.stdoutBuffer.getvalue ().decode ('utf-8').split ()
+
+    def test_output_and_results_are_in_job_order (self):
+        runner = ParallelJobs.JobRunner (4)
+        results = runner.Run ([PrintingJob ('first', 0.3), PrintingJob ('second', 0.0), PrintingJob ('third', 0.1)])
+        self.assertEqual (results, ['first', 'second', 'third'])
+        self.assertEqual (self.GetPrintedLines (), ['first', 'second', 'third'])
+
+    def test_first_error_in_job_order_is_raised (self):
+        runner = ParallelJobs.JobRunner (4)
+        with self.assertRaisesRegex (AssertionError, 'early job'):
+            runner.Run ([PrintingJob ('first', 0.0), FailingJob ('early job', 0.3), FailingJob ('late job', 0.0), PrintingJob ('last', 0.0)])
+        self.assertEqual (self.GetPrintedLines (), ['first', 'last'])
+
+    def test_jobserver_tokens_are_returned (self):
+        readFd, writeFd = os.pipe ()
+        try:
+            os.write (writeFd, b'++')
+            runner = ParallelJobs.JobRunner (8, ParallelJobs.JobServerClient (readFd, writeFd))
+            results = runner.Run ([PrintingJob (str (index), 0.05) for index in range (6)])
+            self.assertEqual (results, [str (index) for index in range (6)])
+            os.set_blocking (readFd, False)
+            self.assertEqual (os.read (readFd, 16), b'++')
+        finally:
+            os.close (readFd)
+            os.close (writeFd)
+
+    def test_task_graph_respects_dependencies (self):
+        finishedTasks = []
+        def RecordingAction (name: str, delay: float):
+            def Action ():
+                time.sleep (delay)
+                finishedTasks.append (name)
+            return Action
+
+        taskGraph = ParallelJobs.TaskGraph ()
+        library = taskGraph.AddTask ('library', RecordingAction ('library', 0.2))
+        independent = taskGraph.AddTask ('independent', RecordingAction ('independent', 0.0))
+        resource = taskGraph.AddTask ('resource', RecordingAction ('resource', 0.0), [library])
+        native = taskGraph.AddTask ('native', RecordingAction ('native', 0.0), [resource, independent])
+        taskGraph.Run (ParallelJobs.JobRunner (4))
+
+        self.assertEqual (finishedTasks, ['independent', 'library', 'resource', 'native'])
+        self.assertEqual (taskGraph.GetCriticalPath (), [library, resource, native])
+
+    def test_task_graph_stops_after_error (self):
+        taskGraph = ParallelJobs.TaskGraph ()
+        failing = taskGraph.AddTask ('failing', FailingJob ('failing task', 0.0))
+        dependent = taskGraph.AddTask ('dependent', PrintingJob ('dependent', 0.0), [failing])
+        with self.assertRaisesRegex (AssertionError, 'failing task'):
+            taskGraph.Run (ParallelJobs.JobRunner (4))
+        self.assertIsNone (dependent.startTime)
+        self.assertEqual (self.GetPrintedLines (), [])
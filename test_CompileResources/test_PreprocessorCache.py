@@ -0,0 +1,110 @@
+import unittest
+import ParallelJobs
+import PreprocessorCache
+from pathlib import Path
+import shutil
+import os
+
+
+TEMP_DIR_NAME = Path (__file__).parent / 'TEMP_TEST_OUTPUT_PREPROCESSOR_CACHE'
+
+
+def GetPreprocessor () -> str | None:
+    for compiler in ['clang', 'gcc']:
+        if shutil.which (compiler) is not None:
+            return compiler
+    return None
+
+
+@unittest.skipIf (os.name == 'nt' or GetPreprocessor () is None, 'requires clang or gcc')
+class TestPreprocessorCache (unittest.TestCase):
+
+    def setUp (self):
+        self.tempDirectory = TEMP_DIR_NAME
+        self.devKitPath = self.tempDirectory / 'DevKit'
+        self.sourcesPath = self.tempDirectory / 'Sources'
+        self.resourceObjectsPath = self.tempDirectory / 'ResourceObjects'
+        for folder in [self.devKitPath / 'Inc', self.sourcesPath, self.resourceObjectsPath]:
+            folder.mkdir (parents=True, exist_ok=True)
+
+        (self.devKitPath / 'Inc' / 'DGLibDefs.h').write_text ('#define DG_DIALOG_TEXT "DevKit"\n', encoding='utf-8')
+        (self.sourcesPath / 'ResourceIds.hpp').write_text ('#define ID_DIALOG 32500\n', encoding='utf-8')
+        self.grcFilePath = self.sourcesPath / 'Dialogs.grc'
+        self.grcFilePath.write_text ('#include "DGLibDefs.h"\n#include "ResourceIds.hpp"\n\'GDLG\' ID_DIALOG DG_DIALOG_TEXT\n', encoding='utf-8')
+        self.precompiledFilePath = self.resourceObjectsPath / 'Dialogs.grc.i'
+
+        self.commandCount = 0
+        self.originalRunCommand = ParallelJobs.RunCommand
+        def RunCommandSpy (params: list, env: dict[str, str] | None = None) -> int:
+            self.commandCount += 1
+            return self.originalRunCommand (params, env)
+        ParallelJobs.RunCommand = RunCommandSpy
+
+    def tearDown (self):
+        ParallelJobs.RunCommand = self.originalRunCommand
+        shutil.rmtree (self.tempDirectory)
+
+    def Precompile (self) -> str:
+        result = PreprocessorCache.RunCachedPreprocessor ([
+            GetPreprocessor (),
+            '-x', 'c++',
+            '-E',
+            '-P',
+            '-Dmacintosh',
+            '-I', self.devKitPath / 'Inc',
+            '-I', self.sourcesPath,
+            '-I', self.resourceObjectsPath,
+            '-o', self.precompiledFilePath,
+            self.grcFilePath,
+        ], PreprocessorCache.DEPENDENCY_STYLE_DEPFILE, self.grcFilePath, self.precompiledFilePath)
+        self.assertEqual (result, 0)
+        return self.precompiledFilePath.read_text (encoding='utf-8')
+
+    def test_unchanged_inputs_reuse_output (self):
+        self.assertIn ("'GDLG' 32500 \"DevKit\"", self.Precompile ())
+        self.Precompile ()
+        self.assertEqual (self.commandCount, 1)
+
+        dependencies = PreprocessorCache.GetDependencies (self.precompiledFilePath)
+        self.assertIn ((self.devKitPath / 'Inc' / 'DGLibDefs.h').absolute (), dependencies)
+        self.assertIn ((self.sourcesPath / 'ResourceIds.hpp').absolute (), dependencies)
+
+    def test_touched_header_with_same_content_is_not_a_change (self):
+        self.Precompile ()
+        headerPath = self.sourcesPath / 'ResourceIds.hpp'
+        headerStat = os.stat (headerPath)
+        os.utime (headerPath, ns=(headerStat.st_atime_ns, headerStat.st_mtime_ns + 10 ** 9))
+        self.Precompile ()
+        self.assertEqual (self.commandCount, 1)
+
+    def test_changed_header_is_preprocessed_again (self):
+        self.Precompile ()
+        (self.devKitPath / 'Inc' / 'DGLibDefs.h').write_text ('#define DG_DIALOG_TEXT "Changed"\n', encoding='utf-8')
+        self.assertIn ("'GDLG' 32500 \"Changed\"", self.Precompile ())
+        self.assertEqual (self.commandCount, 2)
+
+    def test_show_includes_output_is_parsed (self):
+        output = b'Note: including file: C:\\DevKit\\Inc\\DGLibDefs.h\r\nDialogs.grc\r\nNote: including file:  C:\\Sources\\ResourceIds.hpp\r\n'
+        dependencies, remainingOutput = PreprocessorCache.ParseShowIncludesOutput (output)
+        self.assertEqual (dependencies, [Path ('C:\\DevKit\\Inc\\DGLibDefs.h'), Path ('C:\\Sources\\ResourceIds.hpp')])
+        self.assertEqual (remainingOutput, b'Dialogs.grc\r\n')
+
+
+class TestDepFile (unittest.TestCase):
+
+    def setUp (self):
+        self.tempDirectory = TEMP_DIR_NAME
+        self.tempDirectory.mkdir (parents=True, exist_ok=True)
+
+    def tearDown (self):
+        shutil.rmtree (self.tempDirectory)
+
+    def test_dep_file_round_trip (self):
+        depFilePath = self.tempDirectory / 'AddOnResources.d'
+        dependencies = [
+            (self.tempDirectory / 'RINT' / 'Dialogs.grc').absolute (),
+            (self.tempDirectory / 'Images With Space' / 'Icon#1.svg').absolute (),
+            (self.tempDirectory / 'XLF' / '$Addon.xlf').absolute (),
+        ]
+        PreprocessorCache.WriteDepFile (depFilePath, self.tempDirectory / 'AddOnResources.stamp', dependencies)
+        self.assertEqual (PreprocessorCache.ParseDepFile (depFilePath), dependencies)
@@ -0,0 +1,65 @@
+import unittest
+import ResourceCache
+from pathlib import Path
+import shutil
+
+
+TEMP_DIR_NAME = Path (__file__).parent / 'TEMP_TEST_OUTPUT_RESOURCE_CACHE'
+
+
+class TestResourceCache (unittest.TestCase):
+
+    def setUp (self):
+        self.tempDirectory = TEMP_DIR_NAME
+        self.tempDirectory.mkdir (parents=True, exist_ok=True)
+        self.cacheDirectory = self.tempDirectory / 'Cache'
+        self.objectsDirectory = self.tempDirectory / 'Objects'
+
+    def tearDown (self):
+        shutil.rmtree (self.tempDirectory)
+
+    def StoreEntry (self, key: str, files: dict[str, str]) -> Path:
+        entryPath = ResourceCache.GetCacheEntryPath (self.cacheDirectory, key)
+        stagingFolderPath = ResourceCache.GetStagingFolderPath (entryPath)
+        for fileName, content in files.items ():
+            (stagingFolderPath / fileName).write_text (content, encoding='utf-8')
+        ResourceCache.StoreCacheEntry (stagingFolderPath, entryPath)
+        self.assertFalse (stagingFolderPath.exists ())
+        return entryPath
+
+    def test_entry_is_restored (self):
+        entryPath = self.StoreEntry ('abcdef', { 'Dialogs.ro': 'native', 'GDLG_32500.rsrd': 'data' })
+        restoredFilePaths = ResourceCache.RestoreCacheEntry (entryPath, self.objectsDirectory)
+        self.assertEqual (restoredFilePaths, [self.objectsDirectory / 'Dialogs.ro', self.objectsDirectory / 'GDLG_32500.rsrd'])
+        self.assertEqual ((self.objectsDirectory / 'GDLG_32500.rsrd').read_text (encoding='utf-8'), 'data')
+
+    def test_existing_entry_is_kept (self):
+        entryPath = self.StoreEntry ('abcdef', { 'Dialogs.ro': 'first' })
+        self.StoreEntry ('abcdef', { 'Dialogs.ro': 'second' })
+        self.assertEqual ((entryPath / 'Dialogs.ro').read_text (encoding='utf-8'), 'first')
+        self.assertEqual (list (entryPath.parent.iterdir ()), [entryPath])
+
+    def test_local_paths_are_detected (self):
+        entryPath = self.StoreEntry ('abcdef', { 'Dialogs.rc2': 'native' })
+        (entryPath / 'Strings.strings').write_bytes (str (self.tempDirectory).encode ('utf-16-le'))
+        self.assertTrue (ResourceCache.FolderContainsText (entryPath, [str (self.tempDirectory)]))
+        self.assertFalse (ResourceCache.FolderContainsText (entryPath, [str (self.objectsDirectory)]))
+
+    def test_tree_hash (self):
+        sourceDirectory = self.tempDirectory / 'Src'
+        (sourceDirectory / 'Macros').mkdir (parents=True)
+        (sourceDirectory / 'Object.gsm.xml').write_text ('object', encoding='utf-8')
+        (sourceDirectory / 'Macros' / 'Macro.xml').write_text ('macro', encoding='utf-8')
+        stateFilePath = self.cacheDirectory / 'TreeHash.json'
+
+        treeHash = ResourceCache.GetTreeHash (sourceDirectory, stateFilePath)
+        self.assertTrue (stateFilePath.exists ())
+        self.assertEqual (ResourceCache.GetTreeHash (sourceDirectory, stateFilePath), treeHash)
+
+        (sourceDirectory / 'Macros' / 'Macro.xml').write_text ('changed macro', encoding='utf-8')
+        changedTreeHash = ResourceCache.GetTreeHash (sourceDirectory, stateFilePath)
+        self.assertNotEqual (changedTreeHash, treeHash)
+
+        # the same content in another folder structure
+        (sourceDirectory / 'Macros' / 'Macro.xml').rename (sourceDirectory / 'Macro.xml')
+        self.assertNotEqual (ResourceCache.GetTreeHash (sourceDirectory, stateFilePath), changedTreeHash)
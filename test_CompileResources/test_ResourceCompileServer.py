@@ -0,0 +1,89 @@
+import unittest
+import ResourceCompileServer
+from pathlib import Path
+import subprocess
+import shutil
+import time
+import threading
+import sys
+import io
+import os
+
+
+TEMP_DIR_NAME = Path (__file__).parent / 'TEMP_TEST_OUTPUT_COMPILE_SERVER'
+
+
+@unittest.skipIf (os.name == 'nt', 'uses a Unix domain socket')
+class TestResourceCompileServer (unittest.TestCase):
+
+    def setUp (self):
+        self.serverFolder = TEMP_DIR_NAME
+        self.serverFolder.mkdir (parents=True, exist_ok=True)
+        self.serverFolder.chmod (0o700)
+        self.savedStdout = sys.stdout
+        self.stdoutBuffer = io.BytesIO ()
+        sys.stdout = io.TextIOWrapper (self.stdoutBuffer, encoding='utf-8')
+
+    def tearDown (self):
+        sys.stdout = self.savedStdout
+        ResourceCompileServer.StopServer (self.serverFolder)
+        shutil.rmtree (self.serverFolder)
+
+    def GetPrintedOutput (self) -> str:
+        sys.stdout.flush ()
+        return self.stdoutBuffer.getvalue ().decode ('utf-8')
+
+    def test_server_matches_direct_invocation (self):
+        arguments = ['--unknownArgument']
+        directResult = subprocess.run ([sys.executable, str (ResourceCompileServer.GetToolsFolder () / 'CompileResources.py')] + arguments, stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+
+        exitCode = ResourceCompileServer.RunClient (arguments, self.serverFolder, idleTimeout=60)
+        self.assertEqual (exitCode, directResult.returncode)
+        self.assertEqual (self.GetPrintedOutput (), directResult.stdout.decode ('utf-8'))
+
+        # the second request is served by the already running server
+        connection = ResourceCompileServer.ConnectToServer (self.serverFolder, False, 60)
+        self.assertIsNotNone (connection)
+        connection.close ()
+        self.assertEqual (ResourceCompileServer.RunClient (arguments, self.serverFolder, idleTimeout=60), directResult.returncode)
+
+    def test_server_exits_after_idle_timeout (self):
+        ResourceCompileServer.RunClient (['--unknownArgument'], self.serverFolder, idleTimeout=1)
+        address, _ = ResourceCompileServer.GetServerAddress (self.serverFolder, ResourceCompileServer.GetServerId ())
+        for _ in range (100):
+            if not os.path.exists (address):
+                break
+            time.sleep (0.1)
+        self.assertFalse (os.path.exists (address))
+        self.assertIsNone (ResourceCompileServer.ConnectToServer (self.serverFolder, False, 60))
+
+    def test_connections_are_served_in_parallel (self):
+        arguments = ['--unknownArgument']
+        exitCode = ResourceCompileServer.RunClient (arguments, self.serverFolder, idleTimeout=60)
+
+        # a client that did not send its request yet does not block the other clients
+        waitingConnection = ResourceCompileServer.ConnectToServer (self.serverFolder, False, 60)
+        self.assertIsNotNone (waitingConnection)
+        with waitingConnection:
+            exitCodes = []
+            clientThread = threading.Thread (target=lambda: exitCodes.append (ResourceCompileServer.RunClient (arguments, self.serverFolder, idleTimeout=60)))
+            clientThread.start ()
+            clientThread.join (timeout=60)
+            self.assertEqual (exitCodes, [exitCode])
+
+            ResourceCompileServer.SendMessage (waitingConnection, { 'version': ResourceCompileServer.PROTOCOL_VERSION, 'command': 'compile', 'arguments': arguments, 'cwd': os.getcwd (), 'env': dict (os.environ) })
+            self.assertEqual (ResourceCompileServer.ReceiveMessage (waitingConnection)['exitCode'], exitCode)
+
+    def test_server_folder_must_be_private (self):
+        self.assertEqual (ResourceCompileServer.PrepareServerFolder (self.serverFolder / 'Private'), self.serverFolder / 'Private')
+
+        sharedFolder = self.serverFolder / 'Shared'
+        sharedFolder.mkdir ()
+        sharedFolder.chmod (0o755)
+        with self.assertRaises (RuntimeError):
+            ResourceCompileServer.PrepareServerFolder (sharedFolder)
+
+        linkedFolder = self.serverFolder / 'Linked'
+        linkedFolder.symlink_to (self.serverFolder / 'Private', target_is_directory=True)
+        with self.assertRaises (RuntimeError):
+            ResourceCompileServer.PrepareServerFolder (linkedFolder)
@@ -0,0 +1,176 @@
+import unittest
+import CompileResources
+import ScriptRunner
+import ParallelJobs
+import ResourceTools
+from pathlib import Path
+import shutil
+import json
+
+
+TEMP_DIR_NAME = Path (__file__).parent / 'TEMP_TEST_OUTPUT_RESOURCE_COMPILER'
+
+
+def WriteXliff (xlfPath: Path, units: dict[str, str], state: str = 'translated', sources: dict[str, str] | None = None) -> None:
+    sources = sources or {}
+    transUnits = ''.join (f'<trans-unit id="{unitId}"><source>{sources.get (unitId, unitId)}</source><target state="{state}">{text}</target></trans-unit>' for unitId, text in units.items ())
+    xlfPath.parent.mkdir (parents=True, exist_ok=True)
+    with open (xlfPath, 'w', encoding='utf-8') as f:
+        f.write (f'<?xml version="1.0" encoding="UTF-8"?><xliff xmlns="urn:oasis:names:tc:xliff:document:1.2" version="1.2"><file><body>{transUnits}</body></file></xliff>')
+
+
+class RecordingScriptRunner (ScriptRunner.ScriptRunner):
+    """Records the names of the scripts it runs, the output of a script is its name."""
+
+    def __init__ (self):
+        self.scriptNames = []
+
+    def Run (self, scriptPath: Path, arguments: list, envOverrides: dict[str, str] | None = None) -> int:
+        self.scriptNames.append (Path (scriptPath).name)
+        if '-o' in arguments:
+            outputPath = Path (arguments[arguments.index ('-o') + 1])
+            outputPath.parent.mkdir (parents=True, exist_ok=True)
+            outputPath.write_text (Path (scriptPath).name, encoding='utf-8')
+        return 0
+
+
+class TestResourceCompiler (unittest.TestCase):
+
+    def setUp (self):
+        self.tempDirectory = TEMP_DIR_NAME
+        self.devKitPath = self.tempDirectory / 'DevKit'
+        self.processorPath = self.tempDirectory / 'JSONResourceProcessor'
+        self.resourcesPath = self.tempDirectory / 'Resources'
+        self.resourceObjectsPath = self.tempDirectory / 'ResourceObjects'
+        for folder in [self.devKitPath / 'Tools' / 'SchemaFiles', self.processorPath, self.resourcesPath / 'RINT', self.resourcesPath / 'RFIX', self.resourceObjectsPath]:
+            folder.mkdir (parents=True, exist_ok=True)
+        (self.devKitPath / 'Tools' / 'SchemaFiles' / 'Dialog.schema.json').write_text ('{}', encoding='utf-8')
+        (self.processorPath / 'SchemaValidator.py').write_text ('# version 1\n', encoding='utf-8')
+        CompileResources.devKitInfos.clear ()
+
+    def tearDown (self):
+        CompileResources.devKitInfos.clear ()
+        shutil.rmtree (self.tempDirectory)
+
+    def CreateResourceCompiler (self, scriptRunner: ScriptRunner.ScriptRunner, languageCode: str = 'INT') -> CompileResources.ResourceCompiler:
+        return CompileResources.WinResourceCompiler (self.devKitPath, '29', '3100', 'Example', languageCode, 'INT',
+            self.tempDirectory / 'Src', self.resourcesPath, self.resourceObjectsPath, False, False, self.tempDirectory / 'Cache',
+            scriptRunner, ParallelJobs.JobRunner (1), self.tempDirectory / 'Cache' / 'ResConv',
+            ResourceTools.ResourceTools ({ 'jsonResourceProcessor': str (self.processorPath) }))
+
+    def test_json_checks_are_cached (self):
+        jsonFilePath = self.resourcesPath / 'RINT' / 'Dialogs.json'
+        jsonFilePath.write_text ('{}', encoding='utf-8')
+        validOutputPath = self.resourceObjectsPath / 'Dialogs.json.valid'
+
+        def Validate () -> list[str]:
+            scriptRunner = RecordingScriptRunner ()
+            self.CreateResourceCompiler (scriptRunner).ValidateJSONResourceFile (jsonFilePath)
+            return scriptRunner.scriptNames
+
+        self.assertEqual (Validate (), ['SchemaValidator.py'])
+        validOutputPath.unlink ()
+        self.assertEqual (Validate (), [])
+        self.assertEqual (validOutputPath.read_text (encoding='utf-8'), 'SchemaValidator.py')
+
+        for changedFilePath, content in [
+            (jsonFilePath, '{ "changed": true }'),
+            (self.processorPath / 'SchemaValidator.py', '# version 2\n'),
+            (self.devKitPath / 'Tools' / 'SchemaFiles' / 'Dialog.schema.json', '{ "type": "object" }'),
+        ]:
+            changedFilePath.write_text (content, encoding='utf-8')
+            self.assertEqual (Validate (), ['SchemaValidator.py'])
+            self.assertEqual (Validate (), [])
+
+    def test_xliff_chain_is_merged_once (self):
+        (self.processorPath / 'MergeParentChildXliff.py').write_text ('# version 1\n', encoding='utf-8')
+        germanXliffFolder = self.resourcesPath / 'ResourceLibrary' / 'GER' / 'XLF'
+        germanXliffFolder.mkdir (parents=True)
+        (germanXliffFolder / '_parent.txt').write_text ('INT\n', encoding='utf-8')
+        (germanXliffFolder / 'Example.xlf').write_text ('<xliff>GER</xliff>', encoding='utf-8')
+        (self.resourcesPath / 'RINT' / 'Example.xlf').write_text ('<xliff>INT</xliff>', encoding='utf-8')
+
+        def Compile () -> list[str]:
+            scriptRunner = RecordingScriptRunner ()
+            resourceCompiler = self.CreateResourceCompiler (scriptRunner, 'GER')
+            mergedXliffPath = resourceCompiler.GetMergedXliffPath (self.processorPath)
+            self.assertEqual (resourceCompiler.GetMergedXliffPath (self.processorPath), mergedXliffPath)
+            self.assertEqual (mergedXliffPath, self.resourceObjectsPath / 'Example.merged.xlf')
+            self.assertTrue (mergedXliffPath.exists ())
+            return scriptRunner.scriptNames
+
+        self.assertEqual (Compile (), ['MergeParentChildXliff.py'])
+        self.assertEqual (Compile (), [])
+        (self.resourcesPath / 'RINT' / 'Example.xlf').write_text ('<xliff>INT changed</xliff>', encoding='utf-8')
+        self.assertEqual (Compile (), ['MergeParentChildXliff.py'])
+        self.assertEqual (Compile (), [])
+        (germanXliffFolder / 'Example.xlf').write_text ('<xliff>GER changed</xliff>', encoding='utf-8')
+        self.assertEqual (Compile (), ['MergeParentChildXliff.py'])
+
+    def test_outdated_localized_json_files (self):
+        xliffPath = self.resourcesPath / 'RINT' / 'Example.xlf'
+        WriteXliff (xliffPath, { 'first': 'First', 'second': 'Second' })
+        jsonFiles = [self.resourcesPath / 'RINT' / 'A.json', self.resourcesPath / 'RINT' / 'B.json']
+        for jsonFilePath, unitId in zip (jsonFiles, ['first', 'second']):
+            jsonFilePath.write_text (json.dumps ({ 'STR#': [{ '#id': '1', 'strings': [{ 'dictId': unitId }] }] }), encoding='utf-8')
+
+        # the selected files are compiled and the index is written, like the resource build does
+        def GetOutdatedFileNames () -> list[str]:
+            resourceCompiler = self.CreateResourceCompiler (RecordingScriptRunner ())
+            localizationIndex, outdatedJsonFiles = resourceCompiler.GetOutdatedLocalizedJSONResourceFiles (jsonFiles)
+            for jsonFilePath in outdatedJsonFiles:
+                nativeResourceFilePath = resourceCompiler.GetJSONNativeResourceFilePath (jsonFilePath, localized=True)
+                nativeResourceFilePath.parent.mkdir (parents=True, exist_ok=True)
+                nativeResourceFilePath.write_text (jsonFilePath.name, encoding='utf-8')
+            resourceCompiler.WriteLocalizationIndex (localizationIndex)
+            return [jsonFilePath.name for jsonFilePath in outdatedJsonFiles]
+
+        self.assertEqual (GetOutdatedFileNames (), ['A.json', 'B.json'])
+        self.assertEqual (GetOutdatedFileNames (), [])
+
+        WriteXliff (xliffPath, { 'first': 'First changed', 'second': 'Second' })
+        self.assertEqual (GetOutdatedFileNames (), ['A.json'])
+        # a unit that is not used by any file does not select any file
+        WriteXliff (xliffPath, { 'first': 'First changed', 'second': 'Second', 'unused': 'Unused' })
+        self.assertEqual (GetOutdatedFileNames (), [])
+
+        # edits that do not change the translations are also seen by the translator
+        WriteXliff (xliffPath, { 'first': 'First changed', 'second': 'Second', 'unused': 'Unused' }, sources={ 'second': 'Second source' })
+        self.assertEqual (GetOutdatedFileNames (), ['B.json'])
+        WriteXliff (xliffPath, { 'first': 'First changed', 'second': 'Second', 'unused': 'Unused' }, state='new', sources={ 'second': 'Second source' })
+        self.assertEqual (GetOutdatedFileNames (), ['A.json', 'B.json'])
+        WriteXliff (xliffPath, { 'first': 'First changed', 'second': 'Second', 'unused': 'Unused' }, state='new', sources={ 'second': 'Other source' })
+        self.assertEqual (GetOutdatedFileNames (), ['B.json'])
+
+        jsonFiles[1].write_text (json.dumps ({ 'STR#': [{ '#id': '2', 'strings': [{ 'dictId': 'second' }] }] }), encoding='utf-8')
+        self.assertEqual (GetOutdatedFileNames (), ['B.json'])
+
+        (self.resourceObjectsPath / 'RLOC' / 'A.json.rc2').unlink ()
+        self.assertEqual (GetOutdatedFileNames (), ['A.json'])
+
+        # the index of another tool version is not used
+        localizationIndexPath = self.resourceObjectsPath / 'LocalizationIndex.json'
+        localizationIndex = json.loads (localizationIndexPath.read_text (encoding='utf-8'))
+        localizationIndex['fingerprint'] = 'other'
+        localizationIndexPath.write_text (json.dumps (localizationIndex), encoding='utf-8')
+        self.assertEqual (GetOutdatedFileNames (), ['A.json', 'B.json'])
+
+    def test_mac_strings_are_concatenated_in_path_order (self):
+        (self.devKitPath / 'Inc').mkdir ()
+        (self.devKitPath / 'Inc' / 'GSLocalization.h').write_text ('#define VERSION_APPENDIX "INT"\n#define MAC_REGION_NAME "English"\n', encoding='utf-8')
+        resourceCompiler = CompileResources.MacResourceCompiler (self.devKitPath, '29', '3100', 'Example', 'INT', 'INT',
+            self.tempDirectory / 'Src', self.resourcesPath, self.resourceObjectsPath, False, False, self.tempDirectory / 'Cache',
+            RecordingScriptRunner (), ParallelJobs.JobRunner (1), self.tempDirectory / 'Cache' / 'ResConv')
+        for relativePath in ['RLOC/B.json.strings', 'A.grc.strings', 'C.grc.strings', 'RFIX/A.json.strings']:
+            stringsFilePath = self.resourceObjectsPath / relativePath
+            stringsFilePath.parent.mkdir (parents=True, exist_ok=True)
+            stringsFilePath.write_bytes (f'"{relativePath}" = "";\n'.encode ('utf-16'))
+
+        resultResourcePath = self.tempDirectory / 'Result'
+        resourceCompiler.CompileNativeResource (resultResourcePath)
+        self.assertEqual ((resultResourcePath / 'English.lproj' / 'Localizable.strings').read_bytes ().decode ('utf-16'), ''.join ([
+            '"A.grc.strings" = "";\n',
+            '"C.grc.strings" = "";\n',
+            '"RFIX/A.json.strings" = "";\n',
+            '"RLOC/B.json.strings" = "";\n',
+        ]))
@@ -0,0 +1,73 @@
+import unittest
+import ResourceManifest
+import ResourceCache
+from pathlib import Path
+import shutil
+import os
+
+
+TEMP_DIR_NAME = Path (__file__).parent / 'TEMP_TEST_OUTPUT_RESOURCE_MANIFEST'
+
+NORMAL_GRC = '''
+#include "ResourceIds.hpp"
+
+'STR#' ID_ADDON_INFO "Add-On Name and Description" {
+/* [  1] */		"Example"
+}
+
+'GICN' 10001 "Icon" {
+	"Icon"
+	0  128
+} 'GICN' 10002 "Second Icon" {
+	"Icon2"
+	0  128
+}
+'''
+
+LIBRARY_GRC = '''
+'FILE' 32500 "Library Part" {
+	"Example.gsm"
+}
+'''
+
+
+class TestResourceManifest (unittest.TestCase):
+
+    def setUp (self):
+        self.tempDirectory = TEMP_DIR_NAME
+        self.tempDirectory.mkdir (parents=True, exist_ok=True)
+        self.manifestPath = self.tempDirectory / 'ResourceManifest.json'
+        self.normalGrcPath = self.tempDirectory / 'Normal.grc'
+        self.normalGrcPath.write_text (NORMAL_GRC, encoding='utf-8')
+        self.libraryGrcPath = self.tempDirectory / 'Library.grc'
+        self.libraryGrcPath.write_text (LIBRARY_GRC, encoding='utf-8')
+
+    def tearDown (self):
+        shutil.rmtree (self.tempDirectory)
+
+    def test_scan (self):
+        manifest = ResourceManifest.ResourceManifest (None)
+        self.assertFalse (manifest.IsLibraryGRC (self.normalGrcPath))
+        self.assertTrue (manifest.IsLibraryGRC (self.libraryGrcPath))
+        # only the numbered resources of alphanumeric types are declarations, also after other tokens on the line
+        self.assertEqual (manifest.GetResourceIds (self.normalGrcPath), [('GICN', '10001'), ('GICN', '10002')])
+        self.assertEqual (manifest.GetContentHash (self.normalGrcPath), ResourceCache.GetFileHash (self.normalGrcPath))
+
+    def test_entries_are_reused_by_later_builds (self):
+        manifest = ResourceManifest.ResourceManifest (self.manifestPath)
+        manifest.Update ([self.normalGrcPath, self.libraryGrcPath])
+        manifest.Save ()
+
+        manifest = ResourceManifest.ResourceManifest (self.manifestPath)
+        entry = manifest.GetEntry (self.normalGrcPath)
+        self.assertIs (manifest.GetEntry (self.normalGrcPath), entry)
+        self.assertFalse (manifest.changed)
+
+    def test_modified_file_is_scanned_again (self):
+        manifest = ResourceManifest.ResourceManifest (self.manifestPath)
+        self.assertFalse (manifest.IsLibraryGRC (self.normalGrcPath))
+        self.normalGrcPath.write_text (NORMAL_GRC + LIBRARY_GRC, encoding='utf-8')
+        fileStat = os.stat (self.normalGrcPath)
+        os.utime (self.normalGrcPath, ns=(fileStat.st_atime_ns, fileStat.st_mtime_ns + 1000000000))
+        self.assertTrue (manifest.IsLibraryGRC (self.normalGrcPath))
+        self.assertEqual (len (manifest.GetResourceIds (self.normalGrcPath)), 3)
@@ -0,0 +1,139 @@
+import unittest
+import CompileResources
+import ResourceTools
+from pathlib import Path
+import shutil
+import stat
+import json
+import os
+
+
+TEMP_DIR_NAME = Path (__file__).parent / 'TEMP_TEST_OUTPUT_RESOURCE_TOOLS'
+
+# Stand-in for ResConv, it copies the precompiled resource into the native resource and a resource data file
+STAND_IN_RESCONV = '''#!/bin/sh
+while [ $# -gt 0 ]; do
+    case "$1" in
+        -i) inputFile="$2"; shift ;;
+        -o) outputFile="$2"; shift ;;
+    esac
+    shift
+done
+cp "$inputFile" "$outputFile"
+cp "$inputFile" "$(dirname "$outputFile")/$(basename "$outputFile" .ro).rsrd"
+'''
+
+
+class TestResourceTools (unittest.TestCase):
+
+    def setUp (self):
+        self.tempDirectory = TEMP_DIR_NAME
+        self.tempDirectory.mkdir (parents=True, exist_ok=True)
+        CompileResources.devKitInfos.clear ()
+
+    def tearDown (self):
+        CompileResources.devKitInfos.clear ()
+        shutil.rmtree (self.tempDirectory)
+
+    def WriteProfile (self, profile: dict) -> Path:
+        profilePath = self.tempDirectory / 'Tools.json'
+        profilePath.write_text (json.dumps (profile), encoding='utf-8')
+        return profilePath
+
+    def test_profile_paths (self):
+        resourceTools = ResourceTools.LoadResourceTools (self.WriteProfile ({ 'platform': 'WIN', 'preprocessor': 'gcc', 'resConv': 'StandIns/ResConv' }))
+        self.assertEqual (resourceTools.GetTargetPlatform (), 'WIN')
+        self.assertEqual (resourceTools.GetToolPath ('preprocessor', Path ('cl')), Path ('gcc'))
+        self.assertEqual (resourceTools.GetToolPath ('resConv', Path ('ResConv.exe')), (self.tempDirectory / 'StandIns' / 'ResConv').absolute ())
+        self.assertEqual (resourceTools.GetToolPath ('rc', Path ('rc')), Path ('rc'))
+
+        with self.assertRaises (AssertionError):
+            ResourceTools.LoadResourceTools (self.WriteProfile ({ 'linker': 'ld' }))
+        with self.assertRaises (AssertionError):
+            ResourceTools.LoadResourceTools (self.WriteProfile ({ 'platform': 'LINUX' }))
+
+    def test_msvc_preprocessor (self):
+        self.assertTrue (ResourceTools.IsMsvcPreprocessor (Path ('cl')))
+        self.assertTrue (ResourceTools.IsMsvcPreprocessor (Path ('C:/VS/bin/clang-cl.exe')))
+        self.assertFalse (ResourceTools.IsMsvcPreprocessor (Path ('/usr/bin/clang')))
+
+    # a Development Kit with the headers of the resource build, ResConv and the preprocessor are stand-ins
+    def CreateStandInBuild (self) -> Path:
+        devKitPath = self.tempDirectory / 'DevKit'
+        (devKitPath / 'Modules' / 'DGLib').mkdir (parents=True)
+        (devKitPath / 'Inc').mkdir (parents=True)
+        (devKitPath / 'Inc' / 'GSLocalization.h').write_text ('#define VERSION_APPENDIX "INT"\n#define MAC_REGION_NAME "English"\n', encoding='utf-8')
+        resConvPath = self.tempDirectory / 'StandIns' / 'ResConv'
+        resConvPath.parent.mkdir ()
+        resConvPath.write_text (STAND_IN_RESCONV, encoding='utf-8')
+        resConvPath.chmod (resConvPath.stat ().st_mode | stat.S_IEXEC)
+
+        for folderName in ['Src', 'Resources/RINT', 'Resources/RFIX', 'ResourceObjects']:
+            (self.tempDirectory / folderName).mkdir (parents=True)
+        preprocessorName = 'clang' if shutil.which ('clang') is not None else 'gcc'
+        return self.WriteProfile ({
+            'platform': 'MAC',
+            'preprocessor': preprocessorName,
+            'resConv': 'StandIns/ResConv',
+        })
+
+    def RunStandInBuild (self, profilePath: Path, arguments: list[str]) -> int:
+        savedCwd = os.getcwd ()
+        try:
+            return CompileResources.Main ([CompileResources.__file__, 'Example', 'INT', 'INT', '29', '3100', str (self.tempDirectory / 'DevKit'), str (self.tempDirectory / 'LPXMLConverter'),
+                str (self.tempDirectory / 'Src'), str (self.tempDirectory / 'Resources'), str (self.tempDirectory / 'ResourceObjects'), str (self.tempDirectory / 'Result'),
+                '--toolProfile', str (profilePath), '--cacheDir', str (self.tempDirectory / 'Cache'), '-j', '1'] + arguments)
+        finally:
+            os.chdir (savedCwd)
+
+    @unittest.skipIf (shutil.which ('sh') is None or (shutil.which ('clang') is None and shutil.which ('gcc') is None), 'POSIX shell or gcc compatible preprocessor is not available')
+    def test_compile_resources_with_stand_in_tools (self):
+        profilePath = self.CreateStandInBuild ()
+        resourcesPath = self.tempDirectory / 'Resources'
+        for folderName, fileName in [('RINT', 'Strings.grc'), ('RFIX', 'Fix.grc')]:
+            (resourcesPath / folderName / fileName).write_text ("#ifdef macintosh\n'STR#' 32000 \"Strings\" {\n}\n#endif\n", encoding='utf-8')
+
+        resultResourcePath = self.tempDirectory / 'Result'
+        result = self.RunStandInBuild (profilePath, ['--trace', str (self.tempDirectory / 'Trace.json')])
+
+        self.assertEqual (result, 0)
+        self.assertEqual (sorted (filePath.name for filePath in (resultResourcePath / 'English.lproj').iterdir ()), ['Fix.grc.rsrd', 'Localizable.strings', 'Strings.grc.rsrd'])
+        self.assertIn ("'STR#' 32000", (resultResourcePath / 'English.lproj' / 'Strings.grc.rsrd').read_text (encoding='utf-8'))
+
+        with open (self.tempDirectory / 'Trace.json', 'r', encoding='utf-8') as f:
+            traceEventNames = set (event['name'] for event in json.load (f)['traceEvents'])
+        preprocessorName = json.loads (profilePath.read_text (encoding='utf-8'))['preprocessor']
+        self.assertTrue ({ 'CompileResources', 'Run task graph', 'Compile native resource', 'ResConv', preprocessorName } <= traceEventNames)
+
+    @unittest.skipIf (shutil.which ('sh') is None or (shutil.which ('clang') is None and shutil.which ('gcc') is None), 'POSIX shell or gcc compatible preprocessor is not available')
+    def test_single_steps_with_stand_in_tools (self):
+        profilePath = self.CreateStandInBuild ()
+        resourceObjectsPath = self.tempDirectory / 'ResourceObjects'
+        headerPath = self.tempDirectory / 'Src' / 'StringIds.h'
+        headerPath.write_text ('#define STRINGS_ID 32000\n', encoding='utf-8')
+        grcFilePath = self.tempDirectory / 'Resources' / 'RINT' / 'Strings.grc'
+        grcFilePath.write_text ('#include "StringIds.h"\n\'STR#\' STRINGS_ID "Strings" {\n}\n', encoding='utf-8')
+        # included by the converted JSON resources
+        (self.tempDirectory / 'DevKit' / 'Modules' / 'DGLib' / 'DGDefs.h').write_text ('', encoding='utf-8')
+        jsonFilePath = self.tempDirectory / 'Resources' / 'RFIX' / 'Icons.json'
+        jsonFilePath.write_text (json.dumps ({ 'GICN': [{ '#id': '1234', 'name': 'Bold' }] }), encoding='utf-8')
+
+        def ReadDepFile (depFilePath: Path) -> list[str]:
+            return [line.strip (' \\') for line in depFilePath.read_text (encoding='utf-8').splitlines ()]
+
+        depFilePath = self.tempDirectory / 'Strings.grc.d'
+        self.assertEqual (self.RunStandInBuild (profilePath, ['--step', 'grc', '--input', str (grcFilePath), '--localized', '--depFile', str (depFilePath), '--depFileTarget', str (self.tempDirectory / 'Strings.grc.stamp')]), 0)
+        self.assertIn ("'STR#' 32000", (resourceObjectsPath / 'Strings.grc.ro').read_text (encoding='utf-8'))
+        depFileLines = ReadDepFile (depFilePath)
+        self.assertEqual (depFileLines[0], f'{self.tempDirectory / "Strings.grc.stamp"}:')
+        # the system headers of the preprocessor may be listed as well
+        self.assertLessEqual ({ grcFilePath.resolve (), headerPath.resolve () }, { Path (line).resolve () for line in depFileLines[1:] })
+        # the other steps did not run
+        self.assertFalse ((self.tempDirectory / 'Result').exists ())
+
+        depFilePath = self.tempDirectory / 'Icons.json.d'
+        self.assertEqual (self.RunStandInBuild (profilePath, ['--step', 'json', '--input', str (jsonFilePath), '--depFile', str (depFilePath), '--depFileTarget', str (self.tempDirectory / 'Icons.json.stamp')]), 0)
+        self.assertIn ("'GICN' 1234", (resourceObjectsPath / 'Icons.json.grc.ro').read_text (encoding='utf-8'))
+        depFileLines = ReadDepFile (depFilePath)
+        self.assertEqual (depFileLines[0], f'{self.tempDirectory / "Icons.json.stamp"}:')
+        self.assertEqual ([Path (line).resolve () for line in depFileLines[1:]], [jsonFilePath.resolve ()])
@@ -0,0 +1,176 @@
+import unittest
+import ScriptRunner
+import ParallelJobs
+from pathlib import Path
+import io
+import threading
+import shutil
+import os
+import sys
+
+
+TEMP_DIR_NAME = Path (__file__).parent / 'TEMP_TEST_OUTPUT_SCRIPT_RUNNER'
+
+
+# Stand-in for the JSONResourceProcessor scripts of the Development Kit with the same command line interface style
+STAND_IN_SCRIPT = '''
+import argparse
+import os
+import sys
+import StandInHelper
+
+parser = argparse.ArgumentParser ()
+parser.add_argument ('-i', dest='input', required=True)
+parser.add_argument ('-o', dest='output', required=True)
+parser.add_argument ('--fail', action='store_true')
+args = parser.parse_args ()
+
+if args.fail:
+    sys.exit (3)
+
+with open (args.input, 'r', encoding='utf-8') as f:
+    content = f.read ()
+with open (args.output, 'w', encoding='utf-8') as f:
+    f.write (StandInHelper.Transform (content) + os.environ.get ('STAND_IN_SUFFIX', ''))
+'''
+
+PRINTING_SCRIPT = '''
+import sys
+import time
+
+time.sleep (float (sys.argv[2]))
+print (sys.argv[1])
+if len (sys.argv) > 3:
+    raise ValueError (sys.argv[3])
+'''
+
+WAITING_SCRIPT = '''
+import os
+import sys
+import time
+
+while not os.path.exists (sys.argv[1]):
+    time.sleep (0.01)
+'''
+
+STAND_IN_HELPER = '''
+def Transform (content):
+    return content.upper ()
+'''
+
+
+class TestScriptRunner (unittest.TestCase):
+
+    def setUp (self):
+        self.tempDirectory = TEMP_DIR_NAME
+        self.tempDirectory.mkdir (parents=True, exist_ok=True)
+        self.scriptPath = self.tempDirectory / 'StandIn.py'
+        with open (self.scriptPath, 'w', encoding='utf-8') as f:
+            f.write (STAND_IN_SCRIPT)
+        with open (self.tempDirectory / 'StandInHelper.py', 'w', encoding='utf-8') as f:
+            f.write (STAND_IN_HELPER)
+        self.inputPath = self.tempDirectory / 'input.txt'
+        with open (self.inputPath, 'w', encoding='utf-8') as f:
+            f.write ('resource')
+
+    def tearDown (self):
+        sys.modules.pop ('StandInHelper', None)
+        shutil.rmtree (self.tempDirectory)
+
+    def RunAndReadOutput (self, runner: ScriptRunner.ScriptRunner, outputName: str, envOverrides: dict[str, str] | None = None) -> str:
+        outputPath = self.tempDirectory / outputName
+        result = runner.Run (self.scriptPath, ['-i', self.inputPath, '-o', outputPath], envOverrides)
+        self.assertEqual (result, 0)
+        with open (outputPath, 'r', encoding='utf-8') as f:
+            return f.read ()
+
+    def test_in_process_matches_subprocess (self):
+        inProcessOutput = self.RunAndReadOutput (ScriptRunner.InProcessScriptRunner (), 'inprocess.txt', { 'STAND_IN_SUFFIX': '!' })
+        subprocessOutput = self.RunAndReadOutput (ScriptRunner.SubprocessScriptRunner (), 'subprocess.txt', { 'STAND_IN_SUFFIX': '!' })
+        self.assertEqual (inProcessOutput, 'RESOURCE!')
+        self.assertEqual (inProcessOutput, subprocessOutput)
+
+    def test_interpreter_state_is_restored (self):
+        savedArgv = list (sys.argv)
+        savedPath = list (sys.path)
+        runner = ScriptRunner.InProcessScriptRunner ()
+        self.RunAndReadOutput (runner, 'output.txt', { 'STAND_IN_SUFFIX': '!' })
+        self.assertEqual (sys.argv, savedArgv)
+        self.assertEqual (sys.path, savedPath)
+        self.assertNotIn ('STAND_IN_SUFFIX', os.environ)
+
+    def test_script_is_compiled_once (self):
+        runner = ScriptRunner.InProcessScriptRunner ()
+        self.RunAndReadOutput (runner, 'output1.txt')
+        compiledScript = runner.GetCompiledScript (self.scriptPath)
+        self.RunAndReadOutput (runner, 'output2.txt')
+        self.assertIs (runner.GetCompiledScript (self.scriptPath), compiledScript)
+        self.assertEqual (len (runner.compiledScripts), 1)
+
+    def test_exit_code_is_returned (self):
+        runner = ScriptRunner.InProcessScriptRunner ()
+        result = runner.Run (self.scriptPath, ['-i', self.inputPath, '-o', self.tempDirectory / 'output.txt', '--fail'])
+        self.assertEqual (result, 3)
+        self.assertFalse ((self.tempDirectory / 'output.txt').exists ())
+
+    def test_parallel_jobs_run_scripts_in_separate_processes (self):
+        self.assertIsInstance (ScriptRunner.CreateScriptRunner (True, 1), ScriptRunner.InProcessScriptRunner)
+        self.assertIsInstance (ScriptRunner.CreateScriptRunner (True, 4), ScriptRunner.SubprocessScriptRunner)
+        self.assertIsInstance (ScriptRunner.CreateScriptRunner (False, 1), ScriptRunner.SubprocessScriptRunner)
+
+    def test_script_runner_is_abstract (self):
+        with self.assertRaises (TypeError):
+            ScriptRunner.ScriptRunner ()
+
+    def test_output_is_collected_in_job_order (self):
+        printingScriptPath = self.tempDirectory / 'Printing.py'
+        with open (printingScriptPath, 'w', encoding='utf-8') as f:
+            f.write (PRINTING_SCRIPT)
+
+        for runner in [ScriptRunner.InProcessScriptRunner (), ScriptRunner.SubprocessScriptRunner ()]:
+            savedStdout = sys.stdout
+            savedStderr = sys.stderr
+            stdoutBuffer = io.BytesIO ()
+            sys.stdout = io.TextIOWrapper (stdoutBuffer, encoding='utf-8')
+            sys.stderr = io.StringIO ()
+            try:
+                # the in-process runner does not run scripts concurrently, the parallel job runs in a separate process
+                results = ParallelJobs.JobRunner (2).Run ([
+                    lambda: runner.Run (printingScriptPath, ['first', '0.3', 'failure']),
+                    lambda: ScriptRunner.SubprocessScriptRunner ().Run (printingScriptPath, ['second', '0.0']),
+                ])
+                sys.stdout.flush ()
+                printedOutput = stdoutBuffer.getvalue ().decode ('utf-8')
+                printedErrors = sys.stderr.getvalue ()
+            finally:
+                sys.stdout = savedStdout
+                sys.stderr = savedStderr
+            self.assertEqual (results, [1, 0])
+            self.assertEqual (printedErrors, '')
+            self.assertRegex (printedOutput, r'^first\r?\n(.*\r?\n)*ValueError: failure\r?\nsecond\r?\n$')
+
+    def test_environment_is_not_inherited_by_other_threads (self):
+        waitingScriptPath = self.tempDirectory / 'Waiting.py'
+        with open (waitingScriptPath, 'w', encoding='utf-8') as f:
+            f.write (WAITING_SCRIPT)
+        startedPath = self.tempDirectory / 'started.txt'
+        runner = ScriptRunner.InProcessScriptRunner ()
+        scriptThread = threading.Thread (target=runner.Run, args=(waitingScriptPath, [startedPath], { 'STAND_IN_SUFFIX': '!' }))
+        scriptThread.start ()
+        while os.environ.get ('STAND_IN_SUFFIX') is None:
+            scriptThread.join (0.01)
+
+        # the command is started after the script restored the environment
+        commandOutputPath = self.tempDirectory / 'command.txt'
+        commandThread = threading.Thread (target=ParallelJobs.RunCommand, args=([sys.executable, '-c',
+            'import os, pathlib, sys; pathlib.Path (sys.argv[1]).write_text (os.environ.get ("STAND_IN_SUFFIX", "unset"))', commandOutputPath],))
+        commandThread.start ()
+        try:
+            commandThread.join (0.2)
+            commandStartedDuringScript = commandOutputPath.exists ()
+        finally:
+            startedPath.write_text ('started', encoding='utf-8')
+            scriptThread.join ()
+            commandThread.join ()
+        self.assertFalse (commandStartedDuringScript)
+        self.assertEqual (commandOutputPath.read_text (), 'unset')
@@ -0,0 +1,62 @@
+import unittest
+import TraceEvents
+import ParallelJobs
+from pathlib import Path
+import shutil
+import json
+import sys
+import os
+
+
+TEMP_DIR_NAME = Path (__file__).parent / 'TEMP_TEST_OUTPUT_TRACE_EVENTS'
+
+
+class TestTraceEvents (unittest.TestCase):
+
+    def setUp (self):
+        self.tempDirectory = TEMP_DIR_NAME
+        self.tempDirectory.mkdir (parents=True, exist_ok=True)
+
+    def tearDown (self):
+        TraceEvents.StopTracing ()
+        shutil.rmtree (self.tempDirectory)
+
+    def test_disabled_tracing (self):
+        self.assertFalse (TraceEvents.IsTracing ())
+        self.assertIs (TraceEvents.TraceSpan ('Step', 'phase'), TraceEvents.noSpan)
+        self.assertIs (TraceEvents.TraceCommand (['tool', '-x']), TraceEvents.noSpan)
+        self.assertEqual (TraceEvents.StopTracing (), [])
+
+    def test_traced_spans_and_commands (self):
+        TraceEvents.StartTracing ('Test')
+        with TraceEvents.TraceSpan ('Step', 'phase', { 'input': 'a.grc' }):
+            self.assertEqual (ParallelJobs.RunCommand ([sys.executable, '-c', 'pass']), 0)
+        with self.assertRaises (ValueError):
+            with TraceEvents.TraceSpan ('Failing step', 'phase'):
+                raise ValueError ()
+        traceEvents = TraceEvents.StopTracing ()
+
+        completeEvents = { event['name']: event for event in traceEvents if event['ph'] == 'X' }
+        self.assertEqual (sorted (completeEvents.keys ()), sorted (['Step', 'Failing step', Path (sys.executable).name]))
+        stepEvent = completeEvents['Step']
+        commandEvent = completeEvents[Path (sys.executable).name]
+        self.assertEqual (stepEvent['args'], { 'input': 'a.grc' })
+        self.assertEqual (commandEvent['cat'], 'tool')
+        self.assertIn ('-c pass', commandEvent['args']['command'])
+        self.assertEqual (commandEvent['tid'], stepEvent['tid'])
+        self.assertGreaterEqual (commandEvent['ts'], stepEvent['ts'])
+        self.assertLessEqual (commandEvent['ts'] + commandEvent['dur'], stepEvent['ts'] + stepEvent['dur'])
+        self.assertEqual (completeEvents['Failing step']['args'], { 'error': 'ValueError' })
+        self.assertIn ({ 'name': 'process_name', 'ph': 'M', 'pid': os.getpid (), 'args': { 'name': 'Test' } }, traceEvents)
+
+    def test_trace_folder (self):
+        TraceEvents.StartTracing ('Test')
+        with TraceEvents.TraceSpan ('Step', 'phase'):
+            pass
+        traceEvents = TraceEvents.StopTracing ()
+        TraceEvents.WriteTrace (self.tempDirectory / 'Trace' / 'Test.json', traceEvents)
+        (self.tempDirectory / 'Trace' / 'Broken.json').write_text ('{', encoding='utf-8')
+
+        with open (self.tempDirectory / 'Trace' / 'Test.json', 'r', encoding='utf-8') as f:
+            self.assertEqual (json.load (f)['traceEvents'], traceEvents)
+        self.assertEqual (TraceEvents.LoadTraceFolderEvents (self.tempDirectory / 'Trace'), traceEvents)
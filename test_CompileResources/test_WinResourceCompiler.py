@@ -0,0 +1,239 @@
+import unittest
+import CompileResources
+import ScriptRunner
+import ParallelJobs
+import ResourceTools
+from pathlib import Path
+import shutil
+import sys
+import os
+
+
+TEMP_DIR_NAME = Path (__file__).parent / 'TEMP_TEST_OUTPUT_WIN_RESOURCE_COMPILER'
+
+
+class FakeToolsWinResourceCompiler (CompileResources.WinResourceCompiler):
+    compiledFileNames = []
+
+    def PrecompileGRCResourceFile (self, grcFilePath: Path) -> Path:
+        precompiledGrcFilePath = self.GetPrecompiledGRCResourceFilePath (grcFilePath)
+        precompiledGrcFilePath.parent.mkdir (parents=True, exist_ok=True)
+        shutil.copyfile (grcFilePath, precompiledGrcFilePath)
+        return precompiledGrcFilePath
+
+    def CompilePrecompiledGRCResourceFile (self, precompiledGrcFilePath: Path, localized: bool) -> bool:
+        FakeToolsWinResourceCompiler.compiledFileNames.append (precompiledGrcFilePath.name)
+        (self.resourceObjectsPath / (precompiledGrcFilePath.stem + '.rc2')).write_bytes (precompiledGrcFilePath.read_bytes ())
+        return True
+
+
+class ExtraFragmentWinResourceCompiler (CompileResources.WinResourceCompiler):
+    extraFragmentNames = []
+    includesExtraFragments = False
+    resConvRunCount = 0
+
+    PrecompileGRCResourceFile = FakeToolsWinResourceCompiler.PrecompileGRCResourceFile
+
+    # writes the native resource and extra fragments next to it, like ResConv does for images
+    def GetResConvParams (self, platformSign: str, codepage: str, imageResourcesFolder: Path, inputFilePath: Path, nativeResourceFilePath: Path) -> list:
+        ExtraFragmentWinResourceCompiler.resConvRunCount += 1
+        script = 'import sys, pathlib\nfor filePath in sys.argv[1:]:\n    pathlib.Path (filePath).write_text ("fragment")\n'
+        extraFragmentFiles = [nativeResourceFilePath.with_suffix (f'.{name}.rc2') for name in ExtraFragmentWinResourceCompiler.extraFragmentNames]
+        if ExtraFragmentWinResourceCompiler.includesExtraFragments:
+            script += 'pathlib.Path (sys.argv[1]).write_text ("".join (f\'#include "{filePath}"\\n\' for filePath in sys.argv[2:]))\n'
+        return [sys.executable, '-c', script, nativeResourceFilePath] + extraFragmentFiles
+
+
+class TestWinResourceCompiler (unittest.TestCase):
+
+    def setUp (self):
+        self.tempDirectory = TEMP_DIR_NAME
+        self.resourcesPath = self.tempDirectory / 'Resources'
+        self.resourceObjectsPath = self.tempDirectory / 'ResourceObjects'
+        for folder in [self.tempDirectory / 'DevKit' / 'Tools', self.resourcesPath / 'RINT', self.resourcesPath / 'RFIX', self.resourcesPath / 'RFIX.win', self.resourceObjectsPath]:
+            folder.mkdir (parents=True, exist_ok=True)
+        (self.resourcesPath / 'RFIX.win' / 'AddOnMain.rc2').write_text ('MAIN\n', encoding='utf-8')
+        CompileResources.devKitInfos.clear ()
+        self.resourceCompiler = CompileResources.WinResourceCompiler (self.tempDirectory / 'DevKit', '29', '3100', 'Example', 'INT', 'INT',
+            self.tempDirectory / 'Src', self.resourcesPath, self.resourceObjectsPath, False, False, self.tempDirectory / 'Cache',
+            ScriptRunner.SubprocessScriptRunner (), ParallelJobs.JobRunner (1), self.tempDirectory / 'Cache' / 'ResConv')
+
+    def tearDown (self):
+        CompileResources.devKitInfos.clear ()
+        shutil.rmtree (self.tempDirectory)
+
+    def AddResource (self, folderName: str, fileName: str) -> None:
+        (self.resourcesPath / folderName / fileName).write_text ("'STR#' 1 \"Strings\" {\n}\n", encoding='utf-8')
+        (self.resourceObjectsPath / f'{fileName}.rc2').write_text (fileName, encoding='utf-8')
+
+    def test_includes_are_stable (self):
+        self.AddResource ('RINT', 'B.grc')
+        self.AddResource ('RFIX', 'A.grc')
+        # left behind by a removed resource
+        (self.resourceObjectsPath / 'Removed.grc.rc2').write_text ('removed', encoding='utf-8')
+
+        nativeResourceFile = self.resourceCompiler.CreateNativeResourceFileWithIncludes ()
+        self.assertEqual (nativeResourceFile.read_text (encoding='utf-8'), ''.join ([
+            f'#include "{self.resourceObjectsPath / "A.grc.rc2"}"\n',
+            f'#include "{self.resourceObjectsPath / "B.grc.rc2"}"\n',
+            'MAIN\n',
+        ]))
+
+        nativeResourceFileStamp = os.stat (nativeResourceFile).st_mtime_ns
+        os.utime (nativeResourceFile, ns=(nativeResourceFileStamp - 1000000000, nativeResourceFileStamp - 1000000000))
+        self.resourceCompiler.CreateNativeResourceFileWithIncludes ()
+        self.assertEqual (os.stat (nativeResourceFile).st_mtime_ns, nativeResourceFileStamp - 1000000000)
+
+    def test_native_resource_fingerprint (self):
+        self.AddResource ('RFIX', 'A.grc')
+        (self.resourcesPath / 'RFIX.win' / 'AddOnMain.rc2').write_text ('#include "Version.h"\nICON "AddOn.ico"\n', encoding='utf-8')
+        (self.tempDirectory / 'Src').mkdir ()
+        versionHeaderPath = self.tempDirectory / 'Src' / 'Version.h'
+        versionHeaderPath.write_text ('#define VERSION 1\n', encoding='utf-8')
+        iconPath = self.resourcesPath / 'RFIX.win' / 'AddOn.ico'
+        iconPath.write_bytes (b'icon')
+        resultResourcePath = self.tempDirectory / 'Example.res'
+
+        def GetFingerprint () -> str:
+            self.resourceCompiler.fileHashCache.clear ()
+            return self.resourceCompiler.GetNativeResourceFingerprint (self.resourceCompiler.CreateNativeResourceFileWithIncludes (), resultResourcePath)
+
+        referencedFiles = self.resourceCompiler.GetNativeResourceReferencedFiles (self.resourceCompiler.CreateNativeResourceFileWithIncludes (),
+            self.resourceCompiler.GetNativeResourceIncludeFolders ())
+        self.assertEqual (set (referencedFiles), { self.resourceObjectsPath / 'A.grc.rc2', versionHeaderPath })
+
+        fingerprint = GetFingerprint ()
+        self.assertEqual (GetFingerprint (), fingerprint)
+        for filePath, content in [(versionHeaderPath, '#define VERSION 2\n'), (iconPath, 'new icon'), (self.resourceObjectsPath / 'A.grc.rc2', 'changed')]:
+            filePath.write_text (content, encoding='utf-8')
+            newFingerprint = GetFingerprint ()
+            self.assertNotEqual (newFingerprint, fingerprint)
+            fingerprint = newFingerprint
+
+        # the rc of the tool profile is part of the fingerprint
+        rcPath = self.tempDirectory / 'rc.exe'
+        rcPath.write_bytes (b'rc')
+        rcPath.chmod (0o755)
+        self.resourceCompiler.resourceTools = ResourceTools.ResourceTools ({ 'rc': str (rcPath) })
+        fingerprint = GetFingerprint ()
+        self.assertEqual (GetFingerprint (), fingerprint)
+        rcPath.write_bytes (b'new rc')
+        self.assertNotEqual (GetFingerprint (), fingerprint)
+
+    def test_only_library_resources_wait_for_the_library (self):
+        self.AddResource ('RFIX', 'Dialogs.grc')
+        (self.resourcesPath / 'RFIX' / 'Library.grc').write_text ("'FILE' 1 \"Object\" {\n\t\"Object.gsm\"\n}\n", encoding='utf-8')
+        taskGraph = CompileResources.ParallelJobs.TaskGraph ()
+        libraryTask = taskGraph.AddTask ('Compile library', lambda: None)
+        self.resourceCompiler.AddFixResourceTasks (taskGraph, [], [libraryTask])
+
+        dependentTaskNames = [task.name for task in libraryTask.dependents]
+        self.assertEqual (dependentTaskNames, ['Precompile Library.grc'])
+
+    def test_fix_resources_are_shared_between_languages (self):
+        (self.tempDirectory / 'DevKit' / 'Tools' / 'Win').mkdir ()
+        (self.tempDirectory / 'DevKit' / 'Tools' / 'Win' / 'ResConv.exe').write_bytes (b'resconv')
+        (self.resourcesPath / 'RFIX' / 'Fix.grc').write_text ("'STR#' 1 \"Fix\" {\n}\n", encoding='utf-8')
+        FakeToolsWinResourceCompiler.compiledFileNames = []
+
+        def BuildFixResources (languageCode: str) -> Path:
+            resourceObjectsPath = self.tempDirectory / languageCode / 'ResourceObjects'
+            resourceCompiler = FakeToolsWinResourceCompiler (self.tempDirectory / 'DevKit', '29', '3100', 'Example', languageCode, 'INT',
+                self.tempDirectory / 'Src', self.resourcesPath, resourceObjectsPath, False, False, self.tempDirectory / 'Cache',
+                ScriptRunner.SubprocessScriptRunner (), ParallelJobs.JobRunner (1), self.tempDirectory / 'Cache' / 'ResConv')
+            taskGraph = ParallelJobs.TaskGraph ()
+            try:
+                resourceCompiler.AddSharedFixResourceTasks (taskGraph)
+                # the lock is taken by the first task, every other task runs after it
+                self.assertIsNone (resourceCompiler.sharedFixResourcesLock)
+                lockedTasks = { taskGraph.tasks[0] }
+                for task in taskGraph.tasks[1:]:
+                    self.assertTrue (any (dependency in lockedTasks for dependency in task.dependencies), task.name)
+                    lockedTasks.add (task)
+                taskGraph.Run (resourceCompiler.jobRunner)
+            finally:
+                resourceCompiler.ReleaseSharedFixResources ()
+            return resourceObjectsPath / 'Fix.grc.rc2'
+
+        self.assertEqual (BuildFixResources ('INT').read_text (encoding='utf-8'), "'STR#' 1 \"Fix\" {\n}\n")
+        self.assertEqual (FakeToolsWinResourceCompiler.compiledFileNames, ['Fix.grc.i'])
+
+        self.assertEqual (BuildFixResources ('GER').read_text (encoding='utf-8'), "'STR#' 1 \"Fix\" {\n}\n")
+        self.assertEqual (FakeToolsWinResourceCompiler.compiledFileNames, ['Fix.grc.i'])
+
+        (self.resourcesPath / 'RFIX' / 'Fix.grc').write_text ("'STR#' 1 \"Changed\" {\n}\n", encoding='utf-8')
+        self.assertEqual (BuildFixResources ('FRA').read_text (encoding='utf-8'), "'STR#' 1 \"Changed\" {\n}\n")
+        self.assertEqual (FakeToolsWinResourceCompiler.compiledFileNames, ['Fix.grc.i', 'Fix.grc.i'])
+        self.assertEqual (BuildFixResources ('GER').read_text (encoding='utf-8'), "'STR#' 1 \"Changed\" {\n}\n")
+        self.assertEqual (FakeToolsWinResourceCompiler.compiledFileNames, ['Fix.grc.i', 'Fix.grc.i'])
+
+    def test_includes_are_the_recorded_fragments (self):
+        (self.tempDirectory / 'DevKit' / 'Tools' / 'Win').mkdir ()
+        (self.tempDirectory / 'DevKit' / 'Tools' / 'Win' / 'ResConv.exe').write_bytes (b'resconv')
+        (self.resourcesPath / 'RFIX' / 'Fix.grc').write_text ("'STR#' 1 \"Fix\" {\n}\n", encoding='utf-8')
+        (self.resourcesPath / 'RINT' / 'Library.grc').write_text ("'FILE' 1 \"Object\" {\n\t\"Object.gsm\"\n}\n", encoding='utf-8')
+        # not written by any compile step
+        (self.resourceObjectsPath / 'Unrelated.rc2').write_text ('unrelated', encoding='utf-8')
+        resourceCompiler = ExtraFragmentWinResourceCompiler (self.tempDirectory / 'DevKit', '29', '3100', 'Example', 'INT', 'INT',
+            self.tempDirectory / 'Src', self.resourcesPath, self.resourceObjectsPath, False, True, self.tempDirectory / 'Cache',
+            ScriptRunner.SubprocessScriptRunner (), ParallelJobs.JobRunner (1), self.tempDirectory / 'Cache' / 'ResConv')
+
+        def CompileResources (extraFragmentNames: list[str]) -> list[Path]:
+            ExtraFragmentWinResourceCompiler.extraFragmentNames = extraFragmentNames
+            for grcFilePath in [self.resourcesPath / 'RFIX' / 'Fix.grc', self.resourcesPath / 'RINT' / 'Library.grc']:
+                self.assertTrue (resourceCompiler.CompilePrecompiledGRCResourceFile (resourceCompiler.PrecompileGRCResourceFile (grcFilePath), False))
+            return resourceCompiler.GetNativeResourceFragmentFiles ()
+
+        self.assertEqual (CompileResources (['Images']), [self.resourceObjectsPath / name for name in ['Fix.grc.Images.rc2', 'Fix.grc.rc2', 'Library.grc.Images.rc2', 'Library.grc.rc2']])
+
+        # the fragments of the previous compilation are replaced
+        (self.resourcesPath / 'RFIX' / 'Fix.grc').write_text ("'STR#' 1 \"Changed\" {\n}\n", encoding='utf-8')
+        self.assertEqual (CompileResources (['Icons']), [self.resourceObjectsPath / name for name in ['Fix.grc.Icons.rc2', 'Fix.grc.rc2', 'Library.grc.Icons.rc2', 'Library.grc.rc2']])
+        self.assertFalse ((self.resourceObjectsPath / 'Fix.grc.Images.rc2').exists ())
+        self.assertFalse ((self.resourceObjectsPath / 'Library.grc.Images.rc2').exists ())
+
+        # the fragments restored from the ResConv cache are recorded as well
+        shutil.rmtree (self.resourceObjectsPath)
+        self.assertEqual (CompileResources ([]), [self.resourceObjectsPath / name for name in ['Fix.grc.Icons.rc2', 'Fix.grc.rc2', 'Library.grc.rc2']])
+
+    def test_resconv_cache_key_uses_the_preprocessed_content (self):
+        (self.tempDirectory / 'DevKit' / 'Tools' / 'Win').mkdir ()
+        (self.tempDirectory / 'DevKit' / 'Tools' / 'Win' / 'ResConv.exe').write_bytes (b'resconv')
+        (self.resourcesPath / 'RFIX' / 'Fix.grc').write_text ("'STR#' 1 \"Fix\" {\n}\n", encoding='utf-8')
+        resourceCompiler = ExtraFragmentWinResourceCompiler (self.tempDirectory / 'DevKit', '29', '3100', 'Example', 'INT', 'INT',
+            self.tempDirectory / 'Src', self.resourcesPath, self.resourceObjectsPath, False, False, self.tempDirectory / 'Cache',
+            ScriptRunner.SubprocessScriptRunner (), ParallelJobs.JobRunner (1), self.tempDirectory / 'Cache' / 'ResConv')
+        precompiledGrcFilePath = resourceCompiler.PrecompileGRCResourceFile (self.resourcesPath / 'RFIX' / 'Fix.grc')
+
+        ExtraFragmentWinResourceCompiler.extraFragmentNames = ['Images']
+        self.assertTrue (resourceCompiler.CompilePrecompiledGRCResourceFile (precompiledGrcFilePath, False))
+
+        # rewritten with the same size and timestamp, the cached outputs of the old content are not used
+        precompiledGrcFileStat = os.stat (precompiledGrcFilePath)
+        precompiledGrcFilePath.write_text ("'STR#' 1 \"Fox\" {\n}\n", encoding='utf-8')
+        os.utime (precompiledGrcFilePath, ns=(precompiledGrcFileStat.st_atime_ns, precompiledGrcFileStat.st_mtime_ns))
+        ExtraFragmentWinResourceCompiler.extraFragmentNames = ['Icons']
+        self.assertTrue (resourceCompiler.CompilePrecompiledGRCResourceFile (precompiledGrcFilePath, False))
+        self.assertEqual (resourceCompiler.GetNativeResourceFragmentFiles (), [self.resourceObjectsPath / name for name in ['Fix.grc.Icons.rc2', 'Fix.grc.rc2']])
+
+    def test_outputs_with_local_paths_are_moved_to_the_objects_folder (self):
+        (self.tempDirectory / 'DevKit' / 'Tools' / 'Win').mkdir ()
+        (self.tempDirectory / 'DevKit' / 'Tools' / 'Win' / 'ResConv.exe').write_bytes (b'resconv')
+        (self.resourcesPath / 'RFIX' / 'Fix.grc').write_text ("'STR#' 1 \"Fix\" {\n}\n", encoding='utf-8')
+        resourceCompiler = ExtraFragmentWinResourceCompiler (self.tempDirectory / 'DevKit', '29', '3100', 'Example', 'INT', 'INT',
+            self.tempDirectory / 'Src', self.resourcesPath, self.resourceObjectsPath, False, False, self.tempDirectory / 'Cache',
+            ScriptRunner.SubprocessScriptRunner (), ParallelJobs.JobRunner (1), self.tempDirectory / 'Cache' / 'ResConv')
+        ExtraFragmentWinResourceCompiler.extraFragmentNames = ['Images']
+        ExtraFragmentWinResourceCompiler.includesExtraFragments = True
+        ExtraFragmentWinResourceCompiler.resConvRunCount = 0
+        try:
+            precompiledGrcFilePath = resourceCompiler.PrecompileGRCResourceFile (self.resourcesPath / 'RFIX' / 'Fix.grc')
+            self.assertTrue (resourceCompiler.CompilePrecompiledGRCResourceFile (precompiledGrcFilePath, False))
+        finally:
+            ExtraFragmentWinResourceCompiler.includesExtraFragments = False
+
+        # ResConv runs once, the included path is the moved fragment
+        self.assertEqual (ExtraFragmentWinResourceCompiler.resConvRunCount, 1)
+        self.assertEqual (resourceCompiler.GetNativeResourceFragmentFiles (), [self.resourceObjectsPath / name for name in ['Fix.grc.Images.rc2', 'Fix.grc.rc2']])
+        self.assertEqual ((self.resourceObjectsPath / 'Fix.grc.rc2').read_text (), f'#include "{(self.resourceObjectsPath / "Fix.grc.Images.rc2").absolute ()}"\n')
+        self.assertEqual ([filePath for filePath in (self.tempDirectory / 'Cache' / 'ResConv').rglob ('*') if filePath.is_file ()], [])
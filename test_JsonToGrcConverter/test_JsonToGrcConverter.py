@@ -1,6 +1,8 @@
 import unittest
+import json
 import JsonToGrcConverter.JsonToGrcConverter
 import JsonToGrcConverter.Common
+import JsonToGrcConverter.ConverterStats
 from pathlib import Path
 import subprocess
 import shutil
@@ -202,6 +204,60 @@ class TestJsonToGrcConverter (unittest.TestCase):
     def test_macroDictionary (self):
         self.RunTestCase (TESTFILES_DIR_NAME / 'macroDictionary.json', TESTFILES_DIR_NAME / 'macroDictionary.grc')
 
+    def test_resource_manifest (self):
+        with open (TESTFILES_DIR_NAME / 'macroDictionary.json', 'r', encoding='utf-8') as f:
+            jsonData = json.load (f)
+        with open (TESTFILES_DIR_NAME / 'STRS.json', 'r', encoding='utf-8') as f:
+            jsonData['STRS'].extend (json.load (f)['STRS'][2:3])
+
+        resourceManifest = []
+        JsonToGrcConverter.JsonToGrcConverter.ConvertJsonDataToGrcString (jsonData, 29, resourceManifest=resourceManifest)
+        self.assertEqual (resourceManifest, [
+            { 'type': 'GDLG', 'id': '1', 'condition': None },
+            { 'type': 'DLGH', 'id': '1', 'condition': None },
+            { 'type': 'STR#', 'id': '1', 'condition': None },
+            { 'type': 'STR#', 'id': '3', 'condition': '+WINDOWS' },
+        ])
+
+    def test_converted_fragment_cache (self):
+        self.assertIsNone (JsonToGrcConverter.JsonToGrcConverter.convertedFragmentCache)
+        fragmentCache = JsonToGrcConverter.JsonToGrcConverter.ConvertedFragmentCache (2)
+        keys = [JsonToGrcConverter.JsonToGrcConverter.ConvertedFragmentCache.GetKey ('STRS', 29, { '#id': resId }) for resId in range (3)]
+        self.assertNotEqual (keys[0], JsonToGrcConverter.JsonToGrcConverter.ConvertedFragmentCache.GetKey ('STRS', 28, { '#id': 0 }))
+        fragmentCache.Add (keys[0], 'first')
+        fragmentCache.Add (keys[1], 'second')
+        self.assertEqual (fragmentCache.Get (keys[0]), 'first')
+        # the least recently used fragment is dropped
+        fragmentCache.Add (keys[2], 'third')
+        self.assertEqual ([fragmentCache.Get (key) for key in keys], ['first', None, 'third'])
+
+    def test_converter_stats (self):
+        JsonToGrcConverter.JsonToGrcConverter.EnableConvertedFragmentCache ()
+        self.addCleanup (JsonToGrcConverter.JsonToGrcConverter.DisableConvertedFragmentCache)
+        converterStats = JsonToGrcConverter.ConverterStats.ConverterStats ()
+        for fileName in ['GDLG_Button.json', 'CMND.json', 'GDLG_Button.json']:
+            with open (TESTFILES_DIR_NAME / fileName, 'r', encoding='utf-8') as f:
+                grcString = JsonToGrcConverter.JsonToGrcConverter.ConvertJsonDataToGrcString (json.load (f), 29, converterStats=converterStats)
+            if fileName == 'CMND.json':
+                cmndFragmentSize = len (grcString.encode ('utf-8')) - len ('#include "DGDefs.h"\n\n\n')
+
+        statsData = json.loads (json.dumps (converterStats.ToDict ()))
+        self.assertEqual (sorted (statsData['resourceTypes'].keys ()), ['CMND', 'GDLG'])
+        self.assertEqual (statsData['resourceTypes']['GDLG']['count'], 2)
+        self.assertEqual (statsData['resourceTypes']['GDLG']['cached'], 1)
+        self.assertEqual (statsData['resourceTypes']['GDLG']['conditions'], 8)
+        self.assertEqual (statsData['resourceTypes']['CMND']['conditions'], 2)
+        self.assertEqual (statsData['resourceTypes']['CMND']['bytes'], cmndFragmentSize)
+        # the controls of the cached dialog are not converted again
+        self.assertEqual (list (statsData['gdlgControlTypes'].keys ()), ['Button'])
+        self.assertEqual (statsData['gdlgControlTypes']['Button']['count'], 8)
+        self.assertEqual (statsData['gdlgControlTypes']['Button']['conditions'], 2)
+        self.assertGreater (statsData['gdlgControlTypes']['Button']['time'], 0.0)
+
+        mergedStats = JsonToGrcConverter.ConverterStats.ConverterStats.FromDict (statsData)
+        mergedStats.Merge (converterStats)
+        self.assertEqual (mergedStats.ToDict ()['gdlgControlTypes']['Button']['count'], 16)
+
     def test_GDLG (self):
         self.RunTestCase (TESTFILES_DIR_NAME / 'GDLG.json', TESTFILES_DIR_NAME / 'GDLG.grc')
 
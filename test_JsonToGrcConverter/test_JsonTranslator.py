@@ -0,0 +1,114 @@
+import unittest
+import JsonToGrcConverter.JsonTranslator
+from pathlib import Path
+import shutil
+
+
+TEMP_DIR_NAME = Path (__file__).parent / 'TEMP_TEST_OUTPUT_TRANSLATOR'
+
+
+def WriteXliff (xlfPath: Path, units: dict[str, str]) -> None:
+    transUnits = ''.join (f'<trans-unit id="{unitId}"><source>{unitId}</source><target state="translated">{text}</target></trans-unit>' for unitId, text in units.items ())
+    xlfPath.parent.mkdir (parents=True, exist_ok=True)
+    with open (xlfPath, 'w', encoding='utf-8') as f:
+        f.write (f'<?xml version="1.0" encoding="UTF-8"?><xliff xmlns="urn:oasis:names:tc:xliff:document:1.2" version="1.2"><file><body>{transUnits}</body></file></xliff>')
+
+
+class TestJsonTranslator (unittest.TestCase):
+
+    def setUp (self):
+        self.tempDirectory = TEMP_DIR_NAME
+        self.tempDirectory.mkdir (parents=True, exist_ok=True)
+        self.cacheDirectory = self.tempDirectory / 'Cache'
+
+    def tearDown (self):
+        shutil.rmtree (self.tempDirectory)
+
+    def test_chain_child_overrides_parents (self):
+        WriteXliff (self.tempDirectory / 'INT.xlf', { 'a': 'a_INT', 'b': 'b_INT', 'c': 'c_INT' })
+        WriteXliff (self.tempDirectory / 'GER.xlf', { 'b': 'b_GER', 'c': 'c_GER' })
+        WriteXliff (self.tempDirectory / 'GER_CH.xlf', { 'c': 'c_GER_CH' })
+
+        chain = [self.tempDirectory / 'GER_CH.xlf', self.tempDirectory / 'GER.xlf', self.tempDirectory / 'INT.xlf']
+        expected = { 'a': 'a_INT', 'b': 'b_GER', 'c': 'c_GER_CH' }
+        self.assertEqual (JsonToGrcConverter.JsonTranslator.GetChainedTranslations (chain), expected)
+        self.assertEqual (JsonToGrcConverter.JsonTranslator.GetChainedTranslations (chain, self.cacheDirectory), expected)
+        self.assertEqual (len (list (self.cacheDirectory.glob ('*.json'))), 3)
+
+    def test_cached_base_is_shared_between_siblings (self):
+        WriteXliff (self.tempDirectory / 'GER.xlf', { 'a': 'a_GER', 'b': 'b_GER' })
+        WriteXliff (self.tempDirectory / 'GER_CH.xlf', { 'b': 'b_GER_CH' })
+        WriteXliff (self.tempDirectory / 'GER_AT.xlf', { 'b': 'b_GER_AT' })
+
+        JsonToGrcConverter.JsonTranslator.GetChainedTranslations ([self.tempDirectory / 'GER_CH.xlf', self.tempDirectory / 'GER.xlf'], self.cacheDirectory)
+
+        # A cache hit on the base level must not parse the base XLIFF again
+        originalGetTranslations = JsonToGrcConverter.JsonTranslator.GetTranslations
+        parsedPaths = []
+        def GetTranslationsSpy (xlfPath: Path) -> dict[str, str]:
+            parsedPaths.append (xlfPath)
+            return originalGetTranslations (xlfPath)
+        JsonToGrcConverter.JsonTranslator.GetTranslations = GetTranslationsSpy
+        try:
+            translations = JsonToGrcConverter.JsonTranslator.GetChainedTranslations ([self.tempDirectory / 'GER_AT.xlf', self.tempDirectory / 'GER.xlf'], self.cacheDirectory)
+        finally:
+            JsonToGrcConverter.JsonTranslator.GetTranslations = originalGetTranslations
+
+        self.assertEqual (translations, { 'a': 'a_GER', 'b': 'b_GER_AT' })
+        self.assertEqual (parsedPaths, [self.tempDirectory / 'GER_AT.xlf'])
+
+    def test_cache_is_invalidated_on_change (self):
+        WriteXliff (self.tempDirectory / 'INT.xlf', { 'a': 'a_INT' })
+        WriteXliff (self.tempDirectory / 'GER.xlf', { 'b': 'b_GER' })
+        chain = [self.tempDirectory / 'GER.xlf', self.tempDirectory / 'INT.xlf']
+
+        JsonToGrcConverter.JsonTranslator.GetChainedTranslations (chain, self.cacheDirectory)
+        WriteXliff (self.tempDirectory / 'INT.xlf', { 'a': 'a_INT_changed' })
+        translations = JsonToGrcConverter.JsonTranslator.GetChainedTranslations (chain, self.cacheDirectory)
+
+        self.assertEqual (translations, { 'a': 'a_INT_changed', 'b': 'b_GER' })
+
+    def test_unit_fingerprints_change_with_the_raw_units (self):
+        chain = [self.tempDirectory / 'GER.xlf', self.tempDirectory / 'INT.xlf']
+        WriteXliff (self.tempDirectory / 'INT.xlf', { 'a': 'a_INT', 'b': 'b_INT' })
+        WriteXliff (self.tempDirectory / 'GER.xlf', { 'a': 'a_GER' })
+        fingerprints = JsonToGrcConverter.JsonTranslator.GetChainedUnitFingerprints (chain)
+        self.assertEqual (JsonToGrcConverter.JsonTranslator.GetChainedUnitFingerprints (chain, self.cacheDirectory), fingerprints)
+        self.assertEqual (JsonToGrcConverter.JsonTranslator.GetChainedUnitFingerprints (chain, self.cacheDirectory), fingerprints)
+
+        # the translations stay the same, the target of the parent is overridden by the child
+        WriteXliff (self.tempDirectory / 'INT.xlf', { 'a': 'a_INT_changed', 'b': 'b_INT' })
+        changedFingerprints = JsonToGrcConverter.JsonTranslator.GetChainedUnitFingerprints (chain, self.cacheDirectory)
+        self.assertNotEqual (changedFingerprints['a'], fingerprints['a'])
+        self.assertEqual (changedFingerprints['b'], fingerprints['b'])
+
+        # the target of the child is not usable anymore
+        xliffContent = (self.tempDirectory / 'GER.xlf').read_text (encoding='utf-8')
+        (self.tempDirectory / 'GER.xlf').write_text (xliffContent.replace ('<target state="translated">a_GER', '<target state="new">a'), encoding='utf-8')
+        self.assertNotEqual (JsonToGrcConverter.JsonTranslator.GetChainedUnitFingerprints (chain, self.cacheDirectory)['a'], changedFingerprints['a'])
+
+    def test_dict_id_locations (self):
+        jsonData = {
+            'GDLG': [
+                {
+                    '#id': '32500',
+                    'name': { 'str': 'Dialog', 'dictId': 'dialogName' },
+                    'controls': [
+                        { 'Button': { '#id': '1', 'text': { 'str': 'OK', 'dictId': 'okText' } } },
+                        { 'Button': { '#id': '2', 'text': { 'str': 'OK', 'dictId': 'okText' } } },
+                    ]
+                }
+            ],
+            'STRS': [
+                { '#id': '1', 'items': [ { '#id': '1', 'text': { 'str': 'Hello', 'dictId': 'hello' } } ] }
+            ]
+        }
+
+        locations = JsonToGrcConverter.JsonTranslator.GetDictIdLocations (jsonData, 'Resources.json')
+
+        self.assertEqual (locations['dialogName'], [{ 'file': 'Resources.json', 'resource': 'GDLG 32500' }])
+        self.assertEqual (locations['okText'], [
+            { 'file': 'Resources.json', 'resource': 'GDLG 32500', 'control': 'Button 1' },
+            { 'file': 'Resources.json', 'resource': 'GDLG 32500', 'control': 'Button 2' },
+        ])
+        self.assertEqual (locations['hello'], [{ 'file': 'Resources.json', 'resource': 'STRS 1' }])